@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+ERCOT Archive Downloader
+
+Backfills report history from ERCOT's document archive instead of row-level
+JSON queries. Every report in discovered_endpoints_detailed.json links to an
+archive (one zip file per posting) and a bundle store (postings grouped into
+larger zips), together with:
+
+- downloadLimit: how many documents may be downloaded at a time
+- archiveDuration: how many days of postings ERCOT keeps
+
+ArchiveDownloader lists the documents posted in a date range, then downloads
+them in parallel. Each zip is streamed to a .part file and renamed into place
+when complete; an interrupted transfer resumes from where it stopped with an
+HTTP Range request, and files already on disk are skipped, so a backfill can
+simply be run again until it finishes.
+
+Usage:
+    from ercot_query import ERCOTAPIClient
+    from ercot_archive import ArchiveDownloader
+
+    client = ERCOTAPIClient()
+    downloader = ArchiveDownloader(client, "np6-905-cd", "output/archive")
+    downloader.download("2024-01-01T00:00:00", "2024-01-31T23:59:59")
+"""
+
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import requests
+
+from ercot_query import ERCOTAPIError, STREAM_CHUNK_SIZE
+
+
+# Report metadata written by discover_endpoints.py
+DISCOVERED_METADATA_FILE = Path(__file__).parent / "discovered_endpoints_detailed.json"
+
+# Documents requested per page when listing an archive
+ARCHIVE_PAGE_SIZE = 1000
+
+# Times a dropped transfer is resumed before the document counts as failed
+DOWNLOAD_ATTEMPTS = 3
+
+
+def _content_range_total(content_range):
+    """
+    Read the full document size from a Content-Range header.
+
+    Args:
+        content_range (str): e.g. 'bytes 1000-1999/2000' or 'bytes */2000'
+
+    Returns:
+        int: The total size, or None if the header does not give it
+    """
+    match = re.search(r'/(\d+)\s*$', content_range or "")
+    return int(match.group(1)) if match else None
+
+
+def load_report_metadata(report_id, metadata_file=DISCOVERED_METADATA_FILE):
+    """
+    Look up a report's metadata in the discovered endpoints file.
+
+    Args:
+        report_id (str): Report ID, e.g. 'np6-905-cd'
+        metadata_file (str): Output of discover_endpoints.py
+
+    Returns:
+        dict: The report's metadata (downloadLimit, archiveDuration, _links, ...),
+              or None if the report or the file is not found
+    """
+    try:
+        with open(metadata_file, 'r') as f:
+            endpoints = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    for endpoint in endpoints:
+        if endpoint.get("endpoint_id") == report_id.lower():
+            return endpoint.get("data") or None
+    return None
+
+
+class ArchiveDownloader:
+    """
+    Lists and downloads a report's archived documents (or bundles).
+
+    Requests go through the client, so they share its connection pool,
+    token, rate limiter, retries and circuit breaker.
+    """
+
+    def __init__(self, client, report_id, output_dir, bundles=False, metadata=None, max_workers=None):
+        """
+        Args:
+            client (ERCOTAPIClient): Authenticated API client
+            report_id (str): Report ID, e.g. 'np6-905-cd'
+            output_dir (str): Root folder; files go to <output_dir>/<report>/YYYY/MM/
+            bundles (bool): Download bundles instead of individual documents
+            metadata (dict): Report metadata (default: load_report_metadata)
+            max_workers (int): Documents downloaded concurrently (default: client.max_workers)
+        """
+        self.client = client
+        self.report_id = report_id.lower()
+        self.output_dir = Path(output_dir) / self.report_id
+        self.kind = "bundle" if bundles else "archive"
+        self.max_workers = max_workers or client.max_workers
+
+        if metadata is None:
+            metadata = load_report_metadata(self.report_id) or {}
+        self.download_limit = metadata.get("downloadLimit")
+        self.archive_duration = metadata.get("archiveDuration")
+
+        # Prefer the link ERCOT advertises, as a path relative to the client's base URL
+        self.endpoint = f"{self.kind}/{self.report_id}"
+        href = metadata.get("_links", {}).get(self.kind, {}).get("href", "")
+        base_url = client.base_url.rstrip('/') + '/'
+        if href.startswith(base_url):
+            self.endpoint = href[len(base_url):]
+
+    def list_documents(self, post_from=None, post_to=None):
+        """
+        List the documents posted in a time range, oldest first.
+
+        Args:
+            post_from (str): Earliest posting time (YYYY-MM-DDTHH:MM:SS)
+            post_to (str): Latest posting time (YYYY-MM-DDTHH:MM:SS)
+
+        Returns:
+            list: Document entries (docId, friendlyName, postDatetime, ...),
+                  or None if the listing failed
+        """
+        parameters = {}
+        if post_from:
+            parameters["postDatetimeFrom"] = post_from
+        if post_to:
+            parameters["postDatetimeTo"] = post_to
+
+        if post_from and self.archive_duration:
+            oldest_kept = datetime.now() - timedelta(days=self.archive_duration)
+            if datetime.strptime(post_from[:10], '%Y-%m-%d') < oldest_kept:
+                print(f"⚠ ERCOT keeps {self.archive_duration} days of {self.report_id}; "
+                      f"nothing before {oldest_kept:%Y-%m-%d} can be downloaded")
+
+        # Archives list their documents under 'archives', the bundle store under 'bundles'
+        list_key = "bundles" if self.kind == "bundle" else "archives"
+        documents = []
+        try:
+            for page in self.client.iter_pages(self.endpoint, parameters, page_size=ARCHIVE_PAGE_SIZE):
+                documents.extend(page.get(list_key, []))
+        except ERCOTAPIError as e:
+            print(f"✗ Could not list {self.endpoint}: {e}")
+            return None
+
+        documents.sort(key=lambda document: document.get("postDatetime") or "")
+        print(f"✓ Found {len(documents):,} {self.kind} documents")
+        return documents
+
+    def document_path(self, document):
+        """
+        Decide where a document is saved.
+
+        Returns:
+            Path: <output_dir>/<report>/YYYY/MM/<docId>_<friendlyName>.zip
+        """
+        posted = document.get("postDatetime") or "unknown"
+        folder = self.output_dir / posted[:4] / posted[5:7] if posted[:4].isdigit() else self.output_dir
+        name = re.sub(r'[^\w.-]', '_', str(document.get("friendlyName") or ""))
+        doc_id = document.get("docId")
+        return folder / (f"{doc_id}_{name}.zip" if name else f"{doc_id}.zip")
+
+    def _download_document(self, document):
+        """
+        Stream one document to disk, resuming a partial download if present.
+
+        Bytes go to a .part file that is renamed into place once the whole
+        document has arrived. If the transfer drops, the request is sent
+        again with a Range header asking only for the missing bytes. The
+        file is only complete when its size matches the document size the
+        server reports (Content-Range total or Content-Length); a partial
+        file that does not match is discarded and downloaded again.
+
+        Args:
+            document (dict): Entry from list_documents()
+
+        Returns:
+            dict: file, bytes (this run) and resumed (whether a partial file was reused)
+
+        Raises:
+            ERCOTAPIError: If the document cannot be downloaded
+        """
+        output_path = self.document_path(document)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = output_path.with_name(output_path.name + '.part')
+        parameters = {"download": document.get("docId")}
+
+        resumed = tmp_path.exists()
+        received = 0
+        complete = False
+        last_error = None
+        for attempt in range(1, DOWNLOAD_ATTEMPTS + 1):
+            offset = tmp_path.stat().st_size if tmp_path.exists() else 0
+            headers = {"Range": f"bytes={offset}-"} if offset else None
+            response = self.client.open_stream(self.endpoint, parameters, extra_headers=headers,
+                                               accept=(200, 206, 416))
+            try:
+                if response.status_code == 416:
+                    # Nothing to send from this offset: the partial file is
+                    # complete only if it is exactly the document's size
+                    total = _content_range_total(response.headers.get("Content-Range"))
+                    if total == offset:
+                        complete = True
+                        break
+                    expected = f"{total:,}" if total is not None else "unknown"
+                    print(f"⚠ Partial file of {output_path.name} does not match the document "
+                          f"({offset:,} bytes, expected {expected}). Restarting...")
+                    tmp_path.unlink()
+                    continue
+
+                if response.status_code == 206:
+                    content_range = response.headers.get("Content-Range", "")
+                    if not content_range.startswith(f"bytes {offset}-"):
+                        raise ERCOTAPIError(f"Unexpected Content-Range '{content_range}' for {output_path.name}")
+                    total = _content_range_total(content_range)
+                    mode = 'ab'
+                else:
+                    # The server ignored the Range header and sent everything
+                    length = response.headers.get("Content-Length", "")
+                    encoded = response.headers.get("Content-Encoding", "identity") != "identity"
+                    total = int(length) if length.isdigit() and not encoded else None
+                    mode = 'wb'
+
+                with open(tmp_path, mode) as f:
+                    for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                        f.write(chunk)
+                        received += len(chunk)
+
+                size = tmp_path.stat().st_size
+                if total is None or size == total:
+                    complete = True
+                    break
+                if size > total:
+                    print(f"⚠ {output_path.name} is larger than the document ({size:,} of {total:,} bytes). Restarting...")
+                    tmp_path.unlink()
+                else:
+                    print(f"⚠ Transfer of {output_path.name} ended early ({size:,} of {total:,} bytes). Resuming...")
+
+            except requests.exceptions.RequestException as e:
+                last_error = e
+                if attempt < DOWNLOAD_ATTEMPTS:
+                    print(f"⚠ Transfer of {output_path.name} dropped ({type(e).__name__}). Resuming...")
+            finally:
+                response.close()
+
+        if not complete:
+            reason = f": {last_error}" if last_error is not None else ""
+            raise ERCOTAPIError(f"Download of {output_path.name} failed after {DOWNLOAD_ATTEMPTS} attempts{reason}") from last_error
+
+        tmp_path.replace(output_path)
+        return {"file": str(output_path), "bytes": received, "resumed": resumed}
+
+    def download(self, post_from=None, post_to=None, limit=None):
+        """
+        Download every document posted in a time range.
+
+        Documents already on disk are skipped. At most downloadLimit
+        documents (or limit, if smaller) are downloaded per call; run it
+        again to fetch the rest.
+
+        Args:
+            post_from (str): Earliest posting time (YYYY-MM-DDTHH:MM:SS)
+            post_to (str): Latest posting time (YYYY-MM-DDTHH:MM:SS)
+            limit (int): Maximum number of documents to download this run
+
+        Returns:
+            dict: files, bytes, skipped, remaining and failed (document IDs),
+                  or None if the documents could not be listed
+        """
+        documents = self.list_documents(post_from, post_to)
+        if documents is None:
+            return None
+
+        pending = [document for document in documents if not self.document_path(document).exists()]
+        skipped = len(documents) - len(pending)
+        if skipped:
+            print(f"  {skipped:,} already downloaded")
+
+        caps = [cap for cap in (self.download_limit, limit) if cap]
+        remaining = 0
+        if caps and len(pending) > min(caps):
+            remaining = len(pending) - min(caps)
+            pending = pending[:min(caps)]
+            print(f"⚠ Limited to {min(caps):,} documents this run; {remaining:,} left for the next run")
+
+        summary = {"files": [], "bytes": 0, "skipped": skipped, "remaining": remaining, "failed": []}
+        if not pending:
+            return summary
+
+        print(f"\nDownloading {len(pending):,} {self.kind} documents ({self.max_workers} at a time)")
+
+        def fetch(document):
+            try:
+                return document, self._download_document(document), None
+            except (ERCOTAPIError, OSError) as e:
+                # Disk full, permissions, ...: fail this document, not the whole batch
+                return document, None, e
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for number, (document, result, error) in enumerate(executor.map(fetch, pending), start=1):
+                if error is not None:
+                    print(f"✗ [{number}/{len(pending)}] {document.get('docId')}: {error}")
+                    summary["failed"].append(document.get("docId"))
+                    continue
+                summary["files"].append(result["file"])
+                summary["bytes"] += result["bytes"]
+                note = " (resumed)" if result["resumed"] else ""
+                print(f"✓ [{number}/{len(pending)}] {result['bytes']:,} bytes -> {result['file']}{note}")
+
+        print(f"\n✓ Downloaded {len(summary['files']):,} files ({summary['bytes']/1024/1024:.2f} MB)")
+        if summary["failed"]:
+            print(f"✗ {len(summary['failed'])} documents failed; run again to retry them")
+        return summary
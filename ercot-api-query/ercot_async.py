@@ -0,0 +1,555 @@
+#!/usr/bin/env python3
+"""
+ERCOT Async API Client
+
+AsyncERCOTAPIClient sends ERCOT API queries as asyncio coroutines on
+aiohttp, so one event loop can keep many endpoint/day/page requests in
+flight at once. It wraps an ERCOTAPIClient, which keeps the token, caches,
+rate limiter and circuit breaker. It can also be imported from ercot_query.
+
+Requires the optional aiohttp package (pip install aiohttp).
+
+Usage:
+    import asyncio
+    from ercot_query import AsyncERCOTAPIClient
+
+    async def main():
+        async with AsyncERCOTAPIClient() as client:
+            return await client.query_all_pages("np4-190-cd/dam_stlmnt_pnt_prices",
+                                                 {"deliveryDateFrom": "2025-01-27"})
+
+    asyncio.run(main())
+"""
+
+import os
+import json
+import time
+import asyncio
+import functools
+
+from ercot_query import (ERCOTAPIClient, ERCOTAPIError, AUTH_URL,
+                         MAX_THROTTLE_RETRIES, DEFAULT_RETRY_AFTER_SECONDS)
+from ercot_cache import ResponseCache
+from ercot_ratelimit import retry_after_seconds
+
+# Optional: only needed for AsyncERCOTAPIClient (pip install aiohttp)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+# Default number of requests AsyncERCOTAPIClient keeps in flight at once
+DEFAULT_MAX_CONCURRENCY = 16
+
+
+class AsyncERCOTAPIClient:
+    """
+    Asyncio client for the ERCOT API built on aiohttp.
+
+    Wraps an ERCOTAPIClient, which keeps the credentials, token, token
+    cache, rate limiter, circuit breaker, response cache and retry policy,
+    and sends every request as a coroutine instead, with at most
+    max_concurrency requests in flight at once. One event loop can then
+    drive many endpoint/day/page requests together:
+
+        async def main():
+            async with AsyncERCOTAPIClient() as client:
+                results = await client.query_many([
+                    ("np4-190-cd/dam_stlmnt_pnt_prices", {"deliveryDateFrom": "2025-01-27"}),
+                    ("np6-788-cd/lmp_node_zone_hub", {"SCEDTimestampFrom": "2025-01-27T00:00:00"}),
+                ])
+
+        asyncio.run(main())
+
+    Only the query methods below are async. Streaming, downloads and
+    time-range splitting stay on the synchronous client (see `client`).
+    File locks and cache I/O run in the default executor so they never
+    block the event loop.
+
+    Requires the optional aiohttp package (pip install aiohttp).
+    """
+
+    def __init__(self, debug=False, max_concurrency=None, **client_options):
+        """
+        Initialize the async ERCOT API client.
+
+        Args:
+            debug (bool): Enable debug output
+            max_concurrency (int): Maximum requests in flight at once.
+                                   Defaults to ERCOT_MAX_CONCURRENCY from .env, or 16.
+            **client_options: Any other ERCOTAPIClient option
+                              (token_cache, rate_limit, retry_policy, ...)
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncERCOTAPIClient requires aiohttp (pip install aiohttp)")
+
+        # Token, caches, limiter and breaker are shared with this client
+        self.client = ERCOTAPIClient(debug=debug, **client_options)
+        self.debug = debug
+
+        self.max_concurrency = int(max_concurrency or os.getenv('ERCOT_MAX_CONCURRENCY', DEFAULT_MAX_CONCURRENCY))
+
+        # The aiohttp session, semaphore and lock belong to an event loop,
+        # so they are created on first use inside the running loop
+        self._http = None
+        self._semaphore = None
+        self._auth_lock = None
+
+        # Queries currently being fetched, by request key (see _coalesce_async)
+        self._inflight_tasks = {}
+
+        if self.debug:
+            print(f"[DEBUG] Max concurrent async requests: {self.max_concurrency}")
+
+    @staticmethod
+    async def _run_blocking(function, *args, **kwargs):
+        """
+        Run a blocking call (file lock, cache read/write) in the default executor.
+
+        Returns:
+            Whatever function returns
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(function, *args, **kwargs))
+
+    def _get_http(self):
+        """
+        Return the aiohttp session, creating it in the running loop if needed.
+
+        Returns:
+            aiohttp.ClientSession: Session sized to max_concurrency connections
+        """
+        if self._http is None or self._http.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_concurrency)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.client.timeout[0], sock_read=self.client.timeout[1])
+            self._http = aiohttp.ClientSession(connector=connector, timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._auth_lock = asyncio.Lock()
+        return self._http
+
+    async def close(self):
+        """Close the aiohttp session and the wrapped client's pooled sessions."""
+        if self._http is not None:
+            await self._http.close()
+        await self._run_blocking(self.client.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+        return False
+
+    async def authenticate(self, use_cache=True):
+        """
+        Make sure the client holds a valid access token.
+
+        Same token cache, refresh_token grant and password fallback as
+        ERCOTAPIClient.authenticate, without blocking the event loop on
+        the network or the cache file. The cache lock is held across the
+        login, so sync and async processes starting at the same moment
+        log in only once.
+
+        Args:
+            use_cache (bool): Set to False to force a new login
+
+        Returns:
+            bool: True if authentication successful, False otherwise
+        """
+        client = self.client
+        if not use_cache or client.token_cache is None:
+            return await self._renew_token_async()
+
+        # flock() blocks, so take and release it in the executor
+        lock = client.token_cache.lock()
+        try:
+            await self._run_blocking(lock.__enter__)
+        except OSError as e:
+            # Fall back to a plain login if the cache directory is unusable
+            print(f"⚠ Warning: Token cache unavailable ({e}), logging in directly")
+            return await self._renew_token_async()
+
+        try:
+            # Another process may have logged in while we waited for the lock
+            if await self._run_blocking(client._load_cached_token):
+                print(f"✓ Using cached token. Token valid until {client.token_expiry.strftime('%Y-%m-%d %H:%M:%S')}")
+                return True
+
+            if not await self._renew_token_async():
+                return False
+
+            await self._run_blocking(client._save_cached_token)
+            return True
+        finally:
+            await self._run_blocking(lock.__exit__, None, None, None)
+
+    async def _renew_token_async(self):
+        """
+        Obtain a new access token: refresh_token grant first, then password.
+
+        Returns:
+            bool: True if a new token was obtained
+        """
+        client = self.client
+        refresh_token = client.refresh_token
+        if refresh_token:
+            if await self._request_token_async('refresh_token'):
+                return True
+            print("Refresh token rejected. Falling back to password login...")
+            client._drop_refresh_token(refresh_token)
+
+        return await self._request_token_async('password')
+
+    async def _request_token_async(self, grant_type):
+        """
+        Request a token from the B2C endpoint without blocking the loop.
+
+        Args:
+            grant_type (str): 'password' or 'refresh_token'
+
+        Returns:
+            bool: True if a token was obtained
+        """
+        if grant_type == 'refresh_token':
+            print("Refreshing ERCOT API access token...")
+            auth_params = self.client._refresh_params()
+        else:
+            print("Authenticating with ERCOT API...")
+            auth_params = self.client._auth_params()
+
+        http = self._get_http()
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+        if self.debug:
+            print(f"[DEBUG] Async authentication request ({grant_type} grant): POST {AUTH_URL}")
+
+        try:
+            async with http.post(AUTH_URL, data=auth_params, headers=headers) as response:
+                if response.status == 200:
+                    # Parse the JSON response and keep the token
+                    self.client._store_token(await response.json(content_type=None))
+                    print(f"✓ Authentication successful. Token valid until {self.client.token_expiry.strftime('%Y-%m-%d %H:%M:%S')}")
+                    return True
+
+                # Authentication failed
+                print(f"✗ Authentication failed with status code: {response.status}")
+                print(f"Response: {await response.text()}")
+                return False
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Network error or other request issue
+            print(f"✗ Error during authentication: {e}")
+            return False
+
+    async def _ensure_authenticated(self):
+        """
+        Ensure we have a valid access token, refreshing if necessary.
+
+        Concurrent coroutines share one login: the first one to find the
+        token expired authenticates while the others wait on the lock.
+        """
+        if not self.client.use_bearer_auth or self.client._is_token_valid():
+            return
+
+        self._get_http()
+        async with self._auth_lock:
+            # Another coroutine may have refreshed the token while we waited
+            if not self.client._is_token_valid():
+                print("Token expired or not available. Refreshing...")
+                if not await self.authenticate():
+                    raise ERCOTAPIError("Failed to authenticate with ERCOT API")
+
+    async def _reauthenticate(self, rejected_token):
+        """
+        Replace a token the API rejected (HTTP 401) with a fresh login.
+
+        Only the first coroutine to see the rejection drops the token; the
+        others find a different token in place and simply use it.
+
+        Args:
+            rejected_token (str): Access token sent with the rejected request
+        """
+        self._get_http()
+        async with self._auth_lock:
+            if self.client.access_token == rejected_token:
+                await self._run_blocking(self.client._invalidate_token)
+        await self._ensure_authenticated()
+
+    async def _send_query(self, endpoint, parameters=None):
+        """
+        Run a single GET request and parse the JSON response.
+
+        Waits on the semaphore first, so no more than max_concurrency
+        requests are ever in flight, then on the shared rate limiter.
+        Retries follow the same rules as ERCOTAPIClient._send_with_retry,
+        and the response cache and 401 re-login work as in
+        ERCOTAPIClient._send_query.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+
+        Returns:
+            dict: JSON response from the API, or None if request failed
+        """
+        client = self.client
+        cache_key = None
+        cached = None
+        conditional_headers = {}
+        if client.response_cache is not None:
+            cache_key = ResponseCache.make_key(endpoint, parameters)
+            cached = await self._run_blocking(client.response_cache.load, cache_key)
+            if cached is not None:
+                entry, body = cached
+                if entry.get('immutable'):
+                    if self.debug:
+                        print(f"[DEBUG] Response cache hit (closed window): {endpoint}")
+                    return json.loads(body)
+                if entry.get('etag'):
+                    conditional_headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    conditional_headers['If-Modified-Since'] = entry['last_modified']
+
+        await self._ensure_authenticated()
+        http = self._get_http()
+        url = f"{client.base_url}{endpoint}"
+
+        if self.debug:
+            print(f"[DEBUG] Async GET {url} {json.dumps(parameters or {})}")
+
+        policy = client.retry_policy
+        deadline = time.monotonic() + policy.deadline
+        delay = policy.base_delay
+        attempts = 0
+        throttles = 0
+        reauthenticated = False
+
+        async with self._semaphore:
+            while True:
+                if not client.circuit_breaker.allow(endpoint):
+                    print(f"✗ Request not sent: {endpoint} is failing; circuit open")
+                    return None
+
+                if client.rate_limiter is not None:
+                    await client.rate_limiter.acquire_async()
+
+                status = None
+                retry_after = None
+                error = None
+                token = client.access_token
+                try:
+                    headers = dict(client._api_headers(), **conditional_headers)
+                    async with http.get(url, headers=headers, params=parameters) as response:
+                        status = response.status
+                        if status == 304 and cached is not None:
+                            client.circuit_breaker.record_success(endpoint)
+                            if self.debug:
+                                print(f"[DEBUG] Response cache revalidated (HTTP 304): {endpoint}")
+                            await self._run_blocking(client.response_cache.touch, cache_key)
+                            return json.loads(cached[1])
+                        if status == 200:
+                            body = await response.read()
+                            client.circuit_breaker.record_success(endpoint)
+                            if cache_key is not None:
+                                await self._run_blocking(client._cache_response, cache_key, endpoint,
+                                                         parameters, response.headers, body)
+                            return json.loads(body)
+                        retry_after = response.headers.get('Retry-After')
+                        body = await response.text()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    error = e
+
+                if status == 401 and client.use_bearer_auth and not reauthenticated:
+                    # The token was revoked before its expiry (e.g. a stale
+                    # cached token): log in again once and resend
+                    print("⚠ Token rejected by API (HTTP 401). Re-authenticating...")
+                    reauthenticated = True
+                    try:
+                        await self._reauthenticate(token)
+                    except ERCOTAPIError as e:
+                        print(f"✗ {e}")
+                        return None
+                    continue
+
+                if status == 429:
+                    # Throttled: wait for Retry-After, then send the request again
+                    throttles += 1
+                    wait_seconds = retry_after_seconds(retry_after, DEFAULT_RETRY_AFTER_SECONDS)
+                    if throttles <= MAX_THROTTLE_RETRIES and time.monotonic() + wait_seconds <= deadline:
+                        print(f"⚠ Throttled by API (HTTP 429). Retrying in {wait_seconds:.0f} seconds...")
+                        if client.rate_limiter is not None:
+                            # The limiter makes the next acquire wait it out
+                            await self._run_blocking(client.rate_limiter.block_for, wait_seconds)
+                        else:
+                            await asyncio.sleep(wait_seconds)
+                        continue
+                elif status is not None and status < 500:
+                    client.circuit_breaker.record_success(endpoint)
+                else:
+                    # Connection error, timeout or 5xx: back off and try again
+                    attempts += 1
+                    circuit_open = client.circuit_breaker.record_failure(endpoint)
+                    if retry_after:
+                        wait_seconds = retry_after_seconds(retry_after, delay)
+                        if status == 503 and client.rate_limiter is not None:
+                            # Service unavailable: every process sharing the bucket pauses too
+                            await self._run_blocking(client.rate_limiter.block_for, wait_seconds)
+                    else:
+                        wait_seconds = delay = policy.next_delay(delay)
+
+                    if not (circuit_open or attempts >= policy.max_attempts or time.monotonic() + wait_seconds > deadline):
+                        reason = f"HTTP {status}" if status is not None else type(error).__name__
+                        print(f"⚠ {endpoint}: attempt {attempts} failed ({reason}). Retrying in {wait_seconds:.1f} seconds...")
+                        await asyncio.sleep(wait_seconds)
+                        continue
+
+                # Out of retries (or a non-retryable status)
+                if error is not None:
+                    print(f"✗ Error during API request: {error}")
+                else:
+                    print(f"✗ Request failed with status code: {status}")
+                    print(f"Response: {body}")
+                return None
+
+    async def _coalesce_async(self, key, make_coroutine):
+        """
+        Await make_coroutine() unless an identical call is already running
+        on this event loop, in which case await that call's result instead.
+
+        The shared task is shielded, so one caller being cancelled does not
+        cancel the query for the others.
+
+        Args:
+            key (str): Request key from _request_key()
+            make_coroutine (callable): Returns the coroutine performing the query
+
+        Returns:
+            The query result, shared by every caller that joined it
+        """
+        task = self._inflight_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(make_coroutine())
+            self._inflight_tasks[key] = task
+
+            def forget(done_task):
+                if self._inflight_tasks.get(key) is done_task:
+                    del self._inflight_tasks[key]
+
+            task.add_done_callback(forget)
+        elif self.debug:
+            print(f"[DEBUG] Joining identical query already in flight ({key[:12]})")
+
+        return await asyncio.shield(task)
+
+    async def get_report_metadata(self, report_id):
+        """
+        Fetch a report's metadata from the report root (see ERCOTAPIClient.get_report_metadata).
+
+        Returns:
+            dict: The report metadata, or None if the request failed
+        """
+        return await self._send_query(report_id.strip('/').split('/')[0].lower())
+
+    async def query_api(self, endpoint, parameters=None, paginate=False, page_size=None, max_workers=None):
+        """
+        Query the ERCOT API with the specified endpoint and parameters.
+
+        Identical concurrent calls share one request and one result, as in
+        ERCOTAPIClient.query_api.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+            paginate (bool): Fetch and merge all pages of the result
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            max_workers (int): Ignored; concurrency is bounded by max_concurrency
+
+        Returns:
+            dict: JSON response from the API, or None if request failed
+        """
+        key = ERCOTAPIClient._request_key(endpoint, parameters, paginate, page_size)
+        return await self._coalesce_async(key, lambda: self._query_api(endpoint, parameters, paginate, page_size))
+
+    async def _query_api(self, endpoint, parameters, paginate, page_size, max_workers=None):
+        """Run one query_api call (without coalescing)."""
+        if paginate:
+            return await self.query_all_pages(endpoint, parameters, page_size=page_size)
+
+        print(f"\nQuerying endpoint: {endpoint}")
+        if parameters:
+            print(f"Parameters: {json.dumps(parameters, indent=2)}")
+
+        if page_size:
+            parameters = dict(parameters or {}, size=page_size)
+
+        response_data = await self._send_query(endpoint, parameters)
+        if response_data is not None:
+            print(f"✓ Request successful (HTTP 200)")
+        return response_data
+
+
+    async def query_all_pages(self, endpoint, parameters=None, page_size=None, max_workers=None):
+        """
+        Fetch every page of a query and merge them into one response.
+
+        Page 1 is fetched first to read _meta; all remaining pages are then
+        requested at once and the semaphore bounds how many run together.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            max_workers (int): Ignored; concurrency is bounded by max_concurrency
+
+        Returns:
+            dict: Merged JSON response, or None if any page failed
+        """
+        parameters = dict(parameters or {})
+        if page_size:
+            parameters['size'] = page_size
+
+        print(f"\nQuerying endpoint: {endpoint} (all pages)")
+        if parameters:
+            print(f"Parameters: {json.dumps(parameters, indent=2)}")
+
+        merged = await self._send_query(endpoint, dict(parameters, page=1))
+        if merged is None:
+            print(f"✗ Failed to fetch page 1 from {endpoint}")
+            return None
+
+        total_pages = ERCOTAPIClient._total_pages(merged)
+        pages = await asyncio.gather(*[
+            self._send_query(endpoint, dict(parameters, page=page_number))
+            for page_number in range(2, total_pages + 1)
+        ])
+
+        # gather() keeps the order of its arguments, so rows stay in page order
+        for page_number, page in enumerate(pages, start=2):
+            if page is None:
+                print(f"✗ Failed to fetch page {page_number}/{total_pages} from {endpoint}")
+                return None
+            merged.setdefault('data', []).extend(page.get('data', []))
+
+        if isinstance(merged.get('_meta'), dict):
+            merged['_meta']['pagesRetrieved'] = total_pages
+
+        print(f"✓ Retrieved {len(merged.get('data', [])):,} records from {total_pages} page(s)")
+        return merged
+
+    async def query_many(self, queries, paginate=False, page_size=None):
+        """
+        Run several queries concurrently on one event loop.
+
+        Args:
+            queries (list): (endpoint, parameters) tuples
+            paginate (bool): Fetch and merge all pages of each result
+            page_size (int): Records per page when paginating
+
+        Returns:
+            list: One response (or None on failure) per query, in input order
+        """
+        return await asyncio.gather(*[
+            self.query_api(endpoint, parameters, paginate=paginate, page_size=page_size)
+            for endpoint, parameters in queries
+        ])
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+ERCOT Token and Response Caches
+
+On-disk caches shared by every process on this machine:
+
+- TokenCache: access and refresh tokens, so cron jobs do not log in on
+  every run (state/token_cache.json, owner-only)
+- ResponseCache: opt-in cache of API responses with their ETag and
+  Last-Modified validators, bounded by a byte budget (state/response_cache/)
+- file_lock: the cross-process lock the caches (and RateLimiter) use
+
+ERCOTAPIClient creates them from its token_cache / response_cache options
+(or ERCOT_TOKEN_CACHE / ERCOT_RESPONSE_CACHE in .env).
+
+Usage:
+    from ercot_cache import ResponseCache
+
+    cache = ResponseCache("state/response_cache", max_bytes=256 * 1024 * 1024)
+    key = ResponseCache.make_key("np4-190-cd/dam_stlmnt_pnt_prices", parameters)
+    cached = cache.load(key)    # (entry, body), or None
+"""
+
+import os
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+# fcntl is POSIX-only; without it the token cache works but is not locked
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# Where access tokens are cached between runs (set ERCOT_TOKEN_CACHE=off to disable)
+DEFAULT_TOKEN_CACHE = "state/token_cache.json"
+
+# Opt-in response cache (see ResponseCache); ERCOT_RESPONSE_CACHE turns it on
+DEFAULT_RESPONSE_CACHE = "state/response_cache"
+DEFAULT_RESPONSE_CACHE_MB = 512
+
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Hold an exclusive flock() on lock_path for the duration of the block.
+
+    On platforms without fcntl this only creates the lock file, so callers
+    still work but are not serialised across processes.
+
+    Args:
+        lock_path (Path): Lock file to create (owner-only) and lock
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class TokenCache:
+    """
+    On-disk cache of access tokens shared by every process on this machine.
+
+    Cron jobs each construct a fresh client, so without a cache every run
+    pays a full B2C login. Entries are keyed by a hash of the username and
+    client ID, the file is written atomically with owner-only permissions,
+    and a lock file serialises logins so that concurrent processes whose
+    token has expired share one login instead of each doing their own.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Location of the cache file (e.g. state/token_cache.json)
+        """
+        self.path = Path(path)
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+
+    @staticmethod
+    def make_key(username, client_id):
+        """
+        Build the cache key for a username / client ID pair.
+
+        The key is hashed so the cache file does not reveal the username.
+
+        Returns:
+            str: Hex digest identifying the account
+        """
+        return hashlib.sha256(f"{username}|{client_id}".encode('utf-8')).hexdigest()
+
+    @contextmanager
+    def lock(self):
+        """
+        Hold an exclusive lock on the cache across processes.
+
+        Uses flock() where available; on platforms without fcntl the cache
+        still works, but concurrent logins are not serialised.
+        """
+        with file_lock(self.lock_path):
+            yield
+
+    def _read_all(self):
+        """Return every cached entry (empty if the file is missing or unreadable)."""
+        try:
+            with open(self.path, 'r') as f:
+                entries = json.load(f)
+            return entries if isinstance(entries, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def load(self, key):
+        """
+        Look up a cached entry.
+
+        Args:
+            key (str): Key from make_key()
+
+        Returns:
+            dict: The cached entry, or None if there is none
+        """
+        return self._read_all().get(key)
+
+    def store(self, key, entry):
+        """
+        Save an entry, replacing the file atomically.
+
+        Call this while holding lock() so concurrent writers do not
+        overwrite each other's entries.
+
+        Args:
+            key (str): Key from make_key()
+            entry (dict): JSON-serialisable token data, or None to remove it
+        """
+        entries = self._read_all()
+        if entry is None:
+            entries.pop(key, None)
+        else:
+            entries[key] = entry
+
+        self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+
+        # Create the file owner-only from the start so the token is never world-readable
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, self.path)
+
+
+class ResponseCache:
+    """
+    Opt-in on-disk cache of API responses.
+
+    Historical ERCOT intervals do not change, so re-running a query or
+    re-collecting a finished day should not cost API quota. Each response
+    is stored in its own file, keyed by a hash of the endpoint and the
+    normalised query parameters, next to the validators (ETag and
+    Last-Modified) needed to revalidate it with a conditional request.
+    Entries for fully closed time windows are marked immutable and served
+    without contacting the API at all.
+
+    The cache is bounded by a byte budget: after each write the least
+    recently used entries (oldest modification time; hits touch the file)
+    are deleted until the total fits.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_RESPONSE_CACHE_MB * 1024 * 1024):
+        """
+        Args:
+            directory (str): Folder holding the cache entries
+            max_bytes (int): Total size the cache is trimmed to
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.lock_path = self.directory / '.lock'
+
+    @staticmethod
+    def make_key(endpoint, parameters):
+        """
+        Build the cache key for a request.
+
+        Leading/trailing slashes, parameter order and value types (1 vs '1')
+        do not change the key.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters
+
+        Returns:
+            str: Hex digest identifying the request
+        """
+        normalised = {str(name): str(value) for name, value in (parameters or {}).items() if value is not None}
+        request = json.dumps([endpoint.strip('/'), normalised], sort_keys=True)
+        return hashlib.sha256(request.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.cache"
+
+    def load(self, key):
+        """
+        Look up a cached response and mark it as recently used.
+
+        Args:
+            key (str): Key from make_key()
+
+        Returns:
+            tuple: (entry, body) where entry holds the validators and the
+                   'immutable' flag and body is the raw response bytes,
+                   or None if there is no usable entry
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = json.loads(f.readline())
+                body = f.read()
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry, body
+
+    def touch(self, key):
+        """Mark an entry as recently used (e.g. after a 304 Not Modified)."""
+        try:
+            os.utime(self._path(key))
+        except OSError:
+            pass
+
+    def store(self, key, body, etag=None, last_modified=None, immutable=False):
+        """
+        Save a response, replacing any previous entry atomically.
+
+        Args:
+            key (str): Key from make_key()
+            body (bytes): Raw response body
+            etag (str): ETag header of the response
+            last_modified (str): Last-Modified header of the response
+            immutable (bool): Serve the entry without revalidating
+        """
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "immutable": immutable,
+            "stored_at": datetime.now().isoformat()
+        }
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(entry).encode('utf-8') + b'\n')
+            f.write(body)
+        os.replace(tmp_path, path)
+
+        self.evict()
+
+    def evict(self):
+        """
+        Delete least recently used entries until the cache fits max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        with file_lock(self.lock_path):
+            entries = []
+            total = 0
+            for path in self.directory.glob('*.cache'):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                try:
+                    path.unlink()
+                except OSError:
+                    continue
+                total -= size
+                removed += 1
+            return removed
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+ERCOT Columnar Results
+
+Turns ERCOT's tabular payloads (a 'fields' header plus 'data' as a list of
+row lists) into typed column arrays instead of millions of small Python
+objects.
+
+- Numeric columns become float64/int64 NumPy arrays (missing values: NaN)
+- Date and timestamp columns become datetime64 arrays (missing values: NaT)
+- String columns (settlement point names, hour-ending labels, ...) are
+  dictionary-encoded: an int32 code per row plus one array of unique values
+- Boolean columns are int8 codes: 1 true, 0 false, -1 missing. Text values
+  are parsed ('false', 'N' and '0' are false); anything unrecognised is an error
+
+Requires numpy. ColumnarResult.to_arrow() and arrow_schema() also require pyarrow.
+
+Usage:
+    from ercot_query import ERCOTAPIClient
+
+    client = ERCOTAPIClient()
+    result = client.query_columnar("np6-788-cd/lmp_node_zone_hub", parameters)
+    lmp = result.column("LMP")                 # float64 array
+    points = result.column("settlementPoint")  # decoded strings
+    table = result.to_arrow()                  # pyarrow.Table
+"""
+
+import numpy as np
+
+
+# How ERCOT 'dataType' values map onto column kinds. Matching is done on the
+# lower-cased type name, so 'DOUBLE', 'double precision' and 'Float' all work.
+NUMERIC_FLOAT_TYPES = ('double', 'float', 'decimal', 'numeric', 'real', 'number')
+NUMERIC_INT_TYPES = ('int', 'long', 'short', 'byte')
+DATETIME_TYPES = ('datetime', 'timestamp')
+DATE_TYPES = ('date',)
+BOOLEAN_TYPES = ('bool',)
+
+# Lower-cased text accepted in boolean columns
+TRUE_VALUES = ('true', 't', 'yes', 'y', '1')
+FALSE_VALUES = ('false', 'f', 'no', 'n', '0')
+
+
+def column_kind(field):
+    """
+    Decide how to store a column from its ERCOT field metadata.
+
+    Args:
+        field (dict): One entry of the response's 'fields' list
+
+    Returns:
+        str: 'float', 'int', 'datetime', 'date', 'bool' or 'string'
+    """
+    data_type = str(field.get('dataType') or field.get('type') or '').lower()
+
+    if any(name in data_type for name in DATETIME_TYPES):
+        return 'datetime'
+    if any(name in data_type for name in DATE_TYPES):
+        return 'date'
+    if any(name in data_type for name in BOOLEAN_TYPES):
+        return 'bool'
+    if any(name in data_type for name in NUMERIC_FLOAT_TYPES):
+        return 'float'
+    if any(name in data_type for name in NUMERIC_INT_TYPES):
+        return 'int'
+    return 'string'
+
+
+def _import_pyarrow():
+    """Import pyarrow, which is only needed for the Arrow conversions."""
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Arrow output requires pyarrow (pip install pyarrow)")
+    return pa
+
+
+def arrow_schema(fields):
+    """
+    Build the Arrow schema a report's field metadata declares.
+
+    Unlike the arrays of one result, whose types can widen with the data
+    (an int column with a missing value becomes float64), this depends on
+    the metadata alone, so every file of a report gets the same schema.
+
+    Args:
+        fields (list): The response's 'fields' metadata
+
+    Returns:
+        pyarrow.Schema: One field per column, in field order
+    """
+    pa = _import_pyarrow()
+    types = {
+        'float': pa.float64(),
+        'int': pa.int64(),
+        'datetime': pa.timestamp('s'),
+        'date': pa.date32(),
+        'bool': pa.bool_(),
+        'string': pa.dictionary(pa.int32(), pa.string()),
+    }
+    return pa.schema([(field.get('name'), types[column_kind(field)]) for field in fields])
+
+
+def _parse_bool(name, value):
+    """
+    Turn one boolean column value into its int8 code.
+
+    Args:
+        name (str): Column name, for the error message
+        value: The raw value (bool, number, text or None)
+
+    Returns:
+        int: 1 for true, 0 for false, -1 for missing
+
+    Raises:
+        ValueError: If the value is not a recognisable boolean
+    """
+    if value is None:
+        return -1
+    if isinstance(value, (bool, int, float)) and value in (0, 1):
+        return int(value)
+    text = str(value).strip().lower()
+    if text == '':
+        return -1
+    if text in TRUE_VALUES:
+        return 1
+    if text in FALSE_VALUES:
+        return 0
+    raise ValueError(f"Column {name}: {value!r} is not a boolean value")
+
+
+def _value_strings(values):
+    """Turn one batch of raw values into strings, keeping None as missing."""
+    return [None if value is None else str(value) for value in values]
+
+
+def _chunk_strings(chunk):
+    """Turn a converted column batch back into strings (None for NaN/NaT)."""
+    strings = []
+    for value in chunk.tolist():
+        if value is None or value != value:
+            strings.append(None)
+        elif hasattr(value, 'isoformat'):
+            strings.append(value.isoformat())
+        else:
+            strings.append(str(value))
+    return strings
+
+
+class ColumnarResult:
+    """
+    A tabular ERCOT result stored column by column.
+
+    Attributes:
+        names (list): Column names, in the API's field order
+        kinds (dict): Column name -> kind (see column_kind)
+        columns (dict): Column name -> NumPy array. String columns hold int32
+                        codes into categories and boolean columns hold int8
+                        codes (1 true, 0 false); -1 marks missing values
+        categories (dict): String column name -> array of unique values
+        meta (dict): The response's _meta block, if any
+    """
+
+    def __init__(self, names, kinds, columns, categories, meta=None):
+        self.names = names
+        self.kinds = kinds
+        self.columns = columns
+        self.categories = categories
+        self.meta = meta or {}
+
+    def __len__(self):
+        if not self.names:
+            return 0
+        return len(self.columns[self.names[0]])
+
+    def column(self, name, decode=True):
+        """
+        Return one column as an array.
+
+        Args:
+            name (str): Column name
+            decode (bool): For string and boolean columns, return the values
+                           (True/False/None for booleans) rather than the codes
+
+        Returns:
+            numpy.ndarray: The column
+        """
+        values = self.columns[name]
+        if decode and name in self.categories:
+            categories = np.append(self.categories[name].astype(object), None)
+            # Code -1 (missing) indexes the trailing None
+            return categories[values]
+        if decode and self.kinds.get(name) == 'bool':
+            # Code -1 (missing) indexes the trailing None
+            return np.array([False, True, None], dtype=object)[np.where(values < 0, 2, values)]
+        return values
+
+    def to_structured(self):
+        """
+        Return the result as one NumPy structured array.
+
+        String columns keep their int32 dictionary codes; look the values
+        up in self.categories. Boolean columns keep their int8 codes.
+
+        Returns:
+            numpy.ndarray: Structured array with one field per column
+        """
+        dtype = [(name, self.columns[name].dtype) for name in self.names]
+        structured = np.empty(len(self), dtype=dtype)
+        for name in self.names:
+            structured[name] = self.columns[name]
+        return structured
+
+    def to_arrow(self, schema=None):
+        """
+        Return the result as a pyarrow Table.
+
+        String columns become dictionary arrays; NaN/NaT and missing
+        booleans become nulls.
+
+        Args:
+            schema (pyarrow.Schema): Cast the columns to this schema (see
+                                     arrow_schema). Columns it lacks become
+                                     nulls; values that do not fit raise
+                                     pyarrow.ArrowInvalid instead of being
+                                     truncated. Default: the result's own types.
+
+        Returns:
+            pyarrow.Table: The result
+        """
+        pa = _import_pyarrow()
+
+        if schema is not None:
+            extra = [name for name in self.names if schema.get_field_index(name) < 0]
+            if extra:
+                raise ValueError(f"Columns not in the schema: {', '.join(extra)}")
+
+        arrays = {}
+        for name in self.names:
+            values = self.columns[name]
+            if name in self.categories:
+                codes = pa.array(values, mask=values < 0, type=pa.int32())
+                arrays[name] = pa.DictionaryArray.from_arrays(codes, pa.array(self.categories[name], type=pa.string()))
+            elif self.kinds.get(name) == 'bool':
+                arrays[name] = pa.array(values == 1, mask=values < 0, type=pa.bool_())
+            else:
+                arrays[name] = pa.array(values, from_pandas=True)
+
+        if schema is None:
+            return pa.Table.from_arrays([arrays[name] for name in self.names], names=self.names)
+
+        columns = []
+        for field in schema:
+            array = arrays.get(field.name)
+            if array is None:
+                array = pa.nulls(len(self), type=field.type)
+            elif array.type != field.type:
+                array = array.cast(field.type)
+            columns.append(array)
+        return pa.Table.from_arrays(columns, schema=schema)
+
+
+class ColumnarBuilder:
+    """
+    Builds a ColumnarResult from batches of row lists.
+
+    Each batch is converted to typed arrays and the Python row objects can
+    be dropped right away, so peak memory is one batch of rows plus the
+    compact columns built so far. String dictionaries are shared across
+    batches, so each distinct value is stored once.
+    """
+
+    def __init__(self, fields):
+        """
+        Args:
+            fields (list): The response's 'fields' metadata
+        """
+        self.names = [field.get('name') for field in fields]
+        self.kinds = {field.get('name'): column_kind(field) for field in fields}
+        self._chunks = {name: [] for name in self.names}
+        self._dictionaries = {name: {} for name in self.names if self.kinds[name] == 'string'}
+
+    def _encode_strings(self, name, values):
+        """Map string values to dictionary codes (-1 for missing)."""
+        dictionary = self._dictionaries[name]
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            if value is None:
+                codes[i] = -1
+            else:
+                code = dictionary.get(value)
+                if code is None:
+                    code = dictionary[value] = len(dictionary)
+                codes[i] = code
+        return codes
+
+    def widen(self, name, kind):
+        """
+        Change a column to a wider kind, converting the batches added so far.
+
+        Used when a later batch does not fit the type the column started
+        with: int -> float when values are missing or fractional, and
+        anything -> string when values are not numbers or dates. Values
+        are never truncated to fit.
+
+        Args:
+            name (str): Column name
+            kind (str): 'float' or 'string'
+        """
+        current = self.kinds[name]
+        if current == kind or current == 'string':
+            return
+        if kind == 'float':
+            self._chunks[name] = [chunk.astype(np.float64) for chunk in self._chunks[name]]
+        else:
+            self._dictionaries[name] = {}
+            self._chunks[name] = [self._encode_strings(name, _chunk_strings(chunk)) for chunk in self._chunks[name]]
+        self.kinds[name] = kind
+
+    def _widen_to_strings(self, name, values):
+        """Widen a column to string and encode this batch's raw values as text."""
+        self.widen(name, 'string')
+        return self._encode_strings(name, _value_strings(values))
+
+    @staticmethod
+    def _to_floats(values):
+        """Convert raw values to float64 (None -> NaN). Raises ValueError/TypeError."""
+        return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float64, count=len(values))
+
+    def _convert(self, name, values):
+        """Convert one batch of a column to a typed array."""
+        kind = self.kinds[name]
+
+        if kind == 'float':
+            if isinstance(values, np.ndarray) and values.dtype.kind in 'fiub':
+                # Already converted (e.g. by ercot_decoder), missing values as NaN
+                return values.astype(np.float64, copy=False)
+            try:
+                return self._to_floats(values)
+            except (ValueError, TypeError):
+                # Not numbers: keep the raw text, dictionary-encoded
+                return self._widen_to_strings(name, values)
+
+        if kind == 'int':
+            if isinstance(values, np.ndarray) and values.dtype.kind in 'iu':
+                return values.astype(np.int64, copy=False)
+            if not any(v is None or (isinstance(v, float) and not v.is_integer()) for v in values):
+                try:
+                    return np.fromiter(values, dtype=np.int64, count=len(values))
+                except (ValueError, TypeError, OverflowError):
+                    pass
+            # NumPy ints cannot hold missing or fractional values, so widen
+            # to float, or to string if the values are not numbers at all
+            try:
+                floats = self._to_floats(values)
+            except (ValueError, TypeError):
+                return self._widen_to_strings(name, values)
+            self.widen(name, 'float')
+            return floats
+
+        if kind in ('datetime', 'date'):
+            unit = 'datetime64[s]' if kind == 'datetime' else 'datetime64[D]'
+            try:
+                return np.array(values, dtype=unit)
+            except ValueError:
+                # Not ISO-formatted: keep the raw text, dictionary-encoded
+                return self._widen_to_strings(name, values)
+
+        if kind == 'bool':
+            return np.fromiter((_parse_bool(name, v) for v in values), dtype=np.int8, count=len(values))
+
+        return self._encode_strings(name, values)
+
+    def append_rows(self, rows):
+        """
+        Add a batch of rows.
+
+        Args:
+            rows (list): Row lists in field order
+        """
+        if not rows:
+            return
+        self.append_columns([[row[index] for row in rows] for index in range(len(self.names))])
+
+    def append_columns(self, columns):
+        """
+        Add a batch given column by column.
+
+        Every column is converted before any is appended, so a batch that
+        fails to convert (e.g. an unrecognised boolean) leaves all columns
+        the same length.
+
+        Args:
+            columns (list): One list or NumPy array per field, in field
+                            order, all the same length
+
+        Raises:
+            ValueError: If a value cannot be stored in its column
+        """
+        if not columns or not len(columns[0]):
+            return
+        # Convert first: widen() may replace a column's chunk list
+        converted = [self._convert(name, values) for name, values in zip(self.names, columns)]
+        for name, array in zip(self.names, converted):
+            self._chunks[name].append(array)
+
+    def build(self, meta=None):
+        """
+        Concatenate the batches into a ColumnarResult.
+
+        Args:
+            meta (dict): The response's _meta block, kept on the result
+
+        Returns:
+            ColumnarResult: The finished result
+        """
+        columns = {}
+        categories = {}
+        for name in self.names:
+            chunks = self._chunks[name]
+            if chunks:
+                columns[name] = np.concatenate(chunks)
+            else:
+                empty_types = {'string': np.int32, 'bool': np.int8}
+                columns[name] = np.empty(0, dtype=empty_types.get(self.kinds[name], np.float64))
+
+            if self.kinds[name] == 'string':
+                # Dicts keep insertion order, which is the code order
+                categories[name] = np.array(list(self._dictionaries[name]), dtype=object)
+
+        return ColumnarResult(self.names, dict(self.kinds), columns, categories, meta)
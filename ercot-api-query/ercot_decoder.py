@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+ERCOT Archive Decoder
+
+Reads the zip files ERCOT publishes (fileType 'zip,csv', 'zip,csv,xml', ...)
+without extracting them. Zips are opened from a memory-mapped file, from
+bytes, or from a download stream. CSV members, including CSVs inside
+nested zips (bundles), are decompressed and parsed as a stream. Only one
+batch of rows is held as text at a time.
+
+Each batch is converted column by column with NumPy, so rows come back in
+the same shape the API client returns:
+
+- decode_archive() gives a ColumnarResult (see ercot_columnar), the same
+  result type as ERCOTAPIClient.query_columnar
+- iter_archive_records() yields row lists (or dicts), like
+  ERCOTAPIClient.iter_records, with numbers as floats/ints, missing values
+  as None and ERCOT's MM/DD/YYYY dates rewritten as ISO dates
+- decode_archives() spreads many zips across a pool of processes, since
+  decoding thousands of daily files is CPU-bound
+
+Column types are not in the CSVs, so they are inferred from the first
+batch. A later batch that does not fit widens its column (integer to
+float, number or date to string); values are never truncated.
+
+Requires numpy.
+
+Usage:
+    from ercot_decoder import decode_archive, decode_archives
+
+    result = decode_archive("output/archive/np6-905-cd/2024/01/123_SPP.zip")
+    prices = result.column("SettlementPointPrice")
+
+    for path, result in decode_archives(paths):
+        ...
+"""
+
+import io
+import re
+import csv
+import mmap
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+from ercot_columnar import ColumnarBuilder
+
+
+# Rows parsed and converted at a time
+DECODE_BATCH_SIZE = 50000
+
+# Value formats used to infer column types from ERCOT CSVs
+DATE_PATTERN = re.compile(r'^(\d{2}/\d{2}/\d{4}|\d{4}-\d{2}-\d{2})$')
+DATETIME_PATTERN = re.compile(r'^(\d{2}/\d{2}/\d{4}|\d{4}-\d{2}-\d{2})[ T]\d{2}:\d{2}(:\d{2})?$')
+INTEGER_PATTERN = re.compile(r'^-?\d+$')
+
+
+class _MappedFile(mmap.mmap):
+    """A read-only memory map that zipfile accepts as a seekable file."""
+
+    def seekable(self):
+        return True
+
+
+@contextmanager
+def open_archive(source):
+    """
+    Open a zip file without extracting it.
+
+    Args:
+        source: Path of a zip file (memory-mapped), the zip's bytes, or a
+                file-like object. A stream that cannot seek (e.g. a
+                download's response.raw) is read into memory first, since
+                a zip's directory is at the end of the file.
+
+    Yields:
+        zipfile.ZipFile: The open archive
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        with zipfile.ZipFile(io.BytesIO(source)) as archive:
+            yield archive
+        return
+
+    if hasattr(source, 'read'):
+        if not (hasattr(source, 'seekable') and source.seekable()):
+            source = io.BytesIO(source.read())
+        with zipfile.ZipFile(source) as archive:
+            yield archive
+        return
+
+    with open(source, 'rb') as f:
+        with _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with zipfile.ZipFile(mapped) as archive:
+                yield archive
+
+
+def iter_csv_members(archive):
+    """
+    Yield the CSV files in a zip, descending into nested zips.
+
+    Args:
+        archive (zipfile.ZipFile): An open archive
+
+    Yields:
+        tuple: (member name, text stream of the CSV)
+    """
+    for info in archive.infolist():
+        name = info.filename.lower()
+        if name.endswith('.zip'):
+            # Bundles hold one zip per posting; open each in memory
+            with zipfile.ZipFile(io.BytesIO(archive.read(info))) as nested:
+                for member_name, stream in iter_csv_members(nested):
+                    yield f"{info.filename}/{member_name}", stream
+        elif name.endswith('.csv'):
+            with archive.open(info) as raw:
+                # utf-8-sig drops the byte-order mark some reports start with
+                yield info.filename, io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+
+
+def infer_fields(header, rows):
+    """
+    Guess each column's type from a sample of rows.
+
+    Returns fields in the API's 'fields' format, so they can be handed to
+    ColumnarBuilder: a column is DOUBLE or INTEGER if every non-empty value
+    parses as a number, DATE or DATETIME if every non-empty value is a date
+    or timestamp, and STRING otherwise.
+
+    Args:
+        header (list): Column names
+        rows (list): Sample rows (lists of strings)
+
+    Returns:
+        list: One {'name', 'dataType'} dict per column
+    """
+    fields = []
+    for index, name in enumerate(header):
+        values = [row[index] for row in rows if index < len(row) and row[index] != '']
+
+        if not values:
+            data_type = 'STRING'
+        elif all(DATETIME_PATTERN.match(value) for value in values):
+            data_type = 'DATETIME'
+        elif all(DATE_PATTERN.match(value) for value in values):
+            data_type = 'DATE'
+        elif all(INTEGER_PATTERN.match(value) for value in values):
+            data_type = 'INTEGER'
+        else:
+            try:
+                np.array(values).astype(np.float64)
+                data_type = 'DOUBLE'
+            except ValueError:
+                data_type = 'STRING'
+
+        fields.append({'name': name, 'dataType': data_type})
+    return fields
+
+
+def _is_date(value):
+    """True if value is a date or timestamp in one of the CSV formats."""
+    return bool(DATETIME_PATTERN.match(value) or DATE_PATTERN.match(value))
+
+
+def _iso_date(value):
+    """
+    Rewrite MM/DD/YYYY[ HH:MM:SS] as YYYY-MM-DD[THH:MM:SS].
+
+    ISO values pass through with a 'T' separator; anything that is not a
+    date or timestamp is returned unchanged.
+    """
+    if not _is_date(value):
+        return value
+    if value[2:3] == '/':
+        value = f"{value[6:10]}-{value[0:2]}-{value[3:5]}{value[10:]}"
+    return value.replace(' ', 'T')
+
+
+def _convert_columns(builder, rows):
+    """
+    Convert a batch of text rows into typed columns.
+
+    Numeric columns are parsed in one vectorised call each (NaN for
+    missing values); dates are rewritten as ISO strings for NumPy's
+    datetime64; empty strings become None.
+
+    A column whose values no longer fit its inferred type is widened on
+    the builder first (see ColumnarBuilder.widen): an INTEGER column with
+    a fractional value becomes DOUBLE, and a numeric or date column with
+    text becomes STRING.
+
+    Args:
+        builder (ColumnarBuilder): Supplies the column names and kinds
+                                   (widened in place if needed)
+        rows (list): Rows of strings
+
+    Returns:
+        list: One array or list per column, in field order
+    """
+    columns = []
+    for index, name in enumerate(builder.names):
+        values = [row[index] if index < len(row) else '' for row in rows]
+        kind = builder.kinds[name]
+
+        if kind in ('float', 'int'):
+            text = np.array(values)
+            missing = text == ''
+            if kind == 'int':
+                try:
+                    integers = np.where(missing, '0', text).astype(np.int64)
+                except (ValueError, OverflowError):
+                    # A fractional (or huge) value: the column is really DOUBLE
+                    builder.widen(name, 'float')
+                    kind = 'float'
+                else:
+                    if not missing.any():
+                        columns.append(integers)
+                    else:
+                        # The builder widens the column to float for the missing values
+                        columns.append([None if gap else value
+                                        for gap, value in zip(missing.tolist(), integers.tolist())])
+                    continue
+            try:
+                columns.append(np.where(missing, 'nan', text).astype(np.float64))
+            except ValueError:
+                # Text in a numeric column: keep every value as a string
+                builder.widen(name, 'string')
+                columns.append([v if v else None for v in values])
+
+        elif kind in ('date', 'datetime'):
+            if all(_is_date(v) for v in values if v):
+                columns.append([_iso_date(v) if v else None for v in values])
+            else:
+                # Text in a date column: keep every value as a string
+                builder.widen(name, 'string')
+                columns.append([v if v else None for v in values])
+
+        else:
+            columns.append([v if v else None for v in values])
+
+    return columns
+
+
+def _iter_batches(archive, batch_size):
+    """
+    Yield (member name, header, rows) batches from every CSV in an archive.
+    """
+    for member_name, stream in iter_csv_members(archive):
+        reader = csv.reader(stream)
+        try:
+            header = next(reader, None)
+            if header is None:
+                continue
+
+            batch = []
+            for row in reader:
+                if not row:
+                    continue
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    yield member_name, header, batch
+                    batch = []
+        except csv.Error as e:
+            raise csv.Error(f"{member_name}, line {reader.line_num}: {e}") from e
+        if batch:
+            yield member_name, header, batch
+
+
+def decode_archive(source, batch_size=DECODE_BATCH_SIZE):
+    """
+    Decode every CSV in a zip into one ColumnarResult.
+
+    CSVs whose header differs from the first one are skipped with a
+    warning (a zip normally holds one report's files).
+
+    Args:
+        source: Path, bytes or file-like object (see open_archive)
+        batch_size (int): Rows converted to arrays at a time
+
+    Returns:
+        ColumnarResult: All rows as typed columns; meta lists the CSV
+                        members decoded ('members') and the row count
+                        ('totalRecords')
+    """
+    builder = None
+    header = None
+    members = []
+
+    with open_archive(source) as archive:
+        for member_name, member_header, rows in _iter_batches(archive, batch_size):
+            if builder is None:
+                header = member_header
+                builder = ColumnarBuilder(infer_fields(header, rows))
+            elif member_header != header:
+                if member_name not in members:
+                    print(f"⚠ Skipping {member_name}: columns differ from the first CSV")
+                    members.append(member_name)
+                continue
+
+            if member_name not in members:
+                members.append(member_name)
+            builder.append_columns(_convert_columns(builder, rows))
+
+    builder = builder or ColumnarBuilder([])
+    result = builder.build()
+    result.meta = {'members': members, 'totalRecords': len(result)}
+    return result
+
+
+def iter_archive_records(source, as_dict=False, batch_size=DECODE_BATCH_SIZE):
+    """
+    Yield the rows of every CSV in a zip, one at a time.
+
+    Values are typed the way the API returns them: numbers as int/float,
+    dates and timestamps as ISO strings, missing values as None.
+
+    Args:
+        source: Path, bytes or file-like object (see open_archive)
+        as_dict (bool): Yield {column: value} dicts instead of row lists
+        batch_size (int): Rows converted at a time
+
+    Yields:
+        list or dict: One record at a time
+    """
+    with open_archive(source) as archive:
+        builder = None
+        for _, header, rows in _iter_batches(archive, batch_size):
+            if builder is None or builder.names != header:
+                builder = ColumnarBuilder(infer_fields(header, rows))
+
+            columns = []
+            for values in _convert_columns(builder, rows):
+                if isinstance(values, np.ndarray):
+                    values = [None if v != v else v for v in values.tolist()]
+                columns.append(values)
+
+            for row in zip(*columns):
+                yield dict(zip(header, row)) if as_dict else list(row)
+
+
+def _decode_file(task):
+    """Process-pool worker: decode one archive, reporting errors instead of raising."""
+    source, batch_size = task
+    try:
+        return decode_archive(source, batch_size), None
+    except (OSError, ValueError, csv.Error, zipfile.BadZipFile) as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def decode_archives(sources, processes=None, batch_size=DECODE_BATCH_SIZE):
+    """
+    Decode many zips in parallel worker processes.
+
+    Each zip is decoded entirely inside one worker and only the compact
+    column arrays are sent back, so the CSV parsing runs on all cores.
+
+    Args:
+        sources (list): Zip file paths
+        processes (int): Worker processes (default: one per CPU)
+        batch_size (int): Rows converted to arrays at a time
+
+    Yields:
+        tuple: (source, ColumnarResult), in input order; the result is
+               None if that zip could not be decoded
+    """
+    sources = list(sources)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        tasks = [(str(source), batch_size) for source in sources]
+        for source, (result, error) in zip(sources, executor.map(_decode_file, tasks)):
+            if error is not None:
+                print(f"✗ Could not decode {source}: {error}")
+            yield source, result
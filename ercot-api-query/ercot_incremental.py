@@ -0,0 +1,701 @@
+#!/usr/bin/env python3
+"""
+ERCOT Incremental Polling Engine
+
+Polls any number of endpoints ("feeds") for new data since their last
+successful poll. Each feed has its own endpoint, parameter type, polling
+interval, watermark and output folder, so adding a feed is a
+few lines of configuration instead of a copy of TEMPLATE_incremental_poller.py
+and another cron entry.
+
+IncrementalEngine runs every feed on one shared ERCOTAPIClient: one login,
+one connection pool and one rate limiter, with up to max_concurrent feeds
+polling at the same time.
+
+Parameter types (see ercot_query.TIME_RANGE_PARAMETERS):
+
+- SCED:    SCEDTimestampFrom/To       (YYYY-MM-DDTHH:MM:SS)
+- DAM:     deliveryDateFrom/To        (YYYY-MM-DD)
+- ARCHIVE: postDatetimeFrom/To        (YYYY-MM-DDTHH:MM:SS)
+
+If a feed does not name one, it is detected from the report ID
+(discover_endpoints.detect_parameter_type).
+
+Watermarks follow the data, not the clock: a feed remembers the latest
+timestamp it has actually received (e.g. the maximum SCEDTimestamp) and
+the next poll asks for everything from a short overlap before it. Rows
+published late for an interval inside the overlap are therefore still
+picked up, and rows received before are dropped using a compact index of
+8-byte row digests (SeenIndex) kept for the overlap only, in the state
+database's seen_rows table rather than in the watermark's JSON.
+
+Watermarks live in the shared state database (see ercot_state), keyed by
+feed name, and every poll is recorded in its run history. The watermark
+and the run are committed in one transaction once the data is saved, so a
+crash never leaves a half-written watermark. A feed's old JSON state file
+(state/incremental_<name>_state.json) is imported on its first poll.
+
+Polls are posting-aware: before querying data, a feed fetches its report's
+metadata (one small request to the report root) and skips the data query
+if lastPostDatetime has not changed since its last poll. A feed without a
+configured interval polls as often as the report is generated
+(generationFrequency), capped at an hour.
+
+Usage:
+    from ercot_query import ERCOTAPIClient
+    from ercot_incremental import IncrementalEngine, load_feeds
+
+    client = ERCOTAPIClient()
+    client.authenticate()
+    engine = IncrementalEngine(load_feeds(definitions), client)
+    engine.poll_due()
+"""
+
+import re
+import json
+import base64
+import hashlib
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from ercot_query import TIME_RANGE_PARAMETERS
+from ercot_archive import load_report_metadata
+from ercot_sinks import get_sink, ndjson_path, stream_to_ndjson, OUTPUT_FORMATS
+from ercot_state import open_state_store
+
+
+# Default locations: STATE_DIR holds the JSON state files of earlier
+# versions (imported into the state database); each feed gets an output folder
+STATE_DIR = Path("state")
+OUTPUT_ROOT = Path("output/incremental")
+
+# Default minutes between polls of a feed whose report frequency is unknown
+DEFAULT_INTERVAL_MINUTES = 15
+
+# Longest interval taken from a report's generationFrequency: daily reports
+# post at varying times, and an unchanged report costs only a metadata probe
+MAX_ADAPTIVE_INTERVAL_MINUTES = 60
+
+# Minutes per generationFrequency word ('Chron - Hourly', 'Chron - Daily', ...)
+FREQUENCY_MINUTES = {"minute": 1, "hour": 60, "daily": 1440, "day": 1440, "week": 10080, "month": 43200}
+
+# Feeds polled at the same time by the engine
+DEFAULT_MAX_CONCURRENT_FEEDS = 4
+
+# Column holding each row's time, by parameter type (the watermark follows it)
+TIMESTAMP_FIELDS = {"SCED": "SCEDTimestamp", "DAM": "deliveryDate", "ARCHIVE": "postDatetime"}
+
+# How far before the watermark each poll starts, to catch late-published
+# rows. Delivery dates are whole days, so DAM feeds re-read the watermark day.
+DEFAULT_OVERLAP_MINUTES = {"SCED": 30, "DAM": 0, "ARCHIVE": 30}
+
+# Bytes of each row digest in the seen-row index
+ROW_DIGEST_SIZE = 8
+
+# A feed counts as due this long before its interval is up, so a cron job
+# started a few seconds early does not skip a whole interval
+POLL_SLACK = timedelta(seconds=30)
+
+# Longest the engine sleeps between checks, so a stop request is noticed
+MAX_SLEEP_SECONDS = 60
+
+
+def interval_from_frequency(frequency):
+    """
+    Work out a polling interval from a report's generationFrequency.
+
+    Example:
+        'Chron - 15 Minutes' -> 15, 'Chron - Hourly' -> 60, 'Chron - Daily' -> 60 (capped)
+
+    Args:
+        frequency (str): generationFrequency from the report metadata
+
+    Returns:
+        int: Minutes between polls, or None for event-driven reports
+             ('Event - As Needed', 'Event - Per DAM Run') and unknown values
+    """
+    text = (frequency or '').lower()
+    if not text.startswith('chron'):
+        return None
+    for word, minutes in FREQUENCY_MINUTES.items():
+        if word in text:
+            count = re.search(r'(\d+)', text)
+            minutes *= int(count.group(1)) if count else 1
+            return max(1, min(minutes, MAX_ADAPTIVE_INTERVAL_MINUTES))
+    return None
+
+
+class SeenIndex:
+    """
+    Digests of the rows already received, grouped by row timestamp.
+
+    Each row is reduced to an 8-byte BLAKE2b digest of its values, and each
+    timestamp's digests are stored packed together in the state database's
+    seen_rows table (see StateStore.save_state). Only timestamps that gained
+    rows are written back after a poll, and timestamps older than the next
+    poll's start are pruned, as those rows can never be returned again.
+    """
+
+    def __init__(self, entries=None):
+        """
+        Args:
+            entries (dict): {timestamp: set of digests}
+        """
+        self.entries = entries or {}
+        # Timestamps that gained rows since loading, and the prune cutoff
+        self.changed = set()
+        self.before = None
+
+    @staticmethod
+    def _unpack(raw):
+        return {raw[i:i + ROW_DIGEST_SIZE] for i in range(0, len(raw), ROW_DIGEST_SIZE)}
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Rebuild an index from the state database ({timestamp: packed digests})."""
+        return cls({timestamp: cls._unpack(raw) for timestamp, raw in rows.items()})
+
+    @classmethod
+    def from_state(cls, encoded):
+        """
+        Rebuild an index from the 'seen' entry of an older state
+        ({timestamp: base64 digests}). Every timestamp counts as changed,
+        so the whole index is moved into the seen_rows table.
+        """
+        index = cls({timestamp: cls._unpack(base64.b64decode(packed))
+                     for timestamp, packed in (encoded or {}).items()})
+        index.changed = set(index.entries)
+        return index
+
+    def changed_rows(self):
+        """
+        Returns:
+            dict: {timestamp: packed digests} for the timestamps to write back
+        """
+        return {timestamp: b''.join(sorted(self.entries[timestamp]))
+                for timestamp in sorted(self.changed) if timestamp in self.entries}
+
+    def add(self, timestamp, values):
+        """
+        Record a row.
+
+        Args:
+            timestamp (str): The row's timestamp (may be None)
+            values (list): The row's values, or its key fields
+
+        Returns:
+            bool: True if the row is new, False if it was seen before
+        """
+        digest = hashlib.blake2b(json.dumps(values, separators=(',', ':'), default=str).encode('utf-8'),
+                                 digest_size=ROW_DIGEST_SIZE).digest()
+        digests = self.entries.setdefault(timestamp or '', set())
+        if digest in digests:
+            return False
+        digests.add(digest)
+        self.changed.add(timestamp or '')
+        return True
+
+    def prune(self, before):
+        """Forget rows with a timestamp earlier than before (an ISO string)."""
+        self.entries = {timestamp: digests for timestamp, digests in self.entries.items()
+                        if timestamp >= before}
+        self.before = before
+
+    def __len__(self):
+        return sum(len(digests) for digests in self.entries.values())
+
+
+class Feed:
+    """One endpoint polled incrementally, with its own watermark and output."""
+
+    def __init__(self, name, endpoint, parameter_type=None, interval_minutes=None,
+                 parameters=None, output_format='json', output_dir=None, state_file=None,
+                 file_prefix=None, lookahead_days=0, overlap_minutes=None, timestamp_field=None,
+                 key_fields=None, probe=True, state_store=None):
+        """
+        Args:
+            name (str): Feed name, used in file names and log lines
+            endpoint (str): The API endpoint path, e.g. 'np6-788-cd/lmp_node_zone_hub'
+            parameter_type (str): 'SCED', 'DAM' or 'ARCHIVE' (default: detected)
+            interval_minutes (int): Minutes between polls; also the first run's
+                                    window (default: from the report's
+                                    generationFrequency, kept up to date by
+                                    each probe)
+            parameters (dict): Extra fixed query parameters (e.g. settlementPoint)
+            output_format (str): 'json', 'ndjson' or 'parquet' (see ercot_sinks)
+            output_dir (str): Output folder (default: output/incremental/<name>)
+            state_file (str): JSON state file of earlier versions, imported into
+                              the state database on first use
+                              (default: state/incremental_<name>_state.json)
+            file_prefix (str): Start of output file names (default: name)
+            lookahead_days (int): Days past today the range extends to, for
+                                  reports posted ahead of time (e.g. 1 for DAM)
+            overlap_minutes (int): How far before the watermark each poll
+                                   starts (default: DEFAULT_OVERLAP_MINUTES)
+            timestamp_field (str): Column the watermark follows
+                                   (default: TIMESTAMP_FIELDS for the type)
+            key_fields (list): Columns identifying a row for de-duplication
+                               (default: all columns, so a corrected value
+                               counts as a new row)
+            probe (bool): Check the report's lastPostDatetime before each
+                          data query and skip the query if nothing new was posted
+            state_store (StateStore): Where the watermark and run history are
+                                      kept (default: the shared state database)
+
+        Raises:
+            ValueError: If the parameter type or output format is unknown
+        """
+        if parameter_type is None:
+            from discover_endpoints import detect_parameter_type
+            parameter_type = detect_parameter_type({"endpoint_id": endpoint.strip('/').split('/')[0]})
+        parameter_type = parameter_type.upper()
+        if parameter_type not in TIME_RANGE_PARAMETERS:
+            raise ValueError(f"Unknown parameter type '{parameter_type}' "
+                             f"(choose from: {', '.join(TIME_RANGE_PARAMETERS)})")
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format '{output_format}' (choose from: {', '.join(OUTPUT_FORMATS)})")
+
+        self.name = name
+        self.endpoint = endpoint
+        self.parameter_type = parameter_type
+        self.report_id = endpoint.strip('/').split('/')[0].lower()
+        self.probe = probe
+        self.adaptive_interval = interval_minutes is None
+        if interval_minutes is None:
+            # Until the first probe, go by the discovered metadata (if any)
+            metadata = load_report_metadata(self.report_id) or {}
+            interval_minutes = interval_from_frequency(metadata.get('generationFrequency')) or DEFAULT_INTERVAL_MINUTES
+        self.interval = timedelta(minutes=interval_minutes)
+        self.parameters = dict(parameters or {})
+        self.output_format = output_format
+        self.output_dir = Path(output_dir) if output_dir else OUTPUT_ROOT / name
+        self.state_file = Path(state_file) if state_file else STATE_DIR / f"incremental_{name}_state.json"
+        self.state_store = state_store or open_state_store()
+        self.file_prefix = file_prefix or name
+        self.lookahead = timedelta(days=lookahead_days)
+        if overlap_minutes is None:
+            overlap_minutes = DEFAULT_OVERLAP_MINUTES[parameter_type]
+        self.overlap = timedelta(minutes=overlap_minutes)
+        self.timestamp_field = timestamp_field or TIMESTAMP_FIELDS[parameter_type]
+        self.key_fields = list(key_fields) if key_fields else None
+
+    def log(self, message):
+        """Print a line tagged with the feed name (feeds poll concurrently)."""
+        print(f"[{self.name}] {message}")
+
+    def read_state(self):
+        """
+        Read the last successful poll state.
+
+        Returns:
+            dict: State containing last_timestamp and other metadata
+                  Returns None if the feed has no state yet (first run)
+        """
+        state = self.state_store.get_state(self.name)
+        if state is None and self.state_file.exists():
+            state = self.state_store.import_state_file(self.name, self.endpoint, self.state_file)
+        return state
+
+    def write_state(self, timestamp_to, records_retrieved, watermark=None, seen=None, last_post_datetime=None,
+                    run_id=None, timestamp_from=None):
+        """
+        Write the current state after a successful poll.
+
+        Args:
+            timestamp_to (str): End of the window just queried
+            records_retrieved (int): Number of new records retrieved in this poll
+            watermark (str): Latest row timestamp received so far
+            seen (SeenIndex): Rows received inside the overlap
+            last_post_datetime (str): The report's lastPostDatetime when polled
+            run_id (int): The poll's run, marked succeeded in the same transaction
+            timestamp_from (str): Start of the window just queried (for the run history)
+
+        Returns:
+            bool: True if the state was written, False otherwise
+        """
+        state = {
+            "last_timestamp": timestamp_to,
+            "last_poll_time": datetime.now().isoformat(),
+            "last_records_retrieved": records_retrieved,
+            "endpoint": self.endpoint
+        }
+        if watermark:
+            state["watermark"] = watermark
+        if last_post_datetime:
+            state["last_post_datetime"] = last_post_datetime
+        window = (timestamp_from, timestamp_to) if timestamp_from else None
+        return self._save_state(state, run_id, records_retrieved, window, seen if watermark else None)
+
+    def _save_state(self, state, run_id=None, records=None, window=None, seen=None):
+        """Save a state dict, its seen rows and the poll's run in one transaction."""
+        if self.adaptive_interval:
+            # Remembered so the next process (e.g. the next cron run) uses it too
+            state["interval_minutes"] = int(self.interval.total_seconds() // 60)
+        seen_rows = seen.changed_rows() if seen is not None else None
+        seen_from = seen.before if seen is not None else None
+        return self.state_store.save_state(self.name, self.endpoint, state,
+                                           run_id=run_id, records=records, window=window,
+                                           seen_rows=seen_rows, seen_from=seen_from)
+
+    def read_seen(self, last_state):
+        """
+        Load the rows already received inside the overlap.
+
+        Args:
+            last_state (dict): The feed's state (an older state may still
+                               carry the index in its 'seen' entry)
+
+        Returns:
+            SeenIndex: The index
+        """
+        rows = self.state_store.get_seen(self.name)
+        if not rows and (last_state or {}).get('seen'):
+            return SeenIndex.from_state(last_state['seen'])
+        return SeenIndex.from_rows(rows)
+
+    def reset_state(self):
+        """
+        Delete the feed's state (and any old state file), so the next poll
+        is treated as a first run. The run history is kept.
+
+        Returns:
+            bool: True if there was state to delete
+        """
+        deleted = self.state_store.delete_state(self.name)
+        if self.state_file.exists():
+            self.state_file.unlink()
+            deleted = True
+        return deleted
+
+    def next_poll_time(self, state=None):
+        """
+        When the feed is next due: its last poll plus the interval, or
+        datetime.min (always due) if it has never been polled.
+        """
+        state = state if state is not None else self.read_state()
+        if not state or not state.get('last_poll_time'):
+            return datetime.min
+        if self.adaptive_interval and state.get('interval_minutes'):
+            self.interval = timedelta(minutes=state['interval_minutes'])
+        return datetime.fromisoformat(state['last_poll_time']) + self.interval - POLL_SLACK
+
+    def calculate_time_range(self, last_state, debug=False):
+        """
+        Calculate the time range to query based on last state.
+
+        Args:
+            last_state (dict): Previous state, or None for first run
+            debug (bool): Enable debug output
+
+        Returns:
+            tuple: (timestamp_from, timestamp_to) formatted for the parameter type
+        """
+        now = datetime.now()
+
+        if last_state is None:
+            # First run - get the last interval
+            timestamp_from = (now - self.interval).replace(microsecond=0)
+            if debug:
+                self.log(f"[DEBUG] First run - querying last {self.interval}")
+        elif last_state.get('watermark'):
+            # Start a little before the latest row received, for late postings
+            timestamp_from = datetime.fromisoformat(last_state['watermark'][:19]) - self.overlap
+            if debug:
+                self.log(f"[DEBUG] Watermark {last_state['watermark']} - overlap {self.overlap}")
+                self.log(f"[DEBUG] Last poll retrieved {last_state.get('last_records_retrieved', 'unknown')} records")
+        else:
+            # State from before watermarks - start from 1 second after last timestamp
+            last_timestamp = datetime.fromisoformat(last_state['last_timestamp'])
+            timestamp_from = last_timestamp + timedelta(seconds=1)
+            if debug:
+                self.log(f"[DEBUG] Incremental run - last poll was at {last_state['last_timestamp']}")
+                self.log(f"[DEBUG] Last poll retrieved {last_state.get('last_records_retrieved', 'unknown')} records")
+
+        timestamp_to = now.replace(microsecond=0) + self.lookahead
+
+        _, _, time_format, _ = TIME_RANGE_PARAMETERS[self.parameter_type]
+        return timestamp_from.strftime(time_format), timestamp_to.strftime(time_format)
+
+    def probe_posting(self, client, debug=False):
+        """
+        Ask for the report's metadata to see when it was last posted.
+
+        Also adapts the polling interval to the report's generationFrequency
+        (unless the feed has a fixed interval).
+
+        Args:
+            client (ERCOTAPIClient): Authenticated client
+            debug (bool): Enable debug output
+
+        Returns:
+            str: The report's lastPostDatetime, or None if it is not known
+        """
+        metadata = client.get_report_metadata(self.report_id)
+        if not isinstance(metadata, dict):
+            self.log("⚠ Metadata probe failed; querying data anyway")
+            return None
+
+        if self.adaptive_interval:
+            minutes = interval_from_frequency(metadata.get('generationFrequency'))
+            if minutes and timedelta(minutes=minutes) != self.interval:
+                self.interval = timedelta(minutes=minutes)
+                self.log(f"Polling every {self.interval} ({metadata.get('generationFrequency')})")
+
+        posted = metadata.get('lastPostDatetime')
+        if debug:
+            self.log(f"[DEBUG] {self.report_id} lastPostDatetime: {posted}")
+        return posted
+
+    def poll(self, client, debug=False):
+        """
+        Poll the API for new data since the last successful poll.
+
+        With probe=True the report's metadata is checked first, and if
+        nothing has been posted since the last poll no data query is made.
+
+        The state is only updated once the data has been saved, so a
+        failed poll is retried from the same point next time. Every poll
+        is recorded in the state database's run history.
+
+        Args:
+            client (ERCOTAPIClient): Authenticated client
+            debug (bool): Enable debug output
+
+        Returns:
+            bool: True if successful (or already up to date), False otherwise
+        """
+        run_id = self.state_store.begin_run(self.name, self.endpoint)
+        try:
+            succeeded = self._poll(client, debug, run_id)
+        except Exception as e:
+            self.state_store.end_run(run_id, 'failed', message=f"{type(e).__name__}: {e}")
+            raise
+        # A no-op if the run was already closed along with the new state
+        self.state_store.end_run(run_id, 'succeeded' if succeeded else 'failed', records=0 if succeeded else None)
+        return succeeded
+
+    def _poll(self, client, debug, run_id):
+        """The body of poll(); run_id is closed when the new state is saved."""
+        last_state = self.read_state()
+
+        posted = self.probe_posting(client, debug) if self.probe else None
+        if posted and last_state and last_state.get('last_post_datetime') == posted:
+            self.log(f"✓ Nothing posted since {posted}; no data query needed")
+            self._save_state(dict(last_state, last_poll_time=datetime.now().isoformat(), last_records_retrieved=0),
+                             run_id, records=0)
+            return True
+
+        timestamp_from, timestamp_to = self.calculate_time_range(last_state, debug)
+
+        from_key, to_key, time_format, _ = TIME_RANGE_PARAMETERS[self.parameter_type]
+        from_dt = datetime.strptime(timestamp_from, time_format)
+        to_dt = datetime.strptime(timestamp_to, time_format)
+
+        # Delivery dates are whole days: the same day again is a valid re-poll
+        if from_dt > to_dt or (from_dt == to_dt and self.parameter_type != "DAM"):
+            self.log("⚠ No new time range to query (already up to date)")
+            return True
+
+        self.log(f"Querying {self.endpoint} from {timestamp_from} to {timestamp_to}")
+        parameters = dict(self.parameters, **{from_key: timestamp_from, to_key: timestamp_to})
+        if debug:
+            self.log(f"[DEBUG] Parameters: {parameters}")
+
+        # New rows are those not in the index; the watermark is the latest
+        # row timestamp seen, whether or not the row was new
+        seen = self.read_seen(last_state)
+        tracker = {"watermark": (last_state or {}).get('watermark'), "received": 0}
+
+        def keep(record, names=None):
+            if isinstance(record, dict):
+                names, values = list(record), list(record.values())
+            else:
+                values = record
+            row = dict(zip(names or [], values))
+            timestamp = row.get(self.timestamp_field)
+            tracker["received"] += 1
+            if timestamp and (tracker["watermark"] is None or str(timestamp) > tracker["watermark"]):
+                tracker["watermark"] = str(timestamp)
+            key = [row.get(field) for field in self.key_fields] if self.key_fields else values
+            return seen.add(timestamp and str(timestamp), key)
+
+        if self.output_format == 'ndjson':
+            # Stream every page onto the end of the day's file instead of
+            # creating a small file per poll
+            output_file = ndjson_path(self.output_dir / f"{self.file_prefix}_{to_dt:%Y-%m-%d}.json")
+            records_count = stream_to_ndjson(client, self.endpoint, parameters, output_file,
+                                             append=True, keep=keep)
+            if records_count is None:
+                self.log("✗ Query failed - state not updated")
+                return False
+            self.log(f"✓ {records_count} new of {tracker['received']} records received")
+            return self._finish(run_id, (timestamp_from, timestamp_to), records_count, tracker["watermark"], seen, posted)
+
+        # paginate=True fetches every page so busy windows are never truncated
+        response_data = client.query_api(self.endpoint, parameters, paginate=True)
+        if response_data is None:
+            self.log("✗ Query failed - state not updated")
+            return False
+
+        if isinstance(response_data, dict) and 'data' in response_data:
+            names = [field.get('name') for field in response_data.get('fields', [])]
+            # A copy: query_api results may be shared with other callers
+            response_data = dict(response_data, data=[row for row in response_data['data'] if keep(row, names)])
+        records_count = len(response_data.get('data', [])) if isinstance(response_data, dict) else 0
+        self.log(f"✓ {records_count} new of {tracker['received']} records received")
+
+        if records_count == 0:
+            # Nothing new: no file, but the poll still counts
+            return self._finish(run_id, (timestamp_from, timestamp_to), records_count, tracker["watermark"], seen, posted)
+
+        # Organize by date and hour
+        output_dir = self.output_dir / f"{to_dt:%Y-%m-%d}" / f"{to_dt:%H}"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file = output_dir / f"{self.file_prefix}_{from_dt:%Y%m%d_%H%M%S}_to_{to_dt:%Y%m%d_%H%M%S}.json"
+
+        if not get_sink(self.output_format, client).write(response_data, str(output_file), report=self.endpoint):
+            self.log("✗ Save failed - state not updated")
+            return False
+
+        return self._finish(run_id, (timestamp_from, timestamp_to), records_count, tracker["watermark"], seen, posted)
+
+    def _finish(self, run_id, window, records_count, watermark=None, seen=None, posted=None):
+        """Record a successful poll; the data is saved even if this fails."""
+        timestamp_from, timestamp_to = window
+        if watermark and seen is not None:
+            # Only rows inside the next poll's window can come back again
+            _, _, time_format, _ = TIME_RANGE_PARAMETERS[self.parameter_type]
+            seen.prune((datetime.fromisoformat(watermark[:19]) - self.overlap).strftime(time_format))
+
+        if self.write_state(timestamp_to, records_count, watermark, seen, posted, run_id, timestamp_from):
+            self.log("✓ State updated successfully")
+        else:
+            self.log("⚠ Warning: Data saved but state update failed")
+            self.state_store.end_run(run_id, 'failed', records_count, window, "data saved but state update failed")
+        return True
+
+
+def load_feeds(definitions, output_format=None):
+    """
+    Build Feed objects from a list of definitions.
+
+    Args:
+        definitions (list): Dicts of Feed arguments, e.g.
+                            {"name": "rtm_lmp", "endpoint": "np6-788-cd/lmp_node_zone_hub",
+                             "parameter_type": "SCED", "interval_minutes": 15}
+        output_format (str): Output format for feeds that do not set one
+
+    Returns:
+        list: Feed objects, or None if a definition is invalid
+    """
+    feeds = []
+    names = set()
+    for definition in definitions:
+        definition = dict(definition)
+        name = definition.get('name') or definition.get('endpoint', '').replace('/', '_')
+        definition['name'] = name
+        if output_format and 'output_format' not in definition:
+            definition['output_format'] = output_format
+
+        if name in names:
+            print(f"✗ Feed '{name}' is defined twice")
+            return None
+        if not definition.get('endpoint'):
+            print(f"✗ Feed '{name}' has no endpoint")
+            return None
+
+        try:
+            feeds.append(Feed(**definition))
+        except (TypeError, ValueError) as e:
+            print(f"✗ Feed '{name}': {e}")
+            return None
+        names.add(name)
+
+    return feeds
+
+
+class IncrementalEngine:
+    """
+    Polls many feeds concurrently on one shared client.
+
+    Each feed keeps its own watermark, so feeds are independent: one that
+    fails is retried on its next turn without holding back the others.
+    """
+
+    def __init__(self, feeds, client, max_concurrent=DEFAULT_MAX_CONCURRENT_FEEDS, debug=False):
+        """
+        Args:
+            feeds (list): Feed objects (see load_feeds)
+            client (ERCOTAPIClient): Authenticated, shared client
+            max_concurrent (int): Feeds polled at the same time
+            debug (bool): Enable debug output
+        """
+        self.feeds = feeds
+        self.client = client
+        self.max_concurrent = max_concurrent
+        self.debug = debug
+
+    def _poll_feed(self, feed):
+        """Poll one feed, reporting exceptions instead of raising them."""
+        try:
+            return feed.poll(self.client, self.debug)
+        except Exception as e:
+            feed.log(f"✗ Poll raised {type(e).__name__}: {e}")
+            if self.debug:
+                traceback.print_exc()
+            return False
+
+    def poll_due(self, force=False):
+        """
+        Poll every feed that is due, concurrently, and wait for them.
+
+        Args:
+            force (bool): Poll every feed, due or not
+
+        Returns:
+            dict: {feed name: True/False} for the feeds that were polled
+        """
+        now = datetime.now()
+        due = [feed for feed in self.feeds if force or feed.next_poll_time() <= now]
+        if not due:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            results = dict(zip((feed.name for feed in due), executor.map(self._poll_feed, due)))
+
+        failed = [name for name, success in results.items() if not success]
+        print(f"\n{'✓' if not failed else '✗'} Polled {len(results)} feed(s)"
+              + (f"; failed: {', '.join(failed)}" if failed else ""))
+        return results
+
+    def run(self, stop=None):
+        """
+        Keep polling each feed on its own interval until stop is set.
+
+        A feed still polling when it comes due again is left to finish
+        rather than started twice.
+
+        Args:
+            stop (threading.Event): Set to stop the loop (default: run forever)
+        """
+        stop = stop or threading.Event()
+        next_poll = {feed.name: feed.next_poll_time() for feed in self.feeds}
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrent) as executor:
+            while not stop.is_set():
+                now = datetime.now()
+                for feed in self.feeds:
+                    future = running.get(feed.name)
+                    if next_poll[feed.name] > now or (future is not None and not future.done()):
+                        continue
+                    running[feed.name] = executor.submit(self._poll_feed, feed)
+                    next_poll[feed.name] = now + feed.interval
+                    if self.debug:
+                        print(f"[DEBUG] Next poll of {feed.name}: {next_poll[feed.name]:%Y-%m-%d %H:%M:%S}")
+
+                wake_at = min(next_poll.values())
+                stop.wait(min(max((wake_at - datetime.now()).total_seconds(), 1), MAX_SLEEP_SECONDS))
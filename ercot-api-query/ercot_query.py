@@ -12,14 +12,112 @@ Date: January 2025
 import os
 import sys
 import json
+import re
+import math
+import codecs
+import hashlib
 import argparse
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Third-party imports (install via requirements.txt)
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
+from ercot_cache import (TokenCache, ResponseCache, DEFAULT_TOKEN_CACHE, DEFAULT_RESPONSE_CACHE,
+                         DEFAULT_RESPONSE_CACHE_MB)
+from ercot_ratelimit import (RateLimiter, retry_after_seconds, DEFAULT_RATE_LIMIT_PER_MINUTE,
+                             DEFAULT_RATE_BURST, DEFAULT_RATE_LIMIT_STATE)
+from ercot_retry import RetryPolicy, CircuitBreaker, DEFAULT_MAX_ATTEMPTS, DEFAULT_RETRY_DEADLINE
+from ercot_stream import iter_json_array_items
+
+# Optional: only needed for query_columnar (pip install numpy)
+try:
+    from ercot_columnar import ColumnarBuilder
+except ImportError:
+    ColumnarBuilder = None
+
+
+# ERCOT uses Azure B2C authentication
+# Authentication endpoint and client ID for the Public Reports API
+AUTH_URL = "https://ercotb2c.b2clogin.com/ercotb2c.onmicrosoft.com/B2C_1_PUBAPI-ROPC-FLOW/oauth2/v2.0/token"
+CLIENT_ID = "fec253ea-0d06-4272-a5e6-b478baeecd70"
+
+# How long before token_expiry the background refresher renews the token,
+# and how long it waits before retrying a failed renewal
+DEFAULT_REFRESH_LEAD_SECONDS = 120
+REFRESH_RETRY_SECONDS = 30
+
+# How often a throttled (429) request is retried, and how long to wait
+# when the response has no Retry-After header
+MAX_THROTTLE_RETRIES = 5
+DEFAULT_RETRY_AFTER_SECONDS = 10
+
+# Bytes read from the socket at a time when streaming a response body
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Date/time range parameters for each parameter type reported by
+# discover_endpoints.detect_parameter_type:
+# (from parameter, to parameter, format, default sub-window for query_time_range)
+TIME_RANGE_PARAMETERS = {
+    "SCED": ("SCEDTimestampFrom", "SCEDTimestampTo", '%Y-%m-%dT%H:%M:%S', timedelta(hours=1)),
+    "DAM": ("deliveryDateFrom", "deliveryDateTo", '%Y-%m-%d', timedelta(days=1)),
+    "ARCHIVE": ("postDatetimeFrom", "postDatetimeTo", '%Y-%m-%dT%H:%M:%S', timedelta(days=1)),
+}
+
+# Times query_time_range attempts a failed sub-window before giving up
+CHUNK_ATTEMPTS = 3
+
+# A query window counts as closed (its data final, so cached responses are
+# never revalidated) once its end is this far in the past. The margin covers
+# late postings and this machine's clock not being on ERCOT (Central) time.
+CLOSED_WINDOW_GRACE = timedelta(days=1)
+
+# Rows converted to typed arrays at a time by query_columnar
+COLUMNAR_BATCH_SIZE = 50000
+
+# How far into a raw response body to look for the _meta block
+META_SCAN_BYTES = 4096
+
+# (connect, read) timeouts in seconds for every HTTP request.
+# The read timeout is the longest silence allowed between bytes, not the total.
+DEFAULT_TIMEOUT = (10, 120)
+
+# Network errors worth retrying: the request may succeed on a new connection
+RETRYABLE_EXCEPTIONS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    requests.exceptions.ChunkedEncodingError,
+)
+
+# Default number of pooled keep-alive connections kept open per host.
+# Raise this (or set ERCOT_POOL_SIZE in .env) when fetching many pages at once.
+DEFAULT_POOL_SIZE = 10
+
+# Default number of pages fetched concurrently when a query is paginated.
+# Keep this at or below the pool size so every worker gets a warm connection.
+DEFAULT_MAX_WORKERS = 4
+
+
+# The client's token as one immutable value: a renewal replaces it with a
+# single assignment, so other threads never see a new access token with the
+# old expiry (or the other way round)
+_Token = namedtuple('_Token', ['access_token', 'token_expiry', 'refresh_token'])
+_NO_TOKEN = _Token(None, None, None)
+
+
+class ERCOTAPIError(Exception):
+    """Raised when the ERCOT API cannot return the data that was requested."""
+
+
+class CircuitOpenError(ERCOTAPIError):
+    """Raised instead of sending a request while an endpoint's circuit is open."""
+
 
 class ERCOTAPIClient:
     """
@@ -30,15 +128,44 @@ class ERCOTAPIClient:
     - Token refresh (tokens expire every 30 minutes)
     - API requests with flexible parameters
     - Error handling and response validation
+    - Pooled keep-alive HTTP connections (one session per host)
+    - Token caching across runs (see TokenCache)
+    - Optional background token refresh (see start_token_refresher)
+    - Client-side rate limiting and Retry-After handling (see RateLimiter)
+    - Retries with backoff and a per-endpoint circuit breaker (see RetryPolicy)
+    - Optional on-disk response cache with conditional requests (see ResponseCache)
+    - Coalescing of identical concurrent queries (see query_api)
     """
     
-    def __init__(self, debug=False):
+    def __init__(self, debug=False, pool_size=None, max_workers=None, token_cache=None,
+                 background_refresh=False, rate_limit=None, retry_policy=None, response_cache=None):
         """
         Initialize the ERCOT API client.
         Loads credentials from the .env file.
 
         Args:
             debug (bool): Enable debug output
+            pool_size (int): Keep-alive connections to keep open per host.
+                             Defaults to ERCOT_POOL_SIZE from .env, or 10.
+            max_workers (int): Pages fetched concurrently when paginating.
+                               Defaults to ERCOT_MAX_WORKERS from .env, or 4.
+            token_cache (str): Path of the on-disk token cache, or False to
+                               disable it. Defaults to ERCOT_TOKEN_CACHE from
+                               .env, or state/token_cache.json.
+            background_refresh (bool): Start the background token refresher
+                                       (see start_token_refresher)
+            rate_limit (float): Requests per minute, or 0 to disable limiting.
+                                Defaults to ERCOT_RATE_LIMIT from .env, or 30.
+                                The bucket is shared through ERCOT_RATE_LIMIT_STATE
+                                (default: state/rate_limit.json).
+            retry_policy (RetryPolicy): How failed requests are retried.
+                                        Defaults to ERCOT_MAX_ATTEMPTS and
+                                        ERCOT_RETRY_DEADLINE from .env.
+            response_cache (str): Directory of the response cache, True for
+                                  state/response_cache, or False to disable it.
+                                  Defaults to ERCOT_RESPONSE_CACHE from .env
+                                  (off unless set); the size limit comes from
+                                  ERCOT_RESPONSE_CACHE_MB (default: 512).
         """
         # Load environment variables from .env file
         # This reads your secrets without hardcoding them in the script
@@ -63,9 +190,81 @@ class ERCOTAPIClient:
         # Validate that all required credentials are present
         self._validate_credentials()
 
-        # Token will be stored here after authentication (only if using bearer auth)
-        self.access_token = None
-        self.token_expiry = None
+        # Token will be stored here after authentication (only if using bearer auth);
+        # read it through access_token, token_expiry and refresh_token
+        self._token = _NO_TOKEN
+
+        # Serialises logins between threads so that callers who find the
+        # token expired at the same moment share a single renewal
+        self._auth_lock = threading.Lock()
+
+        # Guards read-modify-write swaps of _token; never held during I/O
+        self._token_lock = threading.Lock()
+
+        # Background refresher state (see start_token_refresher)
+        self._refresher_thread = None
+        self._refresher_stop = threading.Event()
+        self.refresh_lead = timedelta(seconds=DEFAULT_REFRESH_LEAD_SECONDS)
+
+        # Tokens are shared between runs through an on-disk cache so that
+        # short-lived cron jobs reuse a token instead of logging in each time
+        if token_cache is None:
+            token_cache = os.getenv('ERCOT_TOKEN_CACHE', DEFAULT_TOKEN_CACHE)
+        if token_cache and str(token_cache).lower() not in ('off', 'false', 'none', '0'):
+            self.token_cache = TokenCache(token_cache)
+            self._token_cache_key = TokenCache.make_key(self.username, CLIENT_ID)
+        else:
+            self.token_cache = None
+            self._token_cache_key = None
+
+        # One pooled session per host: the B2C login host and the API host.
+        # Reusing sessions keeps TCP/TLS connections alive between requests,
+        # so only the first request to each host pays the handshake.
+        self.pool_size = int(pool_size or os.getenv('ERCOT_POOL_SIZE', DEFAULT_POOL_SIZE))
+        self.auth_session = self._create_session(self.pool_size)
+        self.api_session = self._create_session(self.pool_size)
+
+        # Token bucket shared with every other process using the same state
+        # file and subscription key, so overlapping jobs stay under the limit
+        if rate_limit is None:
+            rate_limit = float(os.getenv('ERCOT_RATE_LIMIT', DEFAULT_RATE_LIMIT_PER_MINUTE))
+        if rate_limit > 0:
+            rate_state = os.getenv('ERCOT_RATE_LIMIT_STATE', DEFAULT_RATE_LIMIT_STATE)
+            self.rate_limiter = RateLimiter(
+                rate_limit,
+                burst=int(os.getenv('ERCOT_RATE_BURST', DEFAULT_RATE_BURST)),
+                state_path=None if rate_state.lower() in ('off', 'none', '') else rate_state,
+                key=hashlib.sha256(self.subscription_key.encode('utf-8')).hexdigest()[:16]
+            )
+        else:
+            self.rate_limiter = None
+
+        # Retry layer and per-endpoint circuit breaker for every request
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_attempts=int(os.getenv('ERCOT_MAX_ATTEMPTS', DEFAULT_MAX_ATTEMPTS)),
+            deadline=float(os.getenv('ERCOT_RETRY_DEADLINE', DEFAULT_RETRY_DEADLINE))
+        )
+        self.circuit_breaker = CircuitBreaker()
+        self.timeout = DEFAULT_TIMEOUT
+
+        # Responses are only cached when asked for, since a cached reply
+        # can hide a correction ERCOT makes to a still-open window
+        if response_cache is None:
+            response_cache = os.getenv('ERCOT_RESPONSE_CACHE', '')
+        if response_cache is True:
+            response_cache = DEFAULT_RESPONSE_CACHE
+        if response_cache and str(response_cache).lower() not in ('off', 'false', 'none', '0'):
+            cache_mb = float(os.getenv('ERCOT_RESPONSE_CACHE_MB', DEFAULT_RESPONSE_CACHE_MB))
+            self.response_cache = ResponseCache(response_cache, max_bytes=int(cache_mb * 1024 * 1024))
+        else:
+            self.response_cache = None
+
+        # Upper bound on concurrent page requests for paginated queries
+        self.max_workers = int(max_workers or os.getenv('ERCOT_MAX_WORKERS', DEFAULT_MAX_WORKERS))
+
+        # Queries currently being fetched, by request key (see _coalesce)
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
 
         if self.debug:
             print("\n[DEBUG] ERCOTAPIClient initialized")
@@ -76,6 +275,53 @@ class ERCOTAPIClient:
             if self.password:
                 print(f"[DEBUG] Password length: {len(self.password)} characters")
             print(f"[DEBUG] Subscription key: {self.subscription_key[:8]}...{self.subscription_key[-4:]}")
+            print(f"[DEBUG] Connection pool size: {self.pool_size} per host")
+            print(f"[DEBUG] Max concurrent page requests: {self.max_workers}")
+            print(f"[DEBUG] Token cache: {self.token_cache.path if self.token_cache else 'disabled'}")
+            if self.rate_limiter:
+                print(f"[DEBUG] Rate limit: {rate_limit:g} requests/minute (burst {self.rate_limiter.capacity}, "
+                      f"shared via {self.rate_limiter.state_path or 'this process only'})")
+            else:
+                print("[DEBUG] Rate limit: disabled")
+            print(f"[DEBUG] Retries: {self.retry_policy.max_attempts} attempts within {self.retry_policy.deadline:.0f}s")
+            if self.response_cache:
+                print(f"[DEBUG] Response cache: {self.response_cache.directory} "
+                      f"(up to {self.response_cache.max_bytes // (1024 * 1024)} MB)")
+            else:
+                print("[DEBUG] Response cache: disabled")
+
+        if background_refresh:
+            self.start_token_refresher()
+
+    @staticmethod
+    def _create_session(pool_size):
+        """
+        Create a requests Session with a keep-alive connection pool.
+
+        Args:
+            pool_size (int): Maximum number of connections kept open
+
+        Returns:
+            requests.Session: Session with the pooled adapter mounted
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def close(self):
+        """Close the pooled sessions and release their open connections."""
+        self.stop_token_refresher()
+        self.auth_session.close()
+        self.api_session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
     
     def _validate_credentials(self):
         """
@@ -96,36 +342,276 @@ class ERCOTAPIClient:
                 print("ERROR: ERCOT_PASSWORD not found in .env file")
                 sys.exit(1)
     
-    def authenticate(self):
-        """
-        Authenticate with the ERCOT API and obtain an access token.
-
-        Uses Azure B2C ROPC (Resource Owner Password Credentials) flow.
-        The token is valid for 60 minutes (3600 seconds).
+    @property
+    def access_token(self):
+        """The current access token, or None."""
+        return self._token.access_token
 
-        Returns:
-            bool: True if authentication successful, False otherwise
-        """
-        print("Authenticating with ERCOT API...")
+    @property
+    def token_expiry(self):
+        """When the current access token should be renewed (datetime), or None."""
+        return self._token.token_expiry
 
-        # ERCOT uses Azure B2C authentication
-        # Authentication endpoint for Public Reports API
-        auth_url = "https://ercotb2c.b2clogin.com/ercotb2c.onmicrosoft.com/B2C_1_PUBAPI-ROPC-FLOW/oauth2/v2.0/token"
+    @property
+    def refresh_token(self):
+        """The refresh token from the last login, or None."""
+        return self._token.refresh_token
 
-        # ERCOT Public API client ID
-        client_id = "fec253ea-0d06-4272-a5e6-b478baeecd70"
+    def _auth_params(self):
+        """
+        Build the form parameters for the B2C password (ROPC) grant.
 
-        # Build the authentication URL with query parameters
-        # ERCOT's B2C endpoint expects parameters in the URL, not JSON body
-        auth_params = {
+        Returns:
+            dict: Form-encoded parameters for the token endpoint
+        """
+        # ERCOT's B2C endpoint expects form parameters, not a JSON body
+        return {
             "username": self.username,
             "password": self.password,
             "grant_type": "password",
-            "scope": f"openid {client_id} offline_access",
-            "client_id": client_id,
+            "scope": f"openid {CLIENT_ID} offline_access",
+            "client_id": CLIENT_ID,
+            "response_type": "id_token"
+        }
+
+    def _refresh_params(self, refresh_token=None):
+        """
+        Build the form parameters for the B2C refresh_token grant.
+
+        Args:
+            refresh_token (str): Refresh token to send (default: the current one)
+
+        Returns:
+            dict: Form-encoded parameters for the token endpoint
+        """
+        return {
+            "grant_type": "refresh_token",
+            "refresh_token": refresh_token or self.refresh_token,
+            "scope": f"openid {CLIENT_ID} offline_access",
+            "client_id": CLIENT_ID,
             "response_type": "id_token"
         }
 
+    def _make_token(self, token_data, refresh_token=None):
+        """
+        Build a token from a successful token response.
+
+        Args:
+            token_data (dict): Parsed JSON body from the token endpoint
+            refresh_token (str): Refresh token to keep if the response has none
+
+        Returns:
+            _Token: The new token
+        """
+        # Extract the access token (ERCOT returns 'access_token')
+        access_token = token_data.get('access_token')
+
+        if self.debug:
+            if access_token:
+                print(f"[DEBUG] Access token received: {access_token[:20]}...{access_token[-10:] if len(access_token) > 30 else ''}")
+            else:
+                print("[DEBUG] WARNING: No access_token field in response!")
+                print(f"[DEBUG] Response keys: {list(token_data.keys())}")
+
+        # ERCOT tokens expire after 60 minutes (3600 seconds)
+        # We subtract 5 minutes as a safety buffer to refresh before actual expiry.
+        # The refresh token (granted by the offline_access scope) lets the
+        # next renewal skip the password grant. B2C may rotate it, so the
+        # old one is only replaced when a new one is returned.
+        return _Token(access_token, datetime.now() + timedelta(minutes=55),
+                      token_data.get('refresh_token') or refresh_token)
+
+    def _store_token(self, token_data):
+        """
+        Keep the access token from a successful token response.
+
+        Args:
+            token_data (dict): Parsed JSON body from the token endpoint
+        """
+        with self._token_lock:
+            self._token = self._make_token(token_data, self._token.refresh_token)
+
+    def _swap_token(self, expected, token):
+        """
+        Replace the token, unless another thread replaced it first.
+
+        Args:
+            expected (_Token): The token the caller started from
+            token (_Token): Its replacement
+
+        Returns:
+            bool: True if swapped, False if the token had already changed
+        """
+        with self._token_lock:
+            if self._token is not expected:
+                return False
+            self._token = token
+            return True
+
+    def _drop_refresh_token(self, rejected):
+        """Forget a refresh token the token endpoint rejected (unless already replaced)."""
+        with self._token_lock:
+            if self._token.refresh_token == rejected:
+                self._token = self._token._replace(refresh_token=None)
+
+    def _load_cached_token(self, min_remaining=None):
+        """
+        Adopt a still-valid token from the on-disk cache, if there is one.
+
+        Args:
+            min_remaining (timedelta): Ignore cached tokens that expire
+                                       sooner than this (default: any valid token)
+
+        Returns:
+            bool: True if a cached token was loaded
+        """
+        if self.token_cache is None:
+            return False
+
+        entry = self.token_cache.load(self._token_cache_key)
+        if not entry:
+            return False
+
+        token_expiry = None
+        if entry.get('access_token'):
+            try:
+                token_expiry = datetime.fromisoformat(entry['token_expiry'])
+            except (KeyError, TypeError, ValueError):
+                token_expiry = None
+
+        with self._token_lock:
+            # A refresh token stays useful after the access token has expired
+            refresh_token = entry.get('refresh_token') or self._token.refresh_token
+            if token_expiry is None or datetime.now() + (min_remaining or timedelta(0)) >= token_expiry:
+                self._token = self._token._replace(refresh_token=refresh_token)
+                return False
+            self._token = _Token(entry['access_token'], token_expiry, refresh_token)
+            return True
+
+    def _save_cached_token(self):
+        """Write the current token to the on-disk cache (if enabled)."""
+        token = self._token
+        if self.token_cache is None or not token.access_token:
+            return
+
+        try:
+            self.token_cache.store(self._token_cache_key, {
+                "access_token": token.access_token,
+                "token_expiry": token.token_expiry.isoformat(),
+                "refresh_token": token.refresh_token
+            })
+        except OSError as e:
+            # A cache that cannot be written only costs a login next run
+            print(f"⚠ Warning: Could not write token cache: {e}")
+
+    def _invalidate_token(self):
+        """Forget the current access token, including its cached copy."""
+        with self._token_lock:
+            # Keep the refresh token so renewal can still skip the password grant
+            self._token = _Token(None, None, self._token.refresh_token)
+            refresh_token = self._token.refresh_token
+        if self.token_cache is not None:
+            try:
+                with self.token_cache.lock():
+                    self.token_cache.store(self._token_cache_key, {"refresh_token": refresh_token} if refresh_token else None)
+            except OSError:
+                pass
+
+    def _fetch_token(self):
+        """
+        Obtain a new token, as cheaply as possible, without installing it.
+
+        Uses the refresh_token grant when a refresh token is held and falls
+        back to the full password grant if there is none or it is rejected.
+
+        Returns:
+            _Token: The new token, or None if both grants failed
+        """
+        refresh_token = self.refresh_token
+        if refresh_token:
+            token = self._request_token(grant_type='refresh_token', refresh_token=refresh_token)
+            if token is not None:
+                return token
+            print("Refresh token rejected. Falling back to password login...")
+            self._drop_refresh_token(refresh_token)
+
+        return self._request_token(grant_type='password')
+
+    def _renew_token(self):
+        """
+        Obtain a new access token and start using it.
+
+        Returns:
+            bool: True if a new token was obtained
+        """
+        token = self._fetch_token()
+        if token is None:
+            return False
+        with self._token_lock:
+            self._token = token
+        return True
+
+    def authenticate(self, use_cache=True):
+        """
+        Make sure the client holds a valid access token.
+
+        A token cached on disk by an earlier run (or another process) is
+        reused until its expiry. Otherwise a new token is requested and
+        cached. The cache lock is held across the login so that processes
+        starting at the same moment log in only once.
+
+        Args:
+            use_cache (bool): Set to False to force a new login
+
+        Returns:
+            bool: True if authentication successful, False otherwise
+        """
+        if not use_cache or self.token_cache is None:
+            return self._renew_token()
+
+        try:
+            with self.token_cache.lock():
+                if self._load_cached_token():
+                    print(f"✓ Using cached token. Token valid until {self.token_expiry.strftime('%Y-%m-%d %H:%M:%S')}")
+                    return True
+
+                if not self._renew_token():
+                    return False
+
+                self._save_cached_token()
+                return True
+
+        except OSError as e:
+            # Fall back to a plain login if the cache directory is unusable
+            print(f"⚠ Warning: Token cache unavailable ({e}), logging in directly")
+            return self._renew_token()
+
+    def _request_token(self, grant_type='password', refresh_token=None):
+        """
+        Authenticate with the ERCOT API and obtain an access token.
+
+        Uses Azure B2C ROPC (Resource Owner Password Credentials) flow,
+        or the refresh_token grant when grant_type='refresh_token'.
+        The token is valid for 60 minutes (3600 seconds). It is returned,
+        not installed, so the network call needs no lock.
+
+        Args:
+            grant_type (str): 'password' or 'refresh_token'
+            refresh_token (str): Refresh token for the refresh_token grant
+                                 (default: the current one)
+
+        Returns:
+            _Token: The new token, or None if authentication failed
+        """
+        if grant_type == 'refresh_token':
+            print("Refreshing ERCOT API access token...")
+            auth_params = self._refresh_params(refresh_token)
+        else:
+            print("Authenticating with ERCOT API...")
+            auth_params = self._auth_params()
+
+        auth_url = AUTH_URL
+
         # Headers for authentication request
         headers = {
             "Content-Type": "application/x-www-form-urlencoded"
@@ -140,7 +626,7 @@ class ERCOTAPIClient:
                 print(f"[DEBUG]   {key}: {value}")
             print("[DEBUG] Parameters:")
             for key, value in auth_params.items():
-                if key == "password":
+                if key in ("password", "refresh_token"):
                     print(f"[DEBUG]   {key}: {'*' * len(value)}")
                 else:
                     print(f"[DEBUG]   {key}: {value}")
@@ -148,7 +634,10 @@ class ERCOTAPIClient:
 
         try:
             # Send POST request with form-encoded parameters
-            response = requests.post(auth_url, data=auth_params, headers=headers)
+            # (retried on connection errors, timeouts and 5xx responses)
+            response = self._send_with_retry('auth', lambda: self.auth_session.post(
+                auth_url, data=auth_params, headers=headers, timeout=self.timeout
+            ))
 
             if self.debug:
                 print("\n[DEBUG] ========== Authentication Response ==========")
@@ -168,30 +657,20 @@ class ERCOTAPIClient:
 
             # Check if request was successful (HTTP 200)
             if response.status_code == 200:
-                # Parse the JSON response
-                token_data = response.json()
+                # Parse the JSON response into a token
+                token = self._make_token(response.json(), refresh_token or self.refresh_token)
 
-                # Extract the access token (ERCOT returns 'access_token')
-                self.access_token = token_data.get('access_token')
-
-                if self.debug:
-                    if self.access_token:
-                        print(f"[DEBUG] Access token received: {self.access_token[:20]}...{self.access_token[-10:] if len(self.access_token) > 30 else ''}")
-                    else:
-                        print("[DEBUG] WARNING: No access_token field in response!")
-                        print(f"[DEBUG] Response keys: {list(token_data.keys())}")
-
-                # ERCOT tokens expire after 60 minutes (3600 seconds)
-                # We subtract 5 minutes as a safety buffer to refresh before actual expiry
-                self.token_expiry = datetime.now() + timedelta(minutes=55)
-
-                print(f"✓ Authentication successful. Token valid until {self.token_expiry.strftime('%Y-%m-%d %H:%M:%S')}")
-                return True
+                print(f"✓ Authentication successful. Token valid until {token.token_expiry.strftime('%Y-%m-%d %H:%M:%S')}")
+                return token
             else:
                 # Authentication failed
                 print(f"✗ Authentication failed with status code: {response.status_code}")
                 print(f"Response: {response.text}")
-                return False
+                return None
+
+        except CircuitOpenError as e:
+            print(f"✗ Authentication not attempted: {e}")
+            return None
 
         except requests.exceptions.RequestException as e:
             # Network error or other request issue
@@ -200,7 +679,7 @@ class ERCOTAPIClient:
                 import traceback
                 print("\n[DEBUG] Full exception traceback:")
                 traceback.print_exc()
-            return False
+            return None
     
     def _is_token_valid(self):
         """
@@ -209,12 +688,13 @@ class ERCOTAPIClient:
         Returns:
             bool: True if token exists and hasn't expired, False otherwise
         """
-        if not self.access_token:
+        token = self._token
+        if not token.access_token:
             return False
-        if not self.token_expiry:
+        if not token.token_expiry:
             return False
         # Check if current time is before expiry time
-        return datetime.now() < self.token_expiry
+        return datetime.now() < token.token_expiry
     
     def _ensure_authenticated(self):
         """
@@ -230,22 +710,220 @@ class ERCOTAPIClient:
             return
 
         # For bearer token auth, check and refresh if needed
-        if not self._is_token_valid():
-            print("Token expired or not available. Refreshing...")
-            if not self.authenticate():
-                raise Exception("Failed to authenticate with ERCOT API")
+        if self._is_token_valid():
+            return
+
+        # Single-flight: the first thread renews, the others wait for it and
+        # then find a valid token instead of logging in themselves
+        with self._auth_lock:
+            if not self._is_token_valid():
+                print("Token expired or not available. Refreshing...")
+                if not self.authenticate():
+                    raise Exception("Failed to authenticate with ERCOT API")
+
+    def _refresh_before_expiry(self):
+        """
+        Renew the token now, even though it is still valid.
+
+        The login runs without holding _auth_lock, so threads that find
+        the token expired meanwhile are not stuck behind it. Afterwards
+        the new token is swapped in only if no other thread replaced the
+        token first (check-and-set); requests in flight keep using the old
+        one, which is still valid. If another process already renewed
+        (visible in the token cache) that token is adopted instead, and
+        the cache lock keeps processes from renewing twice.
+
+        Returns:
+            bool: True if the client now holds a fresh token
+        """
+        if self.token_cache is None:
+            current = self._token
+            token = self._fetch_token()
+            if token is not None:
+                self._swap_token(current, token)
+            return token is not None
+
+        with self.token_cache.lock():
+            if self._load_cached_token(min_remaining=self.refresh_lead):
+                return True
+            current = self._token
+            token = self._fetch_token()
+            if token is None:
+                return False
+            if self._swap_token(current, token):
+                self._save_cached_token()
+            return True
+
+    def _token_refresher_loop(self):
+        """Sleep until shortly before token_expiry, renew, repeat."""
+        while not self._refresher_stop.is_set():
+            if self.token_expiry is not None:
+                wait_seconds = (self.token_expiry - self.refresh_lead - datetime.now()).total_seconds()
+                if wait_seconds > 0:
+                    # Re-check afterwards: the token may have been renewed meanwhile
+                    self._refresher_stop.wait(wait_seconds)
+                    continue
+
+            if not self._refresh_before_expiry():
+                print(f"⚠ Background token refresh failed. Retrying in {REFRESH_RETRY_SECONDS} seconds")
+                self._refresher_stop.wait(REFRESH_RETRY_SECONDS)
+
+    def start_token_refresher(self, lead_seconds=None):
+        """
+        Renew the token in a background thread shortly before it expires.
+
+        Without this, the first request after token_expiry waits for the
+        login inline. With it, requests only ever see a valid token. Meant
+        for long-running processes (backfills, the collector daemon);
+        short cron jobs do not need it.
+
+        Args:
+            lead_seconds (int): Renew this many seconds before token_expiry
+                                (default: 120)
+        """
+        if lead_seconds is not None:
+            self.refresh_lead = timedelta(seconds=lead_seconds)
+
+        if self._refresher_thread is not None and self._refresher_thread.is_alive():
+            return
+
+        self._refresher_stop.clear()
+        self._refresher_thread = threading.Thread(
+            target=self._token_refresher_loop,
+            name="ercot-token-refresher",
+            daemon=True
+        )
+        self._refresher_thread.start()
+
+        if self.debug:
+            print(f"[DEBUG] Background token refresher started ({self.refresh_lead.total_seconds():.0f}s lead)")
+
+    def stop_token_refresher(self):
+        """Stop the background token refresher, if it is running."""
+        self._refresher_stop.set()
+        if self._refresher_thread is not None:
+            self._refresher_thread.join(timeout=5)
+            self._refresher_thread = None
     
-    def query_api(self, endpoint, parameters=None):
+    def _api_headers(self):
         """
-        Query the ERCOT API with the specified endpoint and parameters.
+        Build the headers sent with every API request.
+
+        Returns:
+            dict: Subscription key, content type and (if used) the bearer token
+        """
+        headers = {
+            "Ocp-Apim-Subscription-Key": self.subscription_key,
+            "Content-Type": "application/json"
+        }
+
+        # Add Bearer token only if using bearer authentication
+        access_token = self.access_token
+        if self.use_bearer_auth and access_token:
+            headers["Authorization"] = f"Bearer {access_token}"
+
+        return headers
+
+    def _send_with_retry(self, circuit_key, send, rate_limited=False):
+        """
+        Call send() until it succeeds, retrying transient failures.
+
+        - 429 responses wait for Retry-After (also pausing the shared rate
+          limiter, so other processes hold back too)
+        - A 503 with Retry-After pauses the shared rate limiter the same way
+        - Connection errors, timeouts and 5xx responses back off with
+          decorrelated jitter, up to retry_policy.max_attempts
+        - No retry is started past retry_policy.deadline
+        - Every failed attempt counts towards circuit_key's circuit breaker;
+          once it opens, remaining retries are abandoned
 
         Args:
-            endpoint (str): The API endpoint path (e.g., '/api/v1/actual_system_load')
+            circuit_key (str): Circuit breaker key (the endpoint, or 'auth')
+            send (callable): Sends one request and returns a requests.Response
+            rate_limited (bool): send() waits on self.rate_limiter before each
+                                 attempt, so a paused limiter is the wait;
+                                 otherwise (e.g. logins) this sleeps itself
+
+        Returns:
+            requests.Response: The last response (may still be an error status)
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            requests.exceptions.RequestException: If the last attempt raised
+        """
+        policy = self.retry_policy
+        deadline = time.monotonic() + policy.deadline
+        delay = policy.base_delay
+        attempts = 0
+        throttles = 0
+
+        while True:
+            if not self.circuit_breaker.allow(circuit_key):
+                raise CircuitOpenError(f"{circuit_key} is failing; circuit open")
+
+            error = None
+            response = None
+            try:
+                response = send()
+            except RETRYABLE_EXCEPTIONS as e:
+                error = e
+
+            if response is not None and response.status_code == 429:
+                # Throttled: not a failure of the endpoint, just wait our turn
+                throttles += 1
+                wait_seconds = retry_after_seconds(response.headers.get('Retry-After'), DEFAULT_RETRY_AFTER_SECONDS)
+                if throttles > MAX_THROTTLE_RETRIES or time.monotonic() + wait_seconds > deadline:
+                    return response
+                print(f"⚠ Throttled by API (HTTP 429). Retrying in {wait_seconds:.0f} seconds...")
+                response.close()
+                if self.rate_limiter is not None:
+                    # Every process sharing the bucket pauses too
+                    self.rate_limiter.block_for(wait_seconds)
+                if not (rate_limited and self.rate_limiter is not None):
+                    time.sleep(wait_seconds)
+                continue
+
+            if response is not None and response.status_code < 500:
+                self.circuit_breaker.record_success(circuit_key)
+                return response
+
+            # Connection error, timeout or 5xx: back off and try again
+            attempts += 1
+            circuit_open = self.circuit_breaker.record_failure(circuit_key)
+
+            if response is not None and response.headers.get('Retry-After'):
+                wait_seconds = retry_after_seconds(response.headers.get('Retry-After'), delay)
+                if response.status_code == 503 and self.rate_limiter is not None:
+                    # Service unavailable: every process sharing the bucket pauses too
+                    self.rate_limiter.block_for(wait_seconds)
+            else:
+                wait_seconds = delay = policy.next_delay(delay)
+
+            if circuit_open or attempts >= policy.max_attempts or time.monotonic() + wait_seconds > deadline:
+                if error is not None:
+                    raise error
+                return response
+
+            reason = f"HTTP {response.status_code}" if response is not None else type(error).__name__
+            print(f"⚠ {circuit_key}: attempt {attempts} failed ({reason}). Retrying in {wait_seconds:.1f} seconds...")
+            if response is not None:
+                response.close()
+            time.sleep(wait_seconds)
+
+    def _api_get(self, endpoint, parameters=None, stream=False, extra_headers=None):
+        """
+        Send one authenticated GET request to an API endpoint.
+
+        Network errors are not caught here; callers decide how to report them.
+
+        Args:
+            endpoint (str): The API endpoint path
             parameters (dict): Query parameters to send with the request
-                             (e.g., {'deliveryDateFrom': '2025-01-01', 'deliveryDateTo': '2025-01-27'})
+            stream (bool): Leave the response body unread so it can be streamed
+            extra_headers (dict): Headers added to the defaults (e.g. If-None-Match)
 
         Returns:
-            dict: JSON response from the API, or None if request failed
+            requests.Response: The raw HTTP response
         """
         # Ensure we have a valid token before making the request
         self._ensure_authenticated()
@@ -254,19 +932,9 @@ class ERCOTAPIClient:
         url = f"{self.base_url}{endpoint}"
 
         # Prepare headers for the API request
-        headers = {
-            "Ocp-Apim-Subscription-Key": self.subscription_key,
-            "Content-Type": "application/json"
-        }
-
-        # Add Bearer token only if using bearer authentication
-        if self.use_bearer_auth and self.access_token:
-            headers["Authorization"] = f"Bearer {self.access_token}"
-
-        # Log the request details
-        print(f"\nQuerying endpoint: {endpoint}")
-        if parameters:
-            print(f"Parameters: {json.dumps(parameters, indent=2)}")
+        headers = self._api_headers()
+        if extra_headers:
+            headers.update(extra_headers)
 
         if self.debug:
             print("\n[DEBUG] ========== API Query Request ==========")
@@ -275,7 +943,8 @@ class ERCOTAPIClient:
             print("[DEBUG] Headers:")
             for key, value in headers.items():
                 if key == "Authorization":
-                    token_preview = self.access_token[:20] + "..." if len(self.access_token) > 20 else self.access_token
+                    token = value[len("Bearer "):]
+                    token_preview = token[:20] + "..." if len(token) > 20 else token
                     print(f"[DEBUG]   {key}: Bearer {token_preview}")
                 elif key == "Ocp-Apim-Subscription-Key":
                     print(f"[DEBUG]   {key}: {value[:8]}...{value[-4:]}")
@@ -285,42 +954,928 @@ class ERCOTAPIClient:
                 print(f"[DEBUG] Query Parameters: {json.dumps(parameters, indent=2)}")
             print("[DEBUG] ==========================================\n")
 
-        try:
+        def send():
+            # Wait for the shared rate-limit budget before every attempt
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
             # Send GET request to the API
             # params will be URL-encoded automatically by requests library
-            response = requests.get(url, headers=headers, params=parameters)
+            # The pooled session reuses an open connection when one is available
+            return self.api_session.get(url, headers=headers, params=parameters, stream=stream, timeout=self.timeout)
 
-            if self.debug:
-                print("\n[DEBUG] ========== API Query Response ==========")
-                print(f"[DEBUG] Status Code: {response.status_code}")
-                print(f"[DEBUG] Status Reason: {response.reason}")
-                print("[DEBUG] Response Headers:")
-                for key, value in response.headers.items():
-                    print(f"[DEBUG]   {key}: {value}")
+        response = self._send_with_retry(endpoint, send, rate_limited=True)
+
+        if self.debug:
+            print("\n[DEBUG] ========== API Query Response ==========")
+            print(f"[DEBUG] Status Code: {response.status_code}")
+            print(f"[DEBUG] Status Reason: {response.reason}")
+            print("[DEBUG] Response Headers:")
+            for key, value in response.headers.items():
+                print(f"[DEBUG]   {key}: {value}")
+            if not stream:
                 print(f"[DEBUG] Response Body (first 500 chars):")
                 print(f"[DEBUG]   {response.text[:500]}")
-                print("[DEBUG] ==========================================\n")
+            print("[DEBUG] ==========================================\n")
 
-            # Check if request was successful
-            if response.status_code == 200:
-                print(f"✓ Request successful (HTTP {response.status_code})")
-                # Parse and return the JSON response
-                return response.json()
-            else:
-                # Request failed
-                print(f"✗ Request failed with status code: {response.status_code}")
-                print(f"Response: {response.text}")
-                return None
+        return response
+
+    def _is_closed_window(self, endpoint, parameters):
+        """
+        Check whether a query only covers a time window that has ended.
+
+        ERCOT does not change data for closed historical intervals, so
+        cached responses for them never need revalidating.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters
+
+        Returns:
+            bool: True if the whole window ended more than CLOSED_WINDOW_GRACE ago
+        """
+        try:
+            time_range = self._time_range(endpoint, parameters)
+        except ValueError:
+            return False
+        if time_range is None:
+            return False
+
+        parameter_type, _, _, _, end = time_range
+        time_format = TIME_RANGE_PARAMETERS[parameter_type][2]
+        # A delivery date runs until midnight at the end of that day
+        window_end = end + (timedelta(days=1) if time_format == '%Y-%m-%d' else timedelta(seconds=1))
+        return window_end + CLOSED_WINDOW_GRACE < datetime.now()
+
+    def _send_query(self, endpoint, parameters=None):
+        """
+        Run a single GET request and parse the JSON response.
+
+        Failures are printed; success is silent so that callers fetching
+        many pages can report progress in their own format.
+
+        With a response cache, responses for closed windows are served from
+        disk without a request; other cached responses are revalidated with
+        If-None-Match / If-Modified-Since and reused on 304 Not Modified.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+
+        Returns:
+            dict: JSON response from the API, or None if request failed
+        """
+        cache_key = None
+        cached = None
+        conditional_headers = {}
+        if self.response_cache is not None:
+            cache_key = ResponseCache.make_key(endpoint, parameters)
+            cached = self.response_cache.load(cache_key)
+            if cached is not None:
+                entry, body = cached
+                if entry.get('immutable'):
+                    if self.debug:
+                        print(f"[DEBUG] Response cache hit (closed window): {endpoint}")
+                    return json.loads(body)
+                if entry.get('etag'):
+                    conditional_headers['If-None-Match'] = entry['etag']
+                if entry.get('last_modified'):
+                    conditional_headers['If-Modified-Since'] = entry['last_modified']
+
+        try:
+            response = self._api_get(endpoint, parameters, extra_headers=conditional_headers)
+
+            # A 401 means the token was revoked before its expiry (e.g. a
+            # stale cached token), so drop it and try once with a fresh login
+            if response.status_code == 401 and self.use_bearer_auth:
+                print("⚠ Token rejected by API (HTTP 401). Re-authenticating...")
+                self._invalidate_token()
+                response = self._api_get(endpoint, parameters, extra_headers=conditional_headers)
+
+            if response.status_code == 304 and cached is not None:
+                # Not modified: the cached copy is still current
+                if self.debug:
+                    print(f"[DEBUG] Response cache revalidated (HTTP 304): {endpoint}")
+                self.response_cache.touch(cache_key)
+                return json.loads(cached[1])
+
+            # Check if request was successful
+            if response.status_code == 200:
+                if cache_key is not None:
+                    self._cache_response(cache_key, endpoint, parameters, response.headers, response.content)
+                # Parse and return the JSON response
+                return response.json()
+            else:
+                # Request failed
+                print(f"✗ Request failed with status code: {response.status_code}")
+                print(f"Response: {response.text}")
+                return None
+
+        except CircuitOpenError as e:
+            print(f"✗ Request not sent: {e}")
+            return None
+
+        except requests.exceptions.RequestException as e:
+            # Network error or other request issue
+            print(f"✗ Error during API request: {e}")
+            if self.debug:
+                import traceback
+                print("\n[DEBUG] Full exception traceback:")
+                traceback.print_exc()
+            return None
+
+    def _cache_response(self, cache_key, endpoint, parameters, headers, body):
+        """
+        Store a successful response in the response cache.
+
+        Only responses that can be reused are kept: closed windows, or
+        responses carrying an ETag or Last-Modified to revalidate against.
+        A cache that cannot be written is reported, never fatal.
+
+        Args:
+            cache_key (str): Key from ResponseCache.make_key()
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters of the request
+            headers (dict): Response headers
+            body (bytes): Raw response body
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        immutable = self._is_closed_window(endpoint, parameters)
+        if not (immutable or etag or last_modified):
+            return
+
+        try:
+            self.response_cache.store(cache_key, body, etag=etag,
+                                      last_modified=last_modified, immutable=immutable)
+        except OSError as e:
+            print(f"⚠ Could not write response cache: {e}")
+
+    @staticmethod
+    def _request_key(endpoint, parameters, paginate, page_size):
+        """
+        Identify a query for coalescing: same endpoint, normalised
+        parameters, pagination and page size means the same result.
+
+        Returns:
+            str: Hex digest identifying the query
+        """
+        return ResponseCache.make_key(endpoint, dict(parameters or {}, _paginate=bool(paginate), _size=page_size))
+
+    def _coalesce(self, key, fetch):
+        """
+        Run fetch() unless an identical call is already running, in which
+        case wait for that call and return its result instead.
+
+        Args:
+            key (str): Request key from _request_key()
+            fetch (callable): Performs the query and returns its result
+
+        Returns:
+            The result of fetch(), shared by every caller that joined it
+        """
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            if self.debug:
+                print(f"[DEBUG] Joining identical query already in flight ({key[:12]})")
+            return future.result()
+
+        try:
+            result = fetch()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def get_report_metadata(self, report_id):
+        """
+        Fetch a report's metadata from the report root (e.g. 'np6-788-cd').
+
+        This is one small request, much cheaper than a data query, and says
+        when the report was last posted (lastPostDatetime) and how often it
+        is generated (generationFrequency). With a response cache the
+        request is conditional, so an unchanged report costs a 304.
+
+        Args:
+            report_id (str): Report ID or any endpoint path of the report
+
+        Returns:
+            dict: The report metadata, or None if the request failed
+        """
+        return self._send_query(report_id.strip('/').split('/')[0].lower())
+
+    def query_api(self, endpoint, parameters=None, paginate=False, page_size=None, max_workers=None):
+        """
+        Query the ERCOT API with the specified endpoint and parameters.
+
+        By default only the page ERCOT sends back first is returned. With
+        paginate=True every page listed in the response's _meta block is
+        fetched and merged (see query_all_pages).
+
+        When several threads make the same call at the same time (same
+        endpoint, parameters, paginate and page_size), only the first one
+        sends requests; the others wait for it and receive the same decoded
+        response object, so treat the result as read-only.
+
+        Args:
+            endpoint (str): The API endpoint path (e.g., '/api/v1/actual_system_load')
+            parameters (dict): Query parameters to send with the request
+                             (e.g., {'deliveryDateFrom': '2025-01-01', 'deliveryDateTo': '2025-01-27'})
+            paginate (bool): Fetch and merge all pages of the result
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            max_workers (int): Pages fetched concurrently when paginating
+
+        Returns:
+            dict: JSON response from the API, or None if request failed
+        """
+        key = self._request_key(endpoint, parameters, paginate, page_size)
+        return self._coalesce(key, lambda: self._query_api(endpoint, parameters, paginate, page_size, max_workers))
+
+    def _query_api(self, endpoint, parameters, paginate, page_size, max_workers):
+        """Run one query_api call (without coalescing)."""
+        if paginate:
+            return self.query_all_pages(endpoint, parameters, page_size=page_size, max_workers=max_workers)
+
+        # Log the request details
+        print(f"\nQuerying endpoint: {endpoint}")
+        if parameters:
+            print(f"Parameters: {json.dumps(parameters, indent=2)}")
+
+        if page_size:
+            parameters = dict(parameters or {}, size=page_size)
+
+        response_data = self._send_query(endpoint, parameters)
+        if response_data is not None:
+            print(f"✓ Request successful (HTTP 200)")
+        return response_data
+
+    @staticmethod
+    def _total_pages(page_data):
+        """
+        Read the number of pages from a response's _meta block.
+
+        Args:
+            page_data (dict): A page returned by the API
+
+        Returns:
+            int: Total pages for the query (1 if _meta is missing)
+        """
+        meta = page_data.get('_meta', {}) if isinstance(page_data, dict) else {}
+        if meta.get('totalPages'):
+            return int(meta['totalPages'])
+        if meta.get('totalRecords') and meta.get('pageSize'):
+            return math.ceil(int(meta['totalRecords']) / int(meta['pageSize']))
+        return 1
+
+    def iter_pages(self, endpoint, parameters=None, page_size=None, max_workers=None):
+        """
+        Yield every page of a query, in page order.
+
+        The first page is fetched on its own to learn the page count from
+        _meta. The remaining pages are fetched concurrently, with at most
+        max_workers pages in flight, so memory stays bounded even for
+        results with hundreds of pages.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            max_workers (int): Pages fetched concurrently (default: self.max_workers)
+
+        Yields:
+            dict: One API response per page, starting with page 1
+
+        Raises:
+            ERCOTAPIError: If any page cannot be retrieved
+        """
+        parameters = dict(parameters or {})
+        if page_size:
+            parameters['size'] = page_size
+        workers = max_workers or self.max_workers
+
+        print(f"\nQuerying endpoint: {endpoint} (all pages)")
+        if parameters:
+            print(f"Parameters: {json.dumps(parameters, indent=2)}")
+
+        first_page = self._send_query(endpoint, dict(parameters, page=1))
+        if first_page is None:
+            raise ERCOTAPIError(f"Failed to fetch page 1 from {endpoint}")
+
+        total_pages = self._total_pages(first_page)
+        print(f"✓ Page 1/{total_pages} ({len(first_page.get('data', []))} records)")
+        yield first_page
+
+        if total_pages <= 1:
+            return
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            next_page = 2
+
+            while next_page <= total_pages or pending:
+                # Keep the pool busy, but never hold more than `workers` pages
+                while next_page <= total_pages and len(pending) < workers:
+                    future = executor.submit(self._send_query, endpoint, dict(parameters, page=next_page))
+                    pending.append((next_page, future))
+                    next_page += 1
+
+                # Hand pages back in order as the oldest request finishes
+                page_number, future = pending.popleft()
+                page = future.result()
+                if page is None:
+                    raise ERCOTAPIError(f"Failed to fetch page {page_number}/{total_pages} from {endpoint}")
+
+                print(f"✓ Page {page_number}/{total_pages} ({len(page.get('data', []))} records)")
+                yield page
+
+    def query_all_pages(self, endpoint, parameters=None, page_size=None, max_workers=None):
+        """
+        Fetch every page of a query and merge them into one response.
+
+        The merged response is the first page with the 'data' rows of all
+        later pages appended in page order.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            max_workers (int): Pages fetched concurrently (default: self.max_workers)
+
+        Returns:
+            dict: Merged JSON response, or None if any page failed
+        """
+        merged = None
+        pages_retrieved = 0
+
+        try:
+            for page in self.iter_pages(endpoint, parameters, page_size=page_size, max_workers=max_workers):
+                if merged is None:
+                    merged = page
+                else:
+                    merged.setdefault('data', []).extend(page.get('data', []))
+                pages_retrieved += 1
+        except ERCOTAPIError as e:
+            print(f"✗ {e}")
+            return None
+
+        if isinstance(merged.get('_meta'), dict):
+            merged['_meta']['pagesRetrieved'] = pages_retrieved
+
+        print(f"✓ Retrieved {len(merged.get('data', [])):,} records from {pages_retrieved} page(s)")
+        return merged
+    
+    @staticmethod
+    def _time_range(endpoint, parameters):
+        """
+        Find the date/time range a query covers.
+
+        The parameter type (SCED, DAM or ARCHIVE) is decided by
+        discover_endpoints.detect_parameter_type, from the range parameters
+        present and, failing that, the endpoint's NP number.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters
+
+        Returns:
+            tuple: (parameter_type, from_key, to_key, start, end), or None if
+                   the query has no complete range to split
+
+        Raises:
+            ValueError: If a range value is not in the parameter's format
+                        (e.g. a date-only SCEDTimestampFrom) or the range
+                        ends before it starts
+        """
+        from discover_endpoints import detect_parameter_type
+
+        parameters = parameters or {}
+        parameter_type = detect_parameter_type({
+            "endpoint_id": endpoint.strip('/').split('/')[0],
+            "uses_sced_timestamp": "SCEDTimestampFrom" in parameters,
+            "uses_delivery_date": "deliveryDateFrom" in parameters,
+            "uses_post_datetime": "postDatetimeFrom" in parameters
+        })
+
+        from_key, to_key, time_format, _ = TIME_RANGE_PARAMETERS[parameter_type]
+        if from_key not in parameters or to_key not in parameters:
+            return None
+
+        # Anything past the seconds (fractions, a UTC offset) is ignored
+        width = len(datetime(2000, 1, 1).strftime(time_format))
+        bounds = []
+        for key in (from_key, to_key):
+            value = str(parameters[key])
+            try:
+                bounds.append(datetime.strptime(value[:width], time_format))
+            except ValueError:
+                raise ValueError(f"{key}={value!r} is not in the format {time_format}") from None
+
+        start, end = bounds
+        if end < start:
+            raise ValueError(f"{to_key} ({parameters[to_key]}) is before {from_key} ({parameters[from_key]})")
+        return parameter_type, from_key, to_key, start, end
+
+    def split_time_range(self, endpoint, parameters, chunk=None):
+        """
+        Break a query into consecutive sub-windows.
+
+        Both ends of ERCOT ranges are inclusive, so each sub-window ends one
+        step (a second, or a day for delivery dates) before the next begins,
+        e.g. 00:00:00-00:59:59, 01:00:00-01:59:59, ...
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters with a From/To range
+            chunk (timedelta): Sub-window length (default: 1 hour for SCED
+                               timestamps, 1 day for dates)
+
+        Returns:
+            list: Parameter dicts, one per sub-window, in time order
+                  ([parameters] unchanged if there is no range to split, or
+                  the range cannot be read)
+        """
+        try:
+            time_range = self._time_range(endpoint, parameters)
+        except ValueError as e:
+            # Let the API judge values it may still accept, as one query
+            print(f"⚠ Cannot split the time range ({e}). Sending it as one query")
+            time_range = None
+        if time_range is None:
+            return [dict(parameters or {})]
+
+        parameter_type, from_key, to_key, start, end = time_range
+        _, _, time_format, default_chunk = TIME_RANGE_PARAMETERS[parameter_type]
+        chunk = chunk or default_chunk
+
+        # The smallest step the parameter can express: a day for dates, else a second
+        step = timedelta(days=1) if time_format == '%Y-%m-%d' else timedelta(seconds=1)
+        chunk = max(chunk, step)
+
+        windows = []
+        window_start = start
+        while window_start <= end:
+            window_end = min(window_start + chunk - step, end)
+            windows.append(dict(parameters, **{
+                from_key: window_start.strftime(time_format),
+                to_key: window_end.strftime(time_format)
+            }))
+            window_start = window_end + step
+        return windows
+
+    def query_time_range(self, endpoint, parameters=None, chunk=None, page_size=None,
+                         max_workers=None, chunk_attempts=CHUNK_ATTEMPTS, job=None):
+        """
+        Query a long date/time range as concurrent sub-window requests.
+
+        One huge request is slow and a single failure loses all of it.
+        Here the range is split (see split_time_range), the sub-windows are
+        fetched in parallel with every page of each (see query_all_pages),
+        any sub-window that fails is retried on its own, and the rows are
+        merged back in time order.
+
+        With job set, the query is recorded as a run in the shared state
+        database (see ercot_state) and each sub-window's status (pending,
+        running, done, failed) is kept as it goes, so a crashed or failed
+        collection shows exactly which windows are missing.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters with a From/To range
+            chunk (timedelta): Sub-window length (default: 1 hour for SCED,
+                               1 day for DAM and ARCHIVE)
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            max_workers (int): Sub-windows fetched concurrently (default: self.max_workers)
+            chunk_attempts (int): Times a failed sub-window is attempted
+            job (str): Name to record the run and sub-window status under
+                       (e.g. 'daily_rtm_lmp'; default: not recorded)
+
+        Returns:
+            dict: Merged JSON response, or None if any sub-window failed
+        """
+        windows = self.split_time_range(endpoint, parameters, chunk)
+
+        progress = None
+        time_range = None
+        if job:
+            try:
+                time_range = self._time_range(endpoint, parameters)
+            except ValueError:
+                # Already reported by split_time_range; the query runs unsplit
+                pass
+        if time_range is not None:
+            from ercot_state import ChunkProgress
+            _, from_key, to_key, _, _ = time_range
+            progress = ChunkProgress(job, endpoint, [(window[from_key], window[to_key]) for window in windows])
+
+        if len(windows) == 1:
+            if progress:
+                progress.start(0)
+            result = self.query_all_pages(endpoint, windows[0], page_size=page_size)
+            if progress:
+                progress.record(0, result)
+                progress.finish([result])
+            return result
+
+        print(f"\nSplitting query on {endpoint} into {len(windows)} sub-windows")
+
+        def fetch_window(index):
+            window = windows[index]
+            if progress:
+                progress.start(index)
+            for attempt in range(1, chunk_attempts + 1):
+                # Pages of one sub-window are fetched one at a time; the
+                # concurrency comes from running sub-windows side by side
+                result = self.query_all_pages(endpoint, window, page_size=page_size, max_workers=1)
+                if result is not None:
+                    break
+                if attempt < chunk_attempts:
+                    print(f"⚠ Sub-window {json.dumps(window)} failed (attempt {attempt}). Retrying...")
+            if progress:
+                progress.record(index, result)
+            return result
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+            results = list(executor.map(fetch_window, range(len(windows))))
+        if progress:
+            progress.finish(results)
+
+        failed = [window for window, result in zip(windows, results) if result is None]
+        if failed:
+            print(f"✗ {len(failed)} of {len(windows)} sub-windows failed:")
+            for window in failed:
+                print(f"    {json.dumps(window)}")
+            return None
+
+        # executor.map preserves input order, so rows come back in time order
+        merged = results[0]
+        for result in results[1:]:
+            merged.setdefault('data', []).extend(result.get('data', []))
+
+        if isinstance(merged.get('_meta'), dict):
+            # Every page of every sub-window is in the merged result
+            pages = sum(self._total_pages(result) for result in results)
+            merged['_meta']['totalRecords'] = len(merged.get('data', []))
+            merged['_meta']['totalPages'] = pages
+            merged['_meta']['pagesRetrieved'] = pages
+            merged['_meta']['subWindows'] = len(windows)
+
+        print(f"✓ Retrieved {len(merged.get('data', [])):,} records from {len(windows)} sub-windows")
+        return merged
+
+    def query_columnar(self, endpoint, parameters=None, page_size=None, batch_size=COLUMNAR_BATCH_SIZE):
+        """
+        Query an endpoint and return the rows as typed columns.
+
+        Rows are streamed (see iter_records) and converted to NumPy arrays
+        batch by batch, with dtypes taken from the response's field
+        metadata and string columns dictionary-encoded. Only one batch of
+        Python row objects exists at a time. See ercot_columnar for the
+        result type; ColumnarResult.to_arrow() gives a pyarrow Table.
+
+        Requires numpy (and pyarrow for to_arrow).
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            batch_size (int): Rows converted to arrays at a time
+
+        Returns:
+            ColumnarResult: All pages as typed columns, or None if the query failed
+        """
+        if ColumnarBuilder is None:
+            raise ImportError("query_columnar requires numpy (pip install numpy)")
+
+        header = {}
+        builder = None
+        batch = []
+
+        try:
+            for row in self.iter_records(endpoint, parameters, page_size=page_size, header=header):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    # 'fields' precedes 'data', so it is known by the first row
+                    builder = builder or ColumnarBuilder(header.get('fields', []))
+                    builder.append_rows(batch)
+                    batch = []
+
+            builder = builder or ColumnarBuilder(header.get('fields', []))
+            builder.append_rows(batch)
+        except (ERCOTAPIError, ValueError) as e:
+            print(f"✗ {e}")
+            return None
+
+        result = builder.build(meta=header.get('_meta'))
+
+        print(f"✓ Decoded {len(result):,} records into {len(result.names)} typed columns")
+        return result
+
+    def open_stream(self, endpoint, parameters=None, extra_headers=None, accept=(200,)):
+        """
+        Send a GET request and return the response with its body unread.
+
+        For bodies too large to hold in memory (archive zips, huge pages):
+        the caller reads them with iter_content() and must close() the
+        response. A 401 is retried once with a fresh token.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+            extra_headers (dict): Headers added to the defaults (e.g. Range)
+            accept (tuple): Status codes to hand back (e.g. 206 for a Range request)
+
+        Returns:
+            requests.Response: A response with an accepted status, ready for iter_content()
+
+        Raises:
+            ERCOTAPIError: If the request fails or returns another status
+        """
+        try:
+            response = self._api_get(endpoint, parameters, stream=True, extra_headers=extra_headers)
+
+            if response.status_code == 401 and self.use_bearer_auth:
+                print("⚠ Token rejected by API (HTTP 401). Re-authenticating...")
+                response.close()
+                self._invalidate_token()
+                response = self._api_get(endpoint, parameters, stream=True, extra_headers=extra_headers)
+
+        except requests.exceptions.RequestException as e:
+            raise ERCOTAPIError(f"Error during API request to {endpoint}: {e}") from e
+
+        if response.status_code not in accept:
+            message = response.text[:500]
+            response.close()
+            raise ERCOTAPIError(f"Request to {endpoint} failed with status code {response.status_code}: {message}")
+
+        return response
+
+    @staticmethod
+    def _iter_text(response, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Yield a streamed response body as text chunks.
+
+        Multi-byte UTF-8 characters split across chunks are handled by an
+        incremental decoder.
+        """
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            yield decoder.decode(chunk)
+        yield decoder.decode(b'', final=True)
+
+    def iter_records(self, endpoint, parameters=None, page_size=None, as_dict=False, header=None):
+        """
+        Yield the rows of a query one at a time, as the response streams in.
+
+        Unlike query_api, the body is never loaded whole: each row is
+        decoded as soon as its bytes arrive and is handed to the caller
+        before the next is read, so memory stays flat however large the
+        window is. Pages are streamed one after another.
+
+        Example:
+            for row in client.iter_records("np6-788-cd/lmp_node_zone_hub", parameters):
+                ...
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            as_dict (bool): Yield {field name: value} dicts instead of row lists.
+                            Field names come from the response's 'fields'
+                            header, which ERCOT sends before 'data'.
+            header (dict): If given, filled with the current page's other
+                           top-level values ('fields', '_meta', 'report')
+                           as they are read
+
+        Yields:
+            list or dict: One record at a time
+
+        Raises:
+            ERCOTAPIError: If a page cannot be retrieved or the stream breaks off
+        """
+        parameters = dict(parameters or {})
+        if page_size:
+            parameters['size'] = page_size
+
+        print(f"\nStreaming records from: {endpoint}")
+        if parameters:
+            print(f"Parameters: {json.dumps(parameters, indent=2)}")
+
+        page_number = 1
+        total_pages = 1
+        total_records = 0
+
+        while page_number <= total_pages:
+            if header is None:
+                header = {}
+            field_names = None
+            page_records = 0
+
+            response = self.open_stream(endpoint, dict(parameters, page=page_number))
+            try:
+                for row in iter_json_array_items(self._iter_text(response), 'data', header):
+                    if as_dict and isinstance(row, list):
+                        if field_names is None:
+                            field_names = [field.get('name') for field in header.get('fields', [])]
+                        if field_names:
+                            row = dict(zip(field_names, row))
+                    page_records += 1
+                    yield row
+            except (requests.exceptions.RequestException, ValueError) as e:
+                raise ERCOTAPIError(f"Stream from {endpoint} (page {page_number}) broke off: {e}") from e
+            finally:
+                response.close()
+
+            # _meta is complete once the page has been read to the end
+            total_pages = self._total_pages(header)
+            total_records += page_records
+            print(f"✓ Page {page_number}/{total_pages} ({page_records:,} records streamed)")
+            page_number += 1
+
+        print(f"✓ Streamed {total_records:,} records from {total_pages} page(s)")
+
+    @staticmethod
+    def _scan_meta(body_prefix):
+        """
+        Find the _meta block in the first bytes of a raw response body.
+
+        ERCOT puts the small, flat _meta object at the top of its responses,
+        so it can be read without parsing the (possibly huge) rest.
+
+        Args:
+            body_prefix (bytes): Leading bytes of the response body
+
+        Returns:
+            dict: The decoded _meta object, or None if not found (yet)
+        """
+        match = re.search(rb'"_meta"\s*:\s*(\{[^{}]*\})', body_prefix)
+        if not match:
+            return None
+        try:
+            return json.loads(match.group(1))
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _page_record_count(meta):
+        """
+        Work out how many records a page holds from its _meta block.
+
+        Returns:
+            int: Records on this page, or None if _meta does not say
+        """
+        if not meta or meta.get('totalRecords') is None:
+            return None
+        total = int(meta['totalRecords'])
+        page_size = int(meta.get('pageSize') or 0)
+        if not page_size:
+            return total
+        current_page = int(meta.get('currentPage') or 1)
+        return max(0, min(page_size, total - (current_page - 1) * page_size))
+
+    def _download_page(self, endpoint, parameters, output_path, checksum=None):
+        """
+        Stream one page's raw response body into a file.
+
+        The body is written in chunks as it arrives, to a .part file that is
+        renamed into place once complete, so an interrupted download never
+        leaves a truncated file behind under the final name.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters, including 'page'
+            output_path (Path): Final location of the file
+            checksum (str): hashlib algorithm to compute on the fly, or None
+
+        Returns:
+            dict: file, bytes, records (from _meta) and checksum for this page
+
+        Raises:
+            ERCOTAPIError: If the request or the write fails
+        """
+        response = self.open_stream(endpoint, parameters)
+        digest = hashlib.new(checksum) if checksum else None
+        tmp_path = output_path.with_name(output_path.name + '.part')
+        body_prefix = b''
+        meta = None
+        size = 0
+
+        try:
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    f.write(chunk)
+                    size += len(chunk)
+                    if digest is not None:
+                        digest.update(chunk)
+                    if meta is None and len(body_prefix) < META_SCAN_BYTES:
+                        body_prefix += chunk[:META_SCAN_BYTES]
+                        meta = self._scan_meta(body_prefix)
+            os.replace(tmp_path, output_path)
+
+        except (requests.exceptions.RequestException, OSError) as e:
+            tmp_path.unlink(missing_ok=True)
+            raise ERCOTAPIError(f"Download of {endpoint} to {output_path} failed: {e}") from e
+        finally:
+            response.close()
+
+        result = {
+            "file": str(output_path),
+            "bytes": size,
+            "records": self._page_record_count(meta),
+            "total_pages": self._total_pages({"_meta": meta or {}}),
+            "checksum": digest.hexdigest() if digest is not None else None
+        }
+
+        if digest is not None:
+            # sha256sum-compatible sidecar, so archives can be verified later
+            with open(output_path.with_name(f"{output_path.name}.{checksum}"), 'w') as f:
+                f.write(f"{result['checksum']}  {output_path.name}\n")
+
+        return result
+
+    def download_raw(self, endpoint, parameters=None, output_file=None, page_size=None,
+                     max_workers=None, checksum='sha256'):
+        """
+        Download a query straight to disk without parsing it.
+
+        For collectors that only archive the response. The bytes ERCOT
+        sends are written as they arrive: no JSON decoding, no re-encoding,
+        and none of the indent=2 whitespace that save_response adds. The
+        record count comes from the _meta block at the top of each page.
+
+        Page 1 is written to output_file. If the result has more pages,
+        they are downloaded concurrently to output_file with a .pageNNNN
+        suffix before the extension.
+
+        Args:
+            endpoint (str): The API endpoint path
+            parameters (dict): Query parameters to send with the request
+            output_file (str): Where to write page 1
+            page_size (int): Records per page (sent as 'size'; API default if None)
+            max_workers (int): Pages downloaded concurrently (default: self.max_workers)
+            checksum (str): hashlib algorithm for on-the-fly checksums
+                            (written to <file>.<algorithm>), or None to skip
+
+        Returns:
+            dict: files, bytes, records and checksums, or None if the download failed
+        """
+        parameters = dict(parameters or {})
+        if page_size:
+            parameters['size'] = page_size
+
+        output_path = Path(output_file)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+        print(f"\nDownloading endpoint: {endpoint} (raw)")
+        if parameters:
+            print(f"Parameters: {json.dumps(parameters, indent=2)}")
+
+        try:
+            first = self._download_page(endpoint, dict(parameters, page=1), output_path, checksum)
+            pages = [first]
+            total_pages = first['total_pages']
+            print(f"✓ Page 1/{total_pages}: {first['bytes']:,} bytes -> {first['file']}")
+
+            if total_pages > 1:
+                def page_path(page_number):
+                    return output_path.with_name(f"{output_path.stem}.page{page_number:04d}{output_path.suffix}")
+
+                with ThreadPoolExecutor(max_workers=max_workers or self.max_workers) as executor:
+                    futures = [
+                        executor.submit(self._download_page, endpoint, dict(parameters, page=page_number),
+                                        page_path(page_number), checksum)
+                        for page_number in range(2, total_pages + 1)
+                    ]
+                    for page_number, future in enumerate(futures, start=2):
+                        page = future.result()
+                        pages.append(page)
+                        print(f"✓ Page {page_number}/{total_pages}: {page['bytes']:,} bytes -> {page['file']}")
+
+        except ERCOTAPIError as e:
+            print(f"✗ {e}")
+            return None
+
+        records = [page['records'] for page in pages]
+        summary = {
+            "files": [page['file'] for page in pages],
+            "bytes": sum(page['bytes'] for page in pages),
+            "records": None if None in records else sum(records),
+            "checksums": {page['file']: page['checksum'] for page in pages} if checksum else {}
+        }
+
+        print(f"✓ Downloaded {summary['bytes']:,} bytes ({summary['bytes']/1024:.2f} KB) in {len(pages)} file(s)")
+        if summary['records'] is not None:
+            print(f"  Records: {summary['records']:,}")
+        return summary
 
-        except requests.exceptions.RequestException as e:
-            # Network error or other request issue
-            print(f"✗ Error during API request: {e}")
-            if self.debug:
-                import traceback
-                print("\n[DEBUG] Full exception traceback:")
-                traceback.print_exc()
-            return None
-    
     def save_response(self, data, output_file):
         """
         Save the API response to a JSON file.
@@ -328,6 +1883,9 @@ class ERCOTAPIClient:
         Args:
             data (dict): The data to save (typically the API response)
             output_file (str): Path where the JSON file should be saved
+
+        Returns:
+            bool: True if the file was written, False otherwise
         """
         try:
             # Create output directory if it doesn't exist
@@ -343,9 +1901,23 @@ class ERCOTAPIClient:
             # Print some statistics about the saved data
             file_size = output_path.stat().st_size
             print(f"  File size: {file_size:,} bytes ({file_size/1024:.2f} KB)")
+            return True
             
         except Exception as e:
             print(f"✗ Error saving data to file: {e}")
+            return False
+
+
+def __getattr__(name):
+    """
+    Import AsyncERCOTAPIClient from ercot_async on first use.
+
+    ercot_async imports this module, so it cannot be imported at the top.
+    """
+    if name == 'AsyncERCOTAPIClient':
+        from ercot_async import AsyncERCOTAPIClient
+        return AsyncERCOTAPIClient
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def load_query_config(config_file):
@@ -356,6 +1928,9 @@ def load_query_config(config_file):
     - endpoint: The API endpoint to query
     - parameters: Dictionary of query parameters
     - output_file: Where to save the response
+    - paginate (optional): Fetch and merge every page of the result
+    - page_size (optional): Records per page when paginating
+    - split (optional): "hour" or "day" to fetch the range as sub-windows
     
     Args:
         config_file (str): Path to the JSON configuration file
@@ -413,6 +1988,15 @@ Examples:
   
   # Query with verbose output
   python3 ercot_query.py --config queries/settlement_prices.json --verbose
+
+  # Fetch every page of a large result (8 pages at a time)
+  python3 ercot_query.py --config queries/realtime_lmp.json --all-pages --workers 8
+
+  # Split a long date range into hourly requests fetched in parallel
+  python3 ercot_query.py --config queries/realtime_lmp.json --split hour
+
+  # Reuse cached responses (closed windows never hit the API again)
+  python3 ercot_query.py --config queries/realtime_lmp.json --cache
         """
     )
     
@@ -434,6 +2018,34 @@ Examples:
         action='store_true',
         help='Enable debug output (shows detailed request/response information)'
     )
+
+    parser.add_argument(
+        '--all-pages',
+        action='store_true',
+        help='Fetch and merge every page of the result (also enabled by "paginate": true in the config)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help=f'Pages fetched concurrently with --all-pages (default: {DEFAULT_MAX_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--split',
+        choices=['hour', 'day'],
+        default=None,
+        help='Split the date range into hourly or daily requests fetched in parallel '
+             '(also enabled by "split": "hour"/"day" in the config)'
+    )
+
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help=f'Use the on-disk response cache (default location: {DEFAULT_RESPONSE_CACHE}; '
+             'also enabled by ERCOT_RESPONSE_CACHE in .env)'
+    )
     
     # Parse the arguments provided by the user
     args = parser.parse_args()
@@ -452,7 +2064,8 @@ Examples:
     
     # Initialize the ERCOT API client
     # This loads credentials from .env file
-    client = ERCOTAPIClient(debug=args.debug)
+    client = ERCOTAPIClient(debug=args.debug, max_workers=args.workers,
+                            response_cache=True if args.cache else None)
 
     # Authenticate with the API (only if using bearer token authentication)
     # For subscription key-only APIs, this step is skipped
@@ -464,10 +2077,22 @@ Examples:
         print("Using subscription key authentication (no bearer token required)")
     
     # Execute the API query
-    response_data = client.query_api(
-        endpoint=config['endpoint'],
-        parameters=config.get('parameters', {})
-    )
+    split = args.split or config.get('split')
+    if split:
+        # Sub-window queries always fetch every page
+        response_data = client.query_time_range(
+            endpoint=config['endpoint'],
+            parameters=config.get('parameters', {}),
+            chunk=timedelta(hours=1) if split == 'hour' else timedelta(days=1),
+            page_size=config.get('page_size')
+        )
+    else:
+        response_data = client.query_api(
+            endpoint=config['endpoint'],
+            parameters=config.get('parameters', {}),
+            paginate=args.all_pages or config.get('paginate', False),
+            page_size=config.get('page_size')
+        )
     
     # Check if we got a valid response
     if response_data is None:
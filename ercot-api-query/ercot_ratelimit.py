@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+ERCOT Client-Side Rate Limiter
+
+A token bucket that keeps requests within the API subscription's limit.
+With a state file the bucket is shared by every collector and backfill on
+this machine (state/rate_limit.json), and a 429/503 from the API pauses all
+of them for the Retry-After period (read with retry_after_seconds).
+
+ERCOTAPIClient creates one from its rate_limit option (or ERCOT_RATE_LIMIT /
+ERCOT_RATE_BURST in .env).
+
+Usage:
+    from ercot_ratelimit import RateLimiter
+
+    limiter = RateLimiter(60, burst=10, state_path="state/rate_limit.json")
+    limiter.acquire()           # blocks until a request may be sent
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from ercot_cache import file_lock
+
+
+# Client-side rate limit shared by every process using the same state file.
+# Set ERCOT_RATE_LIMIT (requests per minute) to match your subscription,
+# or to 0 to disable limiting.
+DEFAULT_RATE_LIMIT_PER_MINUTE = 30
+DEFAULT_RATE_BURST = 5
+DEFAULT_RATE_LIMIT_STATE = "state/rate_limit.json"
+
+
+def retry_after_seconds(value, default):
+    """
+    Parse a Retry-After header (delta-seconds or an HTTP date).
+
+    Args:
+        value (str): Header value, or None if the header was missing
+        default (float): Seconds to use when the header is missing or invalid
+
+    Returns:
+        float: Seconds to wait (never negative)
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter, optionally shared across processes.
+
+    The bucket holds up to `burst` request tokens and refills at
+    `rate_per_minute`. With a state_path, the bucket lives in a small JSON
+    file guarded by a lock file, so every collector and backfill on the
+    machine draws from the same budget instead of each assuming it has
+    the whole subscription limit to itself.
+
+    A 429/503 from the API blocks the bucket for the Retry-After period,
+    which pauses every process sharing it, not just the one that was
+    throttled.
+    """
+
+    def __init__(self, rate_per_minute, burst=DEFAULT_RATE_BURST, state_path=None, key="default"):
+        """
+        Args:
+            rate_per_minute (float): Sustained request budget
+            burst (int): Requests allowed back-to-back before throttling
+            state_path (str): Shared bucket file, or None for this process only
+            key (str): Bucket name inside the shared file
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, int(burst))
+        self.state_path = Path(state_path) if state_path else None
+        self.key = key
+        self._lock = threading.Lock()
+        self._state = self._full_bucket()
+
+    def _full_bucket(self):
+        return {"tokens": float(self.capacity), "updated": time.time(), "blocked_until": 0.0}
+
+    @contextmanager
+    def _locked_state(self):
+        """Yield the bucket state under the thread lock (and file lock if shared)."""
+        with self._lock:
+            if self.state_path is None:
+                yield self._state
+                return
+
+            with file_lock(self.state_path.with_name(self.state_path.name + '.lock')):
+                try:
+                    with open(self.state_path, 'r') as f:
+                        buckets = json.load(f)
+                except (OSError, ValueError):
+                    buckets = {}
+                if not isinstance(buckets, dict):
+                    buckets = {}
+
+                state = buckets.get(self.key) or self._full_bucket()
+                yield state
+
+                buckets[self.key] = state
+                tmp_path = self.state_path.with_name(f"{self.state_path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, 'w') as f:
+                    json.dump(buckets, f)
+                os.replace(tmp_path, self.state_path)
+
+    def _try_acquire(self):
+        """
+        Take one token if available.
+
+        Returns:
+            float: 0 if a token was taken, otherwise seconds to wait before retrying
+        """
+        with self._locked_state() as state:
+            now = time.time()
+            elapsed = max(0.0, now - state["updated"])
+            state["tokens"] = min(self.capacity, state["tokens"] + elapsed * self.rate)
+            state["updated"] = now
+
+            if now < state.get("blocked_until", 0.0):
+                return state["blocked_until"] - now
+            if state["tokens"] >= 1:
+                state["tokens"] -= 1
+                return 0.0
+            return (1 - state["tokens"]) / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            wait_seconds = self._try_acquire()
+            if wait_seconds <= 0:
+                return
+            time.sleep(wait_seconds)
+
+    async def acquire_async(self):
+        """Wait (without blocking the event loop) until a request may be sent."""
+        loop = asyncio.get_running_loop()
+        while True:
+            # The shared bucket file is locked and read, so do that off the loop
+            wait_seconds = await loop.run_in_executor(None, self._try_acquire)
+            if wait_seconds <= 0:
+                return
+            await asyncio.sleep(wait_seconds)
+
+    def block_for(self, seconds):
+        """
+        Stop handing out tokens for the given number of seconds.
+
+        Args:
+            seconds (float): How long to pause (e.g. the Retry-After value)
+        """
+        with self._locked_state() as state:
+            state["blocked_until"] = max(state.get("blocked_until", 0.0), time.time() + seconds)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+ERCOT Retry Policy and Circuit Breaker
+
+The rules ERCOTAPIClient (and AsyncERCOTAPIClient) follow when a request
+fails:
+
+- RetryPolicy: how often connection errors, timeouts and 5xx responses are
+  retried, with decorrelated-jitter backoff and a total deadline
+- CircuitBreaker: fails fast, per endpoint, while an endpoint keeps failing
+  (the client then raises ercot_query.CircuitOpenError)
+
+Usage:
+    from ercot_query import ERCOTAPIClient
+    from ercot_retry import RetryPolicy, CircuitBreaker
+
+    client = ERCOTAPIClient(retry_policy=RetryPolicy(max_attempts=3, deadline=60))
+    client.circuit_breaker = CircuitBreaker(failure_threshold=10)
+"""
+
+import time
+import random
+import threading
+
+
+# Retries for connection errors, timeouts and 5xx responses (see RetryPolicy).
+# Override with ERCOT_MAX_ATTEMPTS / ERCOT_RETRY_DEADLINE in .env.
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BASE_DELAY = 1.0
+DEFAULT_RETRY_MAX_DELAY = 60.0
+DEFAULT_RETRY_DEADLINE = 300.0
+
+# Consecutive failures that open an endpoint's circuit, and for how long
+DEFAULT_CIRCUIT_THRESHOLD = 5
+DEFAULT_CIRCUIT_RESET_SECONDS = 60.0
+
+
+class RetryPolicy:
+    """
+    How failed requests are retried.
+
+    Connection errors, timeouts and 5xx responses are retried with
+    "decorrelated jitter" backoff: each wait is random between base_delay
+    and three times the previous wait, capped at max_delay. This spreads
+    retries from many workers out instead of having them hit the API in
+    lock-step. No retry is started once it would end past the deadline.
+    """
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_RETRY_BASE_DELAY,
+                 max_delay=DEFAULT_RETRY_MAX_DELAY, deadline=DEFAULT_RETRY_DEADLINE):
+        """
+        Args:
+            max_attempts (int): Total attempts per request, including the first
+            base_delay (float): Smallest wait between attempts, in seconds
+            max_delay (float): Largest wait between attempts, in seconds
+            deadline (float): Total seconds a request may spend retrying
+        """
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+
+    def next_delay(self, previous_delay):
+        """
+        Pick the wait before the next attempt.
+
+        Args:
+            previous_delay (float): The previous wait (base_delay before the first retry)
+
+        Returns:
+            float: Seconds to wait
+        """
+        return min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous_delay * 3)))
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker.
+
+    After failure_threshold consecutive failed attempts against one
+    endpoint the circuit opens and requests to it fail immediately with
+    CircuitOpenError instead of waiting through retries. After
+    reset_timeout seconds a single trial request is let through; success
+    closes the circuit, failure keeps it open for another period.
+    """
+
+    def __init__(self, failure_threshold=DEFAULT_CIRCUIT_THRESHOLD, reset_timeout=DEFAULT_CIRCUIT_RESET_SECONDS):
+        """
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit
+            reset_timeout (float): Seconds the circuit stays open before a trial
+        """
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def allow(self, key):
+        """
+        Check whether a request to this endpoint may be sent.
+
+        Args:
+            key (str): Endpoint identifier
+
+        Returns:
+            bool: False while the circuit is open
+        """
+        with self._lock:
+            circuit = self._circuits.get(key)
+            if circuit is None or circuit["opened_at"] is None:
+                return True
+            if time.monotonic() - circuit["opened_at"] < self.reset_timeout:
+                return False
+            # Half-open: let exactly one trial request through
+            if circuit["trial_in_flight"]:
+                return False
+            circuit["trial_in_flight"] = True
+            return True
+
+    def record_success(self, key):
+        """Close the circuit for this endpoint."""
+        with self._lock:
+            self._circuits.pop(key, None)
+
+    def record_failure(self, key):
+        """
+        Count a failed attempt, opening the circuit at the threshold.
+
+        Returns:
+            bool: True if the circuit is now open
+        """
+        with self._lock:
+            circuit = self._circuits.setdefault(key, {"failures": 0, "opened_at": None, "trial_in_flight": False})
+            circuit["failures"] += 1
+            circuit["trial_in_flight"] = False
+            if circuit["failures"] >= self.failure_threshold:
+                if circuit["opened_at"] is None:
+                    print(f"⚠ {key}: {circuit['failures']} consecutive failures. "
+                          f"Failing fast for {self.reset_timeout:.0f} seconds")
+                circuit["opened_at"] = time.monotonic()
+                return True
+            return False
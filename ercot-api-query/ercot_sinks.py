@@ -0,0 +1,525 @@
+#!/usr/bin/env python3
+"""
+ERCOT Output Sinks
+
+Where collectors write their results. Every sink has the same write()
+method, so a collector picks one by name (see get_sink) and saves the same
+way whatever the format:
+
+- JSONSink: the existing pretty-printed JSON file (ERCOTAPIClient.save_response)
+- NDJSONSink: one JSON record per line, gzip- or zstd-compressed
+- ParquetSink: compressed Parquet, partitioned by report, date and hour
+
+Parquet files are laid out Hive-style, so a month of data can be read as
+one dataset without parsing any JSON:
+
+    output/parquet/report=np6-788-cd_lmp_node_zone_hub/date=2025-01-27/hour=05/<name>.parquet
+
+    import pyarrow.dataset as ds
+    lmp = ds.dataset("output/parquet/report=np6-788-cd_lmp_node_zone_hub",
+                     partitioning="hive").to_table()
+
+Column types come from the response's field metadata (see ercot_columnar):
+float64/int64 numbers, date32/timestamp dates, dictionary-encoded strings.
+The first write of a report saves that schema as report=<name>/_common_metadata
+and every later file is cast to it, so all files of a report share one
+schema and read back as a single dataset.
+
+NDJSON files are written by NDJSONWriter one record at a time, so a query
+can also be streamed straight to disk without holding its pages in memory
+(see stream_to_ndjson). Files are compressed with zstd when the zstandard
+package is installed and gzip otherwise, and can be read back with:
+
+    zstd -dc file.ndjson.zst | jq .      /      zcat file.ndjson.gz | jq .
+
+ParquetSink requires numpy and pyarrow.
+"""
+
+import os
+import re
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+from ercot_query import ERCOTAPIError
+
+# Optional: only needed for ParquetSink (pip install numpy pyarrow)
+try:
+    import numpy as np
+    import pyarrow.parquet as pq
+    from ercot_columnar import ColumnarBuilder, arrow_schema
+except ImportError:
+    np = pq = ColumnarBuilder = arrow_schema = None
+
+# fcntl is POSIX-only; without it concurrent appends to one NDJSON file are not serialised
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Optional: zstd compression for NDJSON files (pip install zstandard)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Root folder of the partitioned Parquet dataset
+DEFAULT_PARQUET_ROOT = "output/parquet"
+
+# Parquet compression codec (zstd: small files that are fast to read)
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+
+# Per-report file holding the pinned dataset schema (readers skip '_' files)
+PARQUET_SCHEMA_FILE = "_common_metadata"
+
+# Output formats collectors can select with --format
+OUTPUT_FORMATS = ("json", "ndjson", "parquet")
+
+# NDJSON compression: zstd if the zstandard package is installed, else gzip
+NDJSON_COMPRESSIONS = {"gzip": ".ndjson.gz", "zstd": ".ndjson.zst"}
+DEFAULT_NDJSON_COMPRESSION = "zstd" if zstandard is not None else "gzip"
+
+# Records written between flushes of the compressed NDJSON stream
+NDJSON_FLUSH_RECORDS = 10000
+
+# Columns holding the delivery hour when a report has dates but no timestamps
+HOUR_COLUMNS = ("hourEnding", "deliveryHour", "HourEnding", "DeliveryHour")
+
+
+class JSONSink:
+    """Writes responses as pretty-printed JSON files (the original format)."""
+
+    def __init__(self, client):
+        """
+        Args:
+            client (ERCOTAPIClient): Client whose save_response is used
+        """
+        self.client = client
+
+    def write(self, data, output_file, report=None):
+        """
+        Save a response to output_file.
+
+        Args:
+            data (dict): The API response
+            output_file (str): Path of the JSON file
+            report (str): Unused; accepted for a common interface
+
+        Returns:
+            bool: True if the file was written, False otherwise
+        """
+        return self.client.save_response(data, output_file)
+
+
+class ParquetSink:
+    """
+    Writes responses as Parquet files partitioned by report, date and hour.
+
+    One file is written per (date, hour) in the response, named after the
+    collector's output file, so re-collecting the same window replaces the
+    same files instead of adding duplicates.
+
+    Every file of a report is written with the schema pinned by the first
+    write (see _report_schema), never with types guessed from one batch.
+    """
+
+    def __init__(self, root=DEFAULT_PARQUET_ROOT, compression=DEFAULT_PARQUET_COMPRESSION):
+        """
+        Args:
+            root (str): Root folder of the dataset
+            compression (str): Parquet codec ('zstd', 'snappy', 'gzip', ...)
+        """
+        if pq is None:
+            raise ImportError("ParquetSink requires numpy and pyarrow (pip install numpy pyarrow)")
+        self.root = Path(root)
+        self.compression = compression
+
+    @staticmethod
+    def _partition_keys(result):
+        """
+        Work out each row's (date, hour) partition.
+
+        Uses the first timestamp column if there is one (e.g. SCEDTimestamp);
+        otherwise the first date column plus an hour-ending column
+        (hour ending 01:00 is hour 00). Rows with no usable value go to
+        date=unknown / hour=unknown.
+
+        Returns:
+            tuple: (dates, hours) as lists of strings, one per row
+        """
+        timestamp = next((name for name in result.names if result.kinds[name] == 'datetime'), None)
+        if timestamp is not None:
+            values = result.columns[timestamp]
+            days = values.astype('datetime64[D]')
+            hours = ((values - days) // np.timedelta64(1, 'h')).astype(np.int64)
+            missing = np.isnat(values)
+            dates = np.where(missing, 'unknown', days.astype(str))
+            hours = np.where(missing, 'unknown', np.char.zfill(hours.astype(str), 2))
+            return dates.tolist(), hours.tolist()
+
+        date = next((name for name in result.names if result.kinds[name] == 'date'), None)
+        if date is None:
+            return ['unknown'] * len(result), ['unknown'] * len(result)
+
+        values = result.columns[date]
+        dates = np.where(np.isnat(values), 'unknown', values.astype(str)).tolist()
+
+        hour_column = next((name for name in HOUR_COLUMNS if name in result.columns), None)
+        if hour_column is None:
+            return dates, ['all'] * len(result)
+
+        hours = []
+        for value in result.column(hour_column).tolist():
+            match = re.match(r'\s*(\d{1,2})', str(value)) if value is not None else None
+            hours.append(f"{int(match.group(1)) - 1:02d}" if match else 'unknown')
+        return dates, hours
+
+    def _report_schema(self, report, fields):
+        """
+        Return the schema all of a report's files are written with.
+
+        The first call for a report derives it from the field metadata and
+        saves it next to the partitions; later calls (and later runs) read
+        it back, so a response whose metadata or data differs is cast to
+        the existing dataset instead of starting a new schema.
+
+        Args:
+            report (str): Partition name of the report
+            fields (list): The response's 'fields' metadata
+
+        Returns:
+            pyarrow.Schema: The pinned schema
+        """
+        folder = self.root / f"report={report}"
+        path = folder / PARQUET_SCHEMA_FILE
+        if path.exists():
+            return pq.read_schema(path)
+
+        schema = arrow_schema(fields)
+        folder.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        pq.write_metadata(schema, tmp_path)
+        os.replace(tmp_path, path)
+        return schema
+
+    def write(self, data, output_file=None, report=None):
+        """
+        Save a response as partitioned Parquet files.
+
+        Args:
+            data (dict): The API response ('fields' and 'data')
+            output_file (str): The collector's JSON path; its stem names the files
+            report (str): Report or endpoint name for the report= partition
+                          (default: the response's reportEMILId)
+
+        Returns:
+            bool: True if the files were written, False otherwise
+        """
+        try:
+            report = report or (data.get('report') or {}).get('reportEMILId') or 'unknown'
+            report = re.sub(r'[^\w.-]', '_', report.strip('/').lower())
+            name = Path(output_file).stem if output_file else 'data'
+
+            builder = ColumnarBuilder(data.get('fields', []))
+            builder.append_rows(data.get('data', []))
+            result = builder.build(meta=data.get('_meta'))
+
+            if len(result) == 0:
+                print("⚠ No records to write to Parquet")
+                return True
+
+            table = result.to_arrow(schema=self._report_schema(report, data.get('fields', [])))
+            dates, hours = self._partition_keys(result)
+
+            partitions = {}
+            for row, key in enumerate(zip(dates, hours)):
+                partitions.setdefault(key, []).append(row)
+
+            total_size = 0
+            for (date, hour), rows in sorted(partitions.items()):
+                folder = self.root / f"report={report}" / f"date={date}" / f"hour={hour}"
+                folder.mkdir(parents=True, exist_ok=True)
+                path = folder / f"{name}.parquet"
+
+                # Write then rename, so readers never see a half-written file
+                tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+                pq.write_table(table.take(rows), tmp_path, compression=self.compression)
+                os.replace(tmp_path, path)
+                total_size += path.stat().st_size
+
+            print(f"✓ Data saved to: {self.root / f'report={report}'} "
+                  f"({len(result):,} records in {len(partitions)} partitions)")
+            print(f"  File size: {total_size:,} bytes ({total_size/1024:.2f} KB)")
+            return True
+
+        except Exception as e:
+            print(f"✗ Error saving data to Parquet: {e}")
+            return False
+
+
+def ndjson_path(output_file, compression=DEFAULT_NDJSON_COMPRESSION):
+    """
+    Turn a collector's .json path into the matching compressed NDJSON path.
+
+    Example:
+        output/daily/rtm/rtm_lmp_2025-01-27.json -> output/daily/rtm/rtm_lmp_2025-01-27.ndjson.zst
+    """
+    path = Path(output_file)
+    for suffix in (".json", *NDJSON_COMPRESSIONS.values()):
+        if path.name.endswith(suffix):
+            path = path.with_name(path.name[:-len(suffix)])
+            break
+    return path.with_name(path.name + NDJSON_COMPRESSIONS[compression])
+
+
+class NDJSONWriter:
+    """
+    Writes records to a compressed NDJSON file, one JSON object per line.
+
+    Records are compressed as they are written, so memory use does not
+    grow with the size of the file. Everything goes to a temporary file
+    next to the destination first; close() moves it into place, so a
+    crash never leaves a truncated file behind:
+
+    - append=False: the temporary file replaces the destination (os.replace)
+    - append=True: the temporary file is added to the end of the
+      destination (under an flock) as one more gzip member / zstd frame;
+      both formats read concatenated streams as one. If that fails the
+      destination is cut back to its previous length, so it only ever
+      holds complete streams. Appending no records leaves it untouched.
+
+    Example:
+        with NDJSONWriter("output/lmp_2025-01-27.ndjson.gz", append=True) as writer:
+            for page in client.iter_pages(endpoint, parameters):
+                writer.write_page(page)
+    """
+
+    def __init__(self, path, compression=None, append=False, flush_records=NDJSON_FLUSH_RECORDS):
+        """
+        Args:
+            path (str): Destination file
+            compression (str): 'gzip' or 'zstd' (default: from the file
+                               suffix, else DEFAULT_NDJSON_COMPRESSION)
+            append (bool): Add to the destination instead of replacing it
+            flush_records (int): Records written between flushes
+
+        Raises:
+            ValueError: If the compression is unknown
+            ImportError: If zstd is requested but zstandard is not installed
+        """
+        self.path = Path(path)
+        if compression is None:
+            compression = "zstd" if self.path.name.endswith(".zst") else \
+                "gzip" if self.path.name.endswith(".gz") else DEFAULT_NDJSON_COMPRESSION
+        if compression not in NDJSON_COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{compression}' (choose from: {', '.join(NDJSON_COMPRESSIONS)})")
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd compression requires zstandard (pip install zstandard)")
+
+        self.compression = compression
+        self.append = append
+        self.flush_records = flush_records
+        self.records = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.{id(self):x}.tmp")
+        self._raw = open(self.tmp_path, 'wb')
+        if compression == "zstd":
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='wb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+        return False
+
+    def write(self, record):
+        """Write one record (any JSON-serialisable value) as a line."""
+        self._stream.write(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
+        self.records += 1
+        if self.records % self.flush_records == 0:
+            self.flush()
+
+    def write_records(self, records):
+        """Write every record from an iterable, one at a time."""
+        for record in records:
+            self.write(record)
+
+    def write_page(self, page):
+        """
+        Write the rows of one API response page.
+
+        Rows are written as {field name: value} objects using the page's
+        'fields' header, so each line stands on its own.
+        """
+        names = [field.get('name') for field in page.get('fields', [])]
+        for row in page.get('data', []):
+            self.write(dict(zip(names, row)) if names and isinstance(row, list) else row)
+
+    def flush(self):
+        """Push buffered data through the compressor to disk."""
+        if self.compression == "zstd":
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        else:
+            self._stream.flush()
+        self._raw.flush()
+
+    def close(self):
+        """
+        Finish the compressed stream and move it into place.
+
+        Raises:
+            OSError: If the file cannot be finalised (the destination is unchanged)
+        """
+        if self._raw.closed:
+            return
+        try:
+            self._stream.close()
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self._raw.close()
+
+            if self.append:
+                if self.records:
+                    self._append_tmp()
+            else:
+                os.replace(self.tmp_path, self.path)
+        finally:
+            self._discard()
+
+    def _append_tmp(self):
+        """Add the finished temporary file to the destination, all or nothing."""
+        with open(self.path, 'ab') as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            size = f.seek(0, os.SEEK_END)
+            try:
+                with open(self.tmp_path, 'rb') as tmp:
+                    shutil.copyfileobj(tmp, f)
+                f.flush()
+                os.fsync(f.fileno())
+            except OSError:
+                f.truncate(size)
+                raise
+
+    def abort(self):
+        """Discard everything written; the destination is left unchanged."""
+        self._discard()
+
+    def _discard(self):
+        if not self._raw.closed:
+            self._raw.close()
+        if self.tmp_path.exists():
+            self.tmp_path.unlink()
+
+
+class NDJSONSink:
+    """Writes responses as compressed NDJSON files, one record per line."""
+
+    def __init__(self, compression=DEFAULT_NDJSON_COMPRESSION):
+        """
+        Args:
+            compression (str): 'gzip' or 'zstd'
+        """
+        self.compression = compression
+
+    def write(self, data, output_file, report=None):
+        """
+        Save a response's records next to output_file.
+
+        Args:
+            data (dict): The API response ('fields' and 'data')
+            output_file (str): The collector's JSON path; .json becomes
+                               .ndjson.gz / .ndjson.zst
+            report (str): Unused; accepted for a common interface
+
+        Returns:
+            bool: True if the file was written, False otherwise
+        """
+        path = ndjson_path(output_file, self.compression)
+        try:
+            with NDJSONWriter(path, self.compression) as writer:
+                writer.write_page(data)
+        except (OSError, ValueError, ImportError) as e:
+            print(f"✗ Error saving data to NDJSON: {e}")
+            return False
+
+        file_size = path.stat().st_size
+        print(f"✓ Data saved to: {path} ({writer.records:,} records)")
+        print(f"  File size: {file_size:,} bytes ({file_size/1024:.2f} KB)")
+        return True
+
+
+def stream_to_ndjson(client, endpoint, parameters, output_file, compression=None, append=False, page_size=None,
+                     keep=None):
+    """
+    Stream a query's records straight into a compressed NDJSON file.
+
+    Rows are taken from ERCOTAPIClient.iter_records as they are decoded
+    and written immediately, so less than one page is ever held in memory.
+    If the query fails part way, nothing is written.
+
+    Args:
+        client (ERCOTAPIClient): Authenticated API client
+        endpoint (str): The API endpoint path
+        parameters (dict): Query parameters
+        output_file (str): Destination .ndjson.gz / .ndjson.zst file
+        compression (str): 'gzip' or 'zstd' (default: from the file suffix)
+        append (bool): Add to the file instead of replacing it
+        page_size (int): Records per page
+        keep (callable): Called with each record (a dict); records it
+                         returns False for are not written
+
+    Returns:
+        int: Records written, or None if the query or the write failed
+    """
+    try:
+        with NDJSONWriter(output_file, compression, append=append) as writer:
+            records = client.iter_records(endpoint, parameters, page_size=page_size, as_dict=True)
+            writer.write_records(record for record in records if keep is None or keep(record))
+    except ERCOTAPIError as e:
+        print(f"✗ Query failed: {e}")
+        return None
+    except (OSError, ValueError, ImportError) as e:
+        print(f"✗ Error saving data to NDJSON: {e}")
+        return None
+
+    if not Path(output_file).exists():
+        print(f"✓ No records to write to {output_file}")
+        return 0
+
+    file_size = Path(output_file).stat().st_size
+    print(f"✓ {writer.records:,} records {'appended' if append else 'saved'} to: {output_file}")
+    print(f"  File size: {file_size:,} bytes ({file_size/1024:.2f} KB)")
+    return writer.records
+
+
+def get_sink(output_format, client):
+    """
+    Create the sink for an output format.
+
+    Args:
+        output_format (str): 'json', 'ndjson' or 'parquet' (see OUTPUT_FORMATS)
+        client (ERCOTAPIClient): Client used by the JSON sink
+
+    Returns:
+        JSONSink, NDJSONSink or ParquetSink
+
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if output_format == 'json':
+        return JSONSink(client)
+    if output_format == 'ndjson':
+        return NDJSONSink()
+    if output_format == 'parquet':
+        return ParquetSink()
+    raise ValueError(f"Unknown output format '{output_format}' (choose from: {', '.join(OUTPUT_FORMATS)})")
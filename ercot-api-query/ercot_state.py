@@ -0,0 +1,607 @@
+#!/usr/bin/env python3
+"""
+ERCOT Collector State Store
+
+One SQLite database (state/ercot_state.db) shared by every poller and
+collector on this machine, in place of a JSON state file per endpoint.
+It holds:
+
+- watermarks: each job's poll state (watermark, last poll, posting time...)
+- seen_rows:  digests of the rows each feed received inside its overlap
+              window, one row per row timestamp (see ercot_incremental.SeenIndex)
+- runs:       a history of every poll, with its window, record count and outcome
+- chunks:     the status of each sub-window of a chunked query
+              (ERCOTAPIClient.query_time_range with job=..., via ChunkProgress)
+
+The database runs in WAL mode, so readers never block writers and many
+processes and threads can record progress at once. Every update is one
+transaction: a crash leaves the previous watermark in place, never a
+half-written file. A watermark and the run that produced it are committed
+together.
+
+Usage:
+    from ercot_state import open_state_store
+
+    store = open_state_store()
+    run_id = store.begin_run("rtm_lmp", "np6-788-cd/lmp_node_zone_hub")
+    ...
+    store.save_state("rtm_lmp", endpoint, {"watermark": ...}, run_id=run_id, records=120)
+
+    # Inspect from the command line
+    python3 ercot_state.py --runs 20
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+# Default database location (override with ERCOT_STATE_DB in .env)
+DEFAULT_STATE_DB = "state/ercot_state.db"
+
+# Seconds a writer waits for another process's transaction to finish
+BUSY_TIMEOUT_SECONDS = 30
+
+# Runs kept per job; older history is dropped as new runs finish
+RUN_HISTORY_LIMIT = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    job        TEXT PRIMARY KEY,
+    endpoint   TEXT,
+    state      TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    job         TEXT NOT NULL,
+    endpoint    TEXT,
+    pid         INTEGER,
+    status      TEXT NOT NULL,
+    started_at  TEXT NOT NULL,
+    finished_at TEXT,
+    window_from TEXT,
+    window_to   TEXT,
+    records     INTEGER,
+    message     TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_job ON runs (job, id);
+CREATE TABLE IF NOT EXISTS seen_rows (
+    job           TEXT NOT NULL,
+    row_timestamp TEXT NOT NULL,
+    digests       BLOB NOT NULL,
+    PRIMARY KEY (job, row_timestamp)
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    job         TEXT NOT NULL,
+    endpoint    TEXT NOT NULL,
+    window_from TEXT NOT NULL,
+    window_to   TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    records     INTEGER,
+    run_id      INTEGER,
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (job, endpoint, window_from, window_to)
+);
+"""
+
+# Open stores by database path, so every feed in a process shares one
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _pid_alive(pid):
+    """True if a process with this ID is running on this machine."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+class StateStore:
+    """
+    Watermarks, run history and chunk status in one SQLite database.
+
+    Each thread gets its own connection. Write transactions start with
+    BEGIN IMMEDIATE, so concurrent writers queue on the database lock
+    (waiting up to BUSY_TIMEOUT_SECONDS) instead of failing part-way.
+
+    Methods print an error and return None/False if the database cannot
+    be used, like the rest of the client.
+    """
+
+    def __init__(self, path=None):
+        """
+        Args:
+            path (str): Database file (default: ERCOT_STATE_DB or state/ercot_state.db)
+        """
+        self.path = Path(path or os.getenv('ERCOT_STATE_DB', DEFAULT_STATE_DB))
+        self._local = threading.local()
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connection(self):
+        """Return this thread's connection, opening it (and the schema) on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None: transactions are begun explicitly in transaction()
+            conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # FULL: a commit is on disk before it returns; polls commit only a few times each
+            conn.execute("PRAGMA synchronous=FULL")
+            with self._schema_lock:
+                if not self._schema_ready:
+                    conn.executescript(SCHEMA)
+                    self._schema_ready = True
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed statements as one atomic write.
+
+        Yields:
+            sqlite3.Connection: This thread's connection
+        """
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        try:
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self):
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # Watermarks
+
+    def get_state(self, job):
+        """
+        Read a job's poll state.
+
+        Args:
+            job (str): Job or feed name
+
+        Returns:
+            dict: The state saved by save_state(), or None if there is none
+                  (first run) or the database cannot be read
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT state FROM watermarks WHERE job = ?", (job,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"✗ Could not read state for {job} from {self.path}: {e}")
+            return None
+        return json.loads(row['state']) if row else None
+
+    def get_seen(self, job):
+        """
+        Read a job's seen-row digests.
+
+        Args:
+            job (str): Job or feed name
+
+        Returns:
+            dict: {row timestamp: packed digests (bytes)}; empty if there are
+                  none or the database cannot be read
+        """
+        try:
+            rows = self._connection().execute(
+                "SELECT row_timestamp, digests FROM seen_rows WHERE job = ?", (job,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"✗ Could not read seen rows for {job} from {self.path}: {e}")
+            return {}
+        return {row['row_timestamp']: bytes(row['digests']) for row in rows}
+
+    def save_state(self, job, endpoint, state, run_id=None, records=None, window=None,
+                   seen_rows=None, seen_from=None):
+        """
+        Replace a job's poll state, and finish its run, in one transaction.
+
+        Seen-row digests are updated in the same transaction, so they
+        always match the watermark. Only the timestamps that changed are
+        written, and timestamps before seen_from are deleted, so the table
+        never holds more than the overlap window.
+
+        Args:
+            job (str): Job or feed name
+            endpoint (str): The endpoint the state belongs to
+            state (dict): JSON-serialisable state
+            run_id (int): Run from begin_run() to mark succeeded (optional)
+            records (int): Records retrieved by the run
+            window (tuple): (from, to) the run queried
+            seen_rows (dict): {row timestamp: packed digests} to write
+            seen_from (str): Delete seen rows with an earlier timestamp
+
+        Returns:
+            bool: True if the state was saved, False otherwise
+        """
+        try:
+            with self.transaction() as conn:
+                conn.execute(
+                    "INSERT INTO watermarks (job, endpoint, state, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (job) DO UPDATE SET endpoint = excluded.endpoint, "
+                    "state = excluded.state, updated_at = excluded.updated_at",
+                    (job, endpoint, json.dumps(state), _now()))
+                if seen_from is not None:
+                    conn.execute("DELETE FROM seen_rows WHERE job = ? AND row_timestamp < ?", (job, seen_from))
+                if seen_rows:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO seen_rows (job, row_timestamp, digests) VALUES (?, ?, ?)",
+                        [(job, timestamp, digests) for timestamp, digests in seen_rows.items()])
+                if run_id is not None:
+                    self._finish_run(conn, run_id, 'succeeded', records, window)
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(f"✗ Could not save state for {job} to {self.path}: {e}")
+            return False
+
+    def delete_state(self, job):
+        """
+        Forget a job's poll state (and seen rows), so its next poll is a first run.
+
+        Returns:
+            bool: True if there was state to delete
+        """
+        try:
+            with self.transaction() as conn:
+                conn.execute("DELETE FROM seen_rows WHERE job = ?", (job,))
+                return conn.execute("DELETE FROM watermarks WHERE job = ?", (job,)).rowcount > 0
+        except sqlite3.Error as e:
+            print(f"✗ Could not delete state for {job} from {self.path}: {e}")
+            return False
+
+    def import_state_file(self, job, endpoint, state_file):
+        """
+        Move a job's old JSON state file into the database.
+
+        Nothing happens if the job already has state here. After a
+        successful import the file is renamed to <name>.imported, so it is
+        not imported again after a reset.
+
+        Args:
+            job (str): Job or feed name
+            endpoint (str): The endpoint the state belongs to
+            state_file (Path): The JSON state file
+
+        Returns:
+            dict: The imported state, or None if there was nothing to import
+        """
+        state_file = Path(state_file)
+        if not state_file.exists() or self.get_state(job) is not None:
+            return None
+        try:
+            with open(state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠ Warning: Could not read state file {state_file}: {e}")
+            return None
+        if not isinstance(state, dict) or not self.save_state(job, endpoint, state):
+            return None
+        state_file.replace(state_file.with_name(state_file.name + '.imported'))
+        print(f"✓ Imported {state_file} into {self.path}")
+        return state
+
+    def list_states(self):
+        """
+        Returns:
+            list: (job, endpoint, state dict, updated_at) for every job
+        """
+        try:
+            rows = self._connection().execute(
+                "SELECT job, endpoint, state, updated_at FROM watermarks ORDER BY job").fetchall()
+        except sqlite3.Error as e:
+            print(f"✗ Could not read {self.path}: {e}")
+            return []
+        return [(row['job'], row['endpoint'], json.loads(row['state']), row['updated_at']) for row in rows]
+
+    # Run history
+
+    def begin_run(self, job, endpoint=None):
+        """
+        Record the start of a run.
+
+        Earlier runs of the job still marked running whose process has
+        gone (a crash or kill) are marked interrupted, along with their
+        unfinished chunks.
+
+        Args:
+            job (str): Job or feed name
+            endpoint (str): The endpoint being polled
+
+        Returns:
+            int: Run ID for end_run()/save_state(), or None if it could not be recorded
+        """
+        try:
+            with self.transaction() as conn:
+                stale = [row['id'] for row in conn.execute(
+                    "SELECT id, pid FROM runs WHERE job = ? AND status = 'running'", (job,))
+                    if row['pid'] != os.getpid() and not _pid_alive(row['pid'])]
+                for run_id in stale:
+                    conn.execute("UPDATE runs SET status = 'interrupted', finished_at = ? WHERE id = ?",
+                                 (_now(), run_id))
+                    conn.execute("UPDATE chunks SET status = 'interrupted', updated_at = ? "
+                                 "WHERE run_id = ? AND status IN ('pending', 'running')", (_now(), run_id))
+                return conn.execute(
+                    "INSERT INTO runs (job, endpoint, pid, status, started_at) VALUES (?, ?, ?, 'running', ?)",
+                    (job, endpoint, os.getpid(), _now())).lastrowid
+        except sqlite3.Error as e:
+            print(f"⚠ Warning: Could not record run start in {self.path}: {e}")
+            return None
+
+    def end_run(self, run_id, status, records=None, window=None, message=None):
+        """
+        Record how a run ended. A run that has already ended is left alone.
+
+        Args:
+            run_id (int): Run ID from begin_run() (None is ignored)
+            status (str): 'succeeded' or 'failed'
+            records (int): Records retrieved
+            window (tuple): (from, to) the run queried
+            message (str): Error or note
+
+        Returns:
+            bool: True if recorded
+        """
+        if run_id is None:
+            return False
+        try:
+            with self.transaction() as conn:
+                self._finish_run(conn, run_id, status, records, window, message)
+            return True
+        except sqlite3.Error as e:
+            print(f"⚠ Warning: Could not record run end in {self.path}: {e}")
+            return False
+
+    @staticmethod
+    def _finish_run(conn, run_id, status, records=None, window=None, message=None):
+        """Close a running run and trim its job's history (inside a transaction)."""
+        window_from, window_to = window or (None, None)
+        updated = conn.execute(
+            "UPDATE runs SET status = ?, finished_at = ?, records = ?, window_from = ?, window_to = ?, "
+            "message = ? WHERE id = ? AND status = 'running'",
+            (status, _now(), records, window_from, window_to, message, run_id)).rowcount
+        if updated:
+            conn.execute(
+                "DELETE FROM runs WHERE job = (SELECT job FROM runs WHERE id = ?) AND id <= "
+                "(SELECT id FROM runs WHERE job = (SELECT job FROM runs WHERE id = ?) "
+                "ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (run_id, run_id, RUN_HISTORY_LIMIT))
+
+    def recent_runs(self, job=None, limit=10):
+        """
+        Args:
+            job (str): Only this job's runs (default: all jobs)
+            limit (int): Most recent runs to return
+
+        Returns:
+            list: Run dicts, newest first
+        """
+        query, parameters = "SELECT * FROM runs", ()
+        if job:
+            query, parameters = query + " WHERE job = ?", (job,)
+        try:
+            rows = self._connection().execute(query + " ORDER BY id DESC LIMIT ?",
+                                              parameters + (limit,)).fetchall()
+        except sqlite3.Error as e:
+            print(f"✗ Could not read {self.path}: {e}")
+            return []
+        return [dict(row) for row in rows]
+
+    # Chunk status
+
+    def plan_chunks(self, job, endpoint, windows, run_id=None):
+        """
+        Record the sub-windows of a chunked query as pending.
+
+        Args:
+            job (str): Job name
+            endpoint (str): The API endpoint path
+            windows (list): (from, to) pairs
+            run_id (int): The run they belong to
+
+        Returns:
+            bool: True if recorded
+        """
+        try:
+            with self.transaction() as conn:
+                conn.executemany(
+                    "INSERT INTO chunks (job, endpoint, window_from, window_to, status, run_id, updated_at) "
+                    "VALUES (?, ?, ?, ?, 'pending', ?, ?) ON CONFLICT (job, endpoint, window_from, window_to) "
+                    "DO UPDATE SET status = 'pending', attempts = 0, records = NULL, "
+                    "run_id = excluded.run_id, updated_at = excluded.updated_at",
+                    [(job, endpoint, window_from, window_to, run_id, _now()) for window_from, window_to in windows])
+            return True
+        except sqlite3.Error as e:
+            print(f"⚠ Warning: Could not record chunks in {self.path}: {e}")
+            return False
+
+    def update_chunk(self, job, endpoint, window, status, records=None):
+        """
+        Record a sub-window's progress: 'running' (counts an attempt), 'done' or 'failed'.
+
+        Returns:
+            bool: True if recorded
+        """
+        window_from, window_to = window
+        try:
+            with self.transaction() as conn:
+                conn.execute(
+                    "UPDATE chunks SET status = ?, records = ?, updated_at = ?, "
+                    "attempts = attempts + (? = 'running') "
+                    "WHERE job = ? AND endpoint = ? AND window_from = ? AND window_to = ?",
+                    (status, records, _now(), status, job, endpoint, window_from, window_to))
+            return True
+        except sqlite3.Error as e:
+            print(f"⚠ Warning: Could not record chunk status in {self.path}: {e}")
+            return False
+
+    def chunks(self, job, status=None):
+        """
+        Args:
+            job (str): Job name
+            status (str): Only chunks with this status
+
+        Returns:
+            list: Chunk dicts in window order
+        """
+        query, parameters = "SELECT * FROM chunks WHERE job = ?", (job,)
+        if status:
+            query, parameters = query + " AND status = ?", parameters + (status,)
+        try:
+            rows = self._connection().execute(query + " ORDER BY endpoint, window_from", parameters).fetchall()
+        except sqlite3.Error as e:
+            print(f"✗ Could not read {self.path}: {e}")
+            return []
+        return [dict(row) for row in rows]
+
+    def unfinished_chunks(self):
+        """
+        Returns:
+            list: Chunk dicts not yet done (pending, running, failed or interrupted)
+        """
+        try:
+            rows = self._connection().execute(
+                "SELECT * FROM chunks WHERE status != 'done' ORDER BY job, endpoint, window_from").fetchall()
+        except sqlite3.Error as e:
+            print(f"✗ Could not read {self.path}: {e}")
+            return []
+        return [dict(row) for row in rows]
+
+
+class ChunkProgress:
+    """
+    One chunked query's run and sub-window status, as it happens.
+
+    Used by ERCOTAPIClient.query_time_range(job=...). Sub-windows are
+    recorded as pending up front, then running, done or failed as each
+    finishes, so the database shows what a query still in flight (or one
+    that crashed) has and has not fetched.
+    """
+
+    def __init__(self, job, endpoint, spans, store=None):
+        """
+        Args:
+            job (str): Job name
+            endpoint (str): The API endpoint path
+            spans (list): (from, to) of each sub-window, in order
+            store (StateStore): Database to record in (default: the shared one)
+        """
+        self.job = job
+        self.endpoint = endpoint
+        self.spans = spans
+        self.store = store or open_state_store()
+        self.run_id = self.store.begin_run(job, endpoint)
+        self.store.plan_chunks(job, endpoint, spans, self.run_id)
+
+    def start(self, index):
+        """Mark sub-window index as being fetched (counts an attempt)."""
+        self.store.update_chunk(self.job, self.endpoint, self.spans[index], 'running')
+
+    def record(self, index, result):
+        """Mark sub-window index done (with its record count), or failed if result is None."""
+        if result is None:
+            self.store.update_chunk(self.job, self.endpoint, self.spans[index], 'failed')
+        else:
+            self.store.update_chunk(self.job, self.endpoint, self.spans[index], 'done',
+                                    len(result.get('data', [])) if isinstance(result, dict) else None)
+
+    def finish(self, results):
+        """
+        Close the run.
+
+        Args:
+            results (list): Each sub-window's response (None if it failed)
+        """
+        failed = sum(result is None for result in results)
+        records = sum(len(result.get('data', [])) for result in results if isinstance(result, dict))
+        window = (self.spans[0][0], self.spans[-1][1])
+        if failed:
+            self.store.end_run(self.run_id, 'failed', records, window,
+                               f"{failed} of {len(results)} sub-windows failed")
+        else:
+            self.store.end_run(self.run_id, 'succeeded', records, window)
+
+
+def open_state_store(path=None):
+    """
+    Return the shared StateStore for a database, creating it on first use.
+
+    Args:
+        path (str): Database file (default: ERCOT_STATE_DB or state/ercot_state.db)
+
+    Returns:
+        StateStore: One instance per database path in this process
+    """
+    path = str(path or os.getenv('ERCOT_STATE_DB', DEFAULT_STATE_DB))
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = StateStore(path)
+        return _stores[path]
+
+
+def main():
+    """Print the watermarks, recent runs and unfinished chunks."""
+    parser = argparse.ArgumentParser(description='Show the collectors\' shared state database')
+    parser.add_argument('--db', default=None, help=f'Database file (default: {DEFAULT_STATE_DB})')
+    parser.add_argument('--job', default=None, help='Only show this job\'s runs')
+    parser.add_argument('--runs', type=int, default=10, help='Recent runs to show (default: 10)')
+    args = parser.parse_args()
+
+    store = open_state_store(args.db)
+    if not store.path.exists():
+        print(f"No state database at {store.path}")
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"Watermarks ({store.path})")
+    print("=" * 60)
+    for job, endpoint, state, updated_at in store.list_states():
+        watermark = state.get('watermark') or state.get('last_timestamp')
+        print(f"  {job:<20} {endpoint or '':<40} {watermark}  (updated {updated_at})")
+
+    print(f"\nRecent runs{' of ' + args.job if args.job else ''}:")
+    for run in store.recent_runs(args.job, args.runs):
+        window = f"{run['window_from']} to {run['window_to']}" if run['window_from'] else ''
+        records = '' if run['records'] is None else f"{run['records']} records"
+        print(f"  #{run['id']:<6} {run['started_at']}  {run['job']:<20} {run['status']:<11} "
+              f"{records:<14} {window} {run['message'] or ''}".rstrip())
+
+    unfinished = store.unfinished_chunks()
+    if unfinished:
+        print("\nUnfinished chunks:")
+        for chunk in unfinished:
+            print(f"  {chunk['job']:<20} {chunk['endpoint']:<40} {chunk['window_from']} to "
+                  f"{chunk['window_to']}  {chunk['status']} (attempts: {chunk['attempts']})")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
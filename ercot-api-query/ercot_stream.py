@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+ERCOT Streaming JSON Reader
+
+Decodes a large API response while it is still arriving, one record at a
+time, instead of loading the whole body and then parsing it.
+ERCOTAPIClient.iter_records() reads every page through it, and
+query_columnar() builds its columns from iter_records(), so memory use
+stays flat however many rows a page holds.
+
+Usage:
+    from ercot_stream import iter_json_array_items
+
+    # text_chunks: the response body as str chunks (see ERCOTAPIClient._iter_text)
+    header = {}
+    for row in iter_json_array_items(text_chunks, 'data', header):
+        ...
+    # header now holds 'fields', '_meta' and the other top-level values
+"""
+
+import json
+
+
+class _JSONStreamReader:
+    """
+    Minimal incremental reader over JSON text that arrives in chunks.
+
+    Individual values are decoded with the standard json decoder as soon
+    as they are complete, so only the unread part of the current chunk
+    and the value being decoded are ever held in memory.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _read_more(self):
+        """Append the next chunk to the buffer. Returns False at end of stream."""
+        if self._eof:
+            return False
+        for chunk in self._chunks:
+            if chunk:
+                # Drop what has already been consumed before growing the buffer
+                self._buffer = self._buffer[self._pos:] + chunk
+                self._pos = 0
+                return True
+        self._eof = True
+        return False
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it ('' at end)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in ' \t\r\n':
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read_more():
+                return ''
+
+    def expect(self, char):
+        """Consume the next non-whitespace character, which must be `char`."""
+        if self.peek() != char:
+            raise ValueError(f"Malformed JSON in response stream: expected '{char}'")
+        self._pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                value, end = None, None
+
+            # A value that ends exactly at the buffer edge may be cut short
+            # (e.g. a number), so only trust it once more text has arrived
+            if end is not None and (end < len(self._buffer) or self._eof):
+                self._pos = end
+                return value
+
+            if not self._read_more():
+                if end is not None:
+                    self._pos = end
+                    return value
+                raise ValueError("Truncated JSON in response stream")
+
+
+def iter_json_array_items(chunks, key, header):
+    """
+    Yield the items of one top-level array in a streamed JSON object.
+
+    Every other top-level value (e.g. 'fields', '_meta') is decoded whole
+    and stored in `header`, which is complete once the generator finishes.
+    Values that precede the array are available as soon as the first item
+    is yielded.
+
+    Args:
+        chunks (iterable): The response body as text chunks
+        key (str): Name of the array to stream (e.g. 'data')
+        header (dict): Filled with the object's other top-level values
+
+    Yields:
+        object: Each decoded array item, in order
+    """
+    reader = _JSONStreamReader(chunks)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+
+    while True:
+        name = reader.value()
+        reader.expect(':')
+
+        if name == key and reader.peek() == '[':
+            reader.expect('[')
+            if reader.peek() == ']':
+                reader.expect(']')
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.peek() != ',':
+                        break
+                    reader.expect(',')
+                reader.expect(']')
+        else:
+            header[name] = reader.value()
+
+        if reader.peek() != ',':
+            break
+        reader.expect(',')
+
+    reader.expect('}')
@@ -114,7 +114,8 @@ def collect_data(debug=False):
     print(f"Parameters: {parameters}")
     print()
 
-    response_data = client.query_api(endpoint, parameters)
+    # paginate=True fetches every page so the day is never truncated
+    response_data = client.query_api(endpoint, parameters, paginate=True)
 
     if response_data is None:
         print("✗ Query failed")
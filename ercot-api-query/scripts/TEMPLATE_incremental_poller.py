@@ -5,36 +5,50 @@ TEMPLATE - Incremental Poller
 This is a template for creating new incremental polling scripts.
 Copy this file and modify it for your specific endpoint.
 
+For a plain incremental feed, add an entry to incremental_poller.py's feed
+list instead: all feeds then share one process, client and login.
+
 Usage:
     1. Copy this file: cp TEMPLATE_incremental_poller.py incremental_your_endpoint.py
-    2. Update ENDPOINT, STATE_FILE, and OUTPUT_DIR_BASE
-    3. Adjust parameter names if needed (deliveryDate vs SCEDTimestamp)
+    2. Update FEED_NAME, ENDPOINT, PARAMETER_TYPE and OUTPUT_DIR_BASE
+    3. Add any fixed query parameters to PARAMETERS
     4. Test it: python3 scripts/incremental_your_endpoint.py --debug
     5. Add to cron if needed
 
 Example cron entry (runs every 15 minutes):
     */15 * * * * cd /path/to/ercot-api-query && python3 scripts/incremental_your_endpoint.py
+
+How It Works (see ercot_incremental.Feed):
+    0. Checks the report's lastPostDatetime (one small metadata request);
+       if nothing was posted since the last poll, stops there
+    1. Reads the watermark (latest row timestamp received) from the state
+       database (state/ercot_state.db, see ercot_state)
+    2. Queries from a short overlap before the watermark to now, so rows
+       published late are still picked up
+    3. Drops rows already received (see ercot_incremental.SeenIndex) and
+       saves the new ones
+    4. Saves the new watermark and records the run, in one transaction
 """
 
-import os
 import sys
-import json
 import argparse
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 # Add parent directory to path to import ercot_query module
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ercot_query import ERCOTAPIClient
+from ercot_incremental import Feed
+from ercot_sinks import OUTPUT_FORMATS
 
 
 # TODO: Update these configuration values for your endpoint
 # ==========================================================
 
-# State file location (make it unique per endpoint)
-STATE_DIR = Path("state")
-STATE_FILE = STATE_DIR / "incremental_YOUR_ENDPOINT_state.json"
+# Name this poller's watermark and run history are kept under in the
+# shared state database, state/ercot_state.db (make it unique per endpoint)
+FEED_NAME = "your_endpoint"
 
 # Your ERCOT API endpoint
 ENDPOINT = "np6-xxx-cd/your_endpoint"
@@ -45,109 +59,34 @@ OUTPUT_DIR_BASE = Path("output/incremental/your_endpoint")
 # Poll interval (minutes) - how often the script runs
 POLL_INTERVAL_MINUTES = 15
 
-# Parameter type: "SCED" for SCEDTimestamp or "DAM" for deliveryDate
-PARAMETER_TYPE = "SCED"  # or "DAM"
-
-# ==========================================================
-
-
-def ensure_directories():
-    """Create necessary directories if they don't exist."""
-    STATE_DIR.mkdir(parents=True, exist_ok=True)
-    OUTPUT_DIR_BASE.mkdir(parents=True, exist_ok=True)
-
-
-def read_state():
-    """
-    Read the last successful poll state.
-
-    Returns:
-        dict: State containing last_timestamp and other metadata
-              Returns None if state file doesn't exist (first run)
-    """
-    if not STATE_FILE.exists():
-        return None
-
-    try:
-        with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
-        return state
-    except Exception as e:
-        print(f"⚠ Warning: Could not read state file: {e}")
-        return None
-
-
-def write_state(timestamp_to, records_retrieved):
-    """
-    Write the current state after successful poll.
-
-    Args:
-        timestamp_to (str): The latest timestamp successfully retrieved
-        records_retrieved (int): Number of records retrieved in this poll
-    """
-    state = {
-        "last_timestamp": timestamp_to,
-        "last_poll_time": datetime.now().isoformat(),
-        "last_records_retrieved": records_retrieved,
-        "endpoint": ENDPOINT
-    }
-
-    try:
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f, indent=2)
-        return True
-    except Exception as e:
-        print(f"✗ Error writing state file: {e}")
-        return False
-
-
-def calculate_time_range(last_state, debug=False):
-    """
-    Calculate the time range to query based on last state.
-
-    Args:
-        last_state (dict): Previous state, or None for first run
-        debug (bool): Enable debug output
+# Parameter type: "SCED" (SCEDTimestamp), "DAM" (deliveryDate) or "ARCHIVE" (postDatetime)
+PARAMETER_TYPE = "SCED"
 
-    Returns:
-        tuple: (timestamp_from, timestamp_to) as appropriate format strings
-    """
-    now = datetime.now()
+# Fixed query parameters added to every poll (e.g. {"settlementPoint": "HB_NORTH"})
+PARAMETERS = {}
 
-    if last_state is None:
-        # First run - get last N minutes
-        timestamp_from = (now - timedelta(minutes=POLL_INTERVAL_MINUTES)).replace(microsecond=0)
-        if debug:
-            print(f"[DEBUG] First run - querying last {POLL_INTERVAL_MINUTES} minutes")
-    else:
-        # Incremental - start from 1 second after last timestamp
-        last_timestamp = datetime.fromisoformat(last_state['last_timestamp'])
-        timestamp_from = last_timestamp + timedelta(seconds=1)
-        if debug:
-            print(f"[DEBUG] Incremental run - last poll was at {last_state['last_timestamp']}")
-            print(f"[DEBUG] Last poll retrieved {last_state.get('last_records_retrieved', 'unknown')} records")
+# Days past today to query, for reports posted ahead of time (e.g. 1 for DAM)
+LOOKAHEAD_DAYS = 0
 
-    timestamp_to = now.replace(microsecond=0)
+# ==========================================================
 
-    # Format based on parameter type
-    if PARAMETER_TYPE == "SCED":
-        # Real-time endpoints use: YYYY-MM-DDTHH:MM:SS
-        timestamp_from_str = timestamp_from.strftime('%Y-%m-%dT%H:%M:%S')
-        timestamp_to_str = timestamp_to.strftime('%Y-%m-%dT%H:%M:%S')
-    else:  # DAM
-        # Day-ahead endpoints use: YYYY-MM-DD
-        timestamp_from_str = timestamp_from.strftime('%Y-%m-%d')
-        timestamp_to_str = timestamp_to.strftime('%Y-%m-%d')
 
-    return timestamp_from_str, timestamp_to_str
+def make_feed(output_format='json'):
+    """Describe this poller as a feed of the incremental engine (see ercot_incremental)."""
+    return Feed(FEED_NAME, ENDPOINT, parameter_type=PARAMETER_TYPE,
+                interval_minutes=POLL_INTERVAL_MINUTES, parameters=PARAMETERS,
+                output_format=output_format, output_dir=OUTPUT_DIR_BASE,
+                file_prefix="data", lookahead_days=LOOKAHEAD_DAYS)
 
 
-def poll_incremental(debug=False):
+def poll_incremental(debug=False, client=None, output_format='json'):
     """
     Poll the API for new data since last successful poll.
 
     Args:
         debug (bool): Enable debug output
+        client (ERCOTAPIClient): Authenticated client to use (default: create one)
+        output_format (str): 'json' (default), 'ndjson' or 'parquet' (see ercot_sinks)
 
     Returns:
         bool: True if successful, False otherwise
@@ -156,104 +95,31 @@ def poll_incremental(debug=False):
     print(f"Incremental Poller: {ENDPOINT}")  # TODO: Update display name
     print("=" * 60)
 
-    ensure_directories()
+    feed = make_feed(output_format)
 
     # Read last state
-    last_state = read_state()
+    last_state = feed.read_state()
 
     if last_state is None:
         print(f"First run detected - will retrieve last {POLL_INTERVAL_MINUTES} minutes")
     else:
         last_poll = datetime.fromisoformat(last_state['last_poll_time'])
         print(f"Last successful poll: {last_poll.strftime('%Y-%m-%d %H:%M:%S')}")
-
-    # Calculate time range for this query
-    timestamp_from, timestamp_to = calculate_time_range(last_state, debug)
-
-    print(f"Querying new data from: {timestamp_from}")
-    print(f"                    to: {timestamp_to}")
     print()
 
-    # Check if there's actually a time gap to query
-    from_dt = datetime.fromisoformat(timestamp_from.replace('T', ' ')) if 'T' in timestamp_from else datetime.strptime(timestamp_from, '%Y-%m-%d')
-    to_dt = datetime.fromisoformat(timestamp_to.replace('T', ' ')) if 'T' in timestamp_to else datetime.strptime(timestamp_to, '%Y-%m-%d')
-
-    if from_dt >= to_dt:
-        print("⚠ No new time range to query (already up to date)")
-        return True
+    # Initialize ERCOT API client, unless a shared one was passed in
+    # (collector_daemon.py runs every job on one client)
+    if client is None:
+        client = ERCOTAPIClient(debug=debug)
 
-    # Initialize ERCOT API client
-    client = ERCOTAPIClient(debug=debug)
+        # Authenticate
+        if not client.authenticate():
+            print("✗ Authentication failed")
+            return False
 
-    # Authenticate
-    if not client.authenticate():
-        print("✗ Authentication failed")
+    if not feed.poll(client, debug):
         return False
 
-    # TODO: Define API parameters based on your endpoint
-    if PARAMETER_TYPE == "SCED":
-        parameters = {
-            "SCEDTimestampFrom": timestamp_from,
-            "SCEDTimestampTo": timestamp_to
-            # TODO: Add any additional parameters your endpoint needs
-        }
-    else:  # DAM
-        parameters = {
-            "deliveryDateFrom": timestamp_from,
-            "deliveryDateTo": timestamp_to
-            # TODO: Add any additional parameters your endpoint needs
-        }
-
-    # Query the API
-    print(f"Querying endpoint: {ENDPOINT}")
-    if debug:
-        print(f"Parameters: {parameters}")
-    print()
-
-    response_data = client.query_api(ENDPOINT, parameters)
-
-    if response_data is None:
-        print("✗ Query failed - state not updated")
-        return False
-
-    # Count records retrieved
-    records_count = 0
-    if isinstance(response_data, dict):
-        if 'data' in response_data:
-            records_count = len(response_data['data'])
-        elif '_meta' in response_data and 'totalRecords' in response_data['_meta']:
-            records_count = response_data['_meta']['totalRecords']
-        elif 'report' in response_data:
-            records_count = len(response_data.get('report', {}).get('data', []))
-
-    print(f"✓ Retrieved {records_count} new records")
-
-    # Generate output filename with timestamp range
-    from_str = from_dt.strftime('%Y%m%d_%H%M%S')
-    to_str = to_dt.strftime('%Y%m%d_%H%M%S')
-
-    # Organize by date and hour (or just date for DAM)
-    date_str = to_dt.strftime('%Y-%m-%d')
-    if PARAMETER_TYPE == "SCED":
-        hour_str = to_dt.strftime('%H')
-        output_dir = OUTPUT_DIR_BASE / date_str / hour_str
-    else:
-        output_dir = OUTPUT_DIR_BASE / date_str
-
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    # TODO: Update output filename prefix
-    output_file = output_dir / f"data_{from_str}_to_{to_str}.json"
-
-    # Save the response
-    client.save_response(response_data, str(output_file))
-
-    # Update state file with latest timestamp
-    if write_state(timestamp_to, records_count):
-        print("✓ State updated successfully")
-    else:
-        print("⚠ Warning: Data saved but state update failed")
-
     print()
     print("=" * 60)
     print("✓ Incremental poll completed successfully!")
@@ -268,15 +134,18 @@ def show_status():
     print("Incremental Poller Status")
     print("=" * 60)
 
-    state = read_state()
+    feed = make_feed()
+    state = feed.read_state()
 
     if state is None:
-        print("Status: Never run (no state file)")
+        print("Status: Never run (no saved state)")
         print(f"Next run will retrieve last {POLL_INTERVAL_MINUTES} minutes of data")
     else:
         print(f"Endpoint: {state['endpoint']}")
         print(f"Last Poll: {state['last_poll_time']}")
         print(f"Last Timestamp Retrieved: {state['last_timestamp']}")
+        if state.get('watermark'):
+            print(f"Watermark (latest {feed.timestamp_field}): {state['watermark']}")
         print(f"Records in Last Poll: {state.get('last_records_retrieved', 'unknown')}")
 
         last_poll = datetime.fromisoformat(state['last_poll_time'])
@@ -284,21 +153,27 @@ def show_status():
         print(f"Time Since Last Poll: {time_since}")
 
         # Calculate what will be queried next
-        timestamp_from, timestamp_to = calculate_time_range(state)
+        timestamp_from, timestamp_to = feed.calculate_time_range(state)
         print(f"\nNext poll will query:")
         print(f"  From: {timestamp_from}")
         print(f"  To:   {timestamp_to}")
 
+    runs = feed.state_store.recent_runs(feed.name, limit=5)
+    if runs:
+        print("\nRecent Runs:")
+        for run in runs:
+            records = '' if run['records'] is None else f"{run['records']} records"
+            print(f"  {run['started_at']}  {run['status']:<11} {records} {run['message'] or ''}".rstrip())
+
     print("=" * 60)
 
 
 def reset_state():
-    """Reset the state file (useful for testing or recovery)."""
-    if STATE_FILE.exists():
-        STATE_FILE.unlink()
-        print("✓ State file deleted")
+    """Reset the saved state (useful for testing or recovery)."""
+    if make_feed().reset_state():
+        print("✓ State deleted")
     else:
-        print("No state file to delete")
+        print("No state to delete")
 
 
 def main():
@@ -323,8 +198,8 @@ Examples:
 Cron Setup (every {POLL_INTERVAL_MINUTES} minutes):
   */{POLL_INTERVAL_MINUTES} * * * * cd /path/to/ercot-api-query && python3 scripts/incremental_your_endpoint.py
 
-State File Location:
-  {STATE_FILE}
+State Location:
+  state/ercot_state.db (feed "{FEED_NAME}"; inspect with python3 ercot_state.py --job {FEED_NAME})
 
 Output Location:
   {OUTPUT_DIR_BASE}/YYYY-MM-DD/HH/data_YYYYMMDD_HHMMSS_to_YYYYMMDD_HHMMSS.json
@@ -337,6 +212,14 @@ Output Location:
         help='Enable debug output'
     )
 
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='json',
+        help='Output format: json (default), ndjson (compressed, one record per line) '
+             'or parquet (partitioned by report/date/hour)'
+    )
+
     parser.add_argument(
         '--status',
         action='store_true',
@@ -346,7 +229,7 @@ Output Location:
     parser.add_argument(
         '--reset',
         action='store_true',
-        help='Reset state file (next run will be like first run)'
+        help='Reset state (next run will be like first run)'
     )
 
     args = parser.parse_args()
@@ -361,7 +244,7 @@ Output Location:
         sys.exit(0)
 
     # Run incremental poll
-    success = poll_incremental(debug=args.debug)
+    success = poll_incremental(debug=args.debug, output_format=args.format)
 
     # Exit with appropriate code
     sys.exit(0 if success else 1)
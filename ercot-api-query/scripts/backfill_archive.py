@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Archive Backfill
+
+Downloads a report's archived zip files for a range of posting dates, for
+backfilling history that would take far too long through row-level queries.
+Files already downloaded are skipped and interrupted downloads resume, so
+the script can be re-run (or scheduled) until the backfill is complete.
+
+Usage:
+    python3 scripts/backfill_archive.py --report REPORT_ID --from YYYY-MM-DD --to YYYY-MM-DD [--bundles] [--debug]
+
+Example:
+    python3 scripts/backfill_archive.py --report np6-905-cd --from 2024-01-01 --to 2024-12-31
+"""
+
+import sys
+import argparse
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import ercot_query module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ercot_query import ERCOTAPIClient
+from ercot_archive import ArchiveDownloader
+
+
+def backfill(report_id, date_from, date_to, output_dir, bundles=False, workers=None, limit=None,
+             list_only=False, debug=False):
+    """
+    Download every archived document posted between two dates.
+
+    Args:
+        report_id (str): Report ID, e.g. 'np6-905-cd'
+        date_from (str): First posting date (YYYY-MM-DD)
+        date_to (str): Last posting date (YYYY-MM-DD), inclusive
+        output_dir (str): Root folder for the downloaded files
+        bundles (bool): Download bundles instead of individual documents
+        workers (int): Documents downloaded concurrently
+        limit (int): Maximum number of documents to download this run
+        list_only (bool): Only list the documents
+        debug (bool): Enable debug output
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    post_from = f"{date_from}T00:00:00"
+    post_to = f"{date_to}T23:59:59"
+
+    print("=" * 60)
+    print("ERCOT Archive Backfill")
+    print("=" * 60)
+    print(f"Report: {report_id} ({'bundles' if bundles else 'documents'})")
+    print(f"Posted: {post_from} to {post_to}")
+    print()
+
+    # Initialize ERCOT API client
+    client = ERCOTAPIClient(debug=debug, max_workers=workers)
+
+    # Authenticate
+    if not client.authenticate():
+        print("✗ Authentication failed")
+        return False
+
+    downloader = ArchiveDownloader(client, report_id, output_dir, bundles=bundles)
+    if downloader.download_limit:
+        print(f"Download limit: {downloader.download_limit} documents per run")
+
+    if list_only:
+        documents = downloader.list_documents(post_from, post_to)
+        if documents is None:
+            return False
+        for document in documents:
+            print(f"  {document.get('postDatetime')}  {document.get('docId')}  {document.get('friendlyName')}")
+        return True
+
+    summary = downloader.download(post_from, post_to, limit=limit)
+    if summary is None or summary["failed"]:
+        return False
+
+    print()
+    print("=" * 60)
+    if summary["remaining"]:
+        print(f"✓ Run completed; {summary['remaining']:,} documents left for the next run")
+    else:
+        print("✓ Backfill completed successfully!")
+    print("=" * 60)
+
+    return True
+
+
+def main():
+    """Main function to parse arguments and run the backfill."""
+    yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+
+    parser = argparse.ArgumentParser(
+        description='Download archived ERCOT report files for a range of posting dates',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Backfill a year of 15-minute settlement point prices
+  python3 scripts/backfill_archive.py --report np6-905-cd --from 2024-01-01 --to 2024-12-31
+
+  # Download bundles (many postings per zip) instead of single documents
+  python3 scripts/backfill_archive.py --report np6-905-cd --from 2024-01-01 --to 2024-12-31 --bundles
+
+  # See what would be downloaded
+  python3 scripts/backfill_archive.py --report np4-190-cd --from 2025-01-01 --list
+
+Note:
+  Files are saved to OUTPUT_DIR/<report>/YYYY/MM/. Each run downloads at
+  most the report's downloadLimit documents (from
+  discovered_endpoints_detailed.json); run it again to continue.
+        """
+    )
+
+    parser.add_argument('--report', required=True, help='Report ID, e.g. np6-905-cd')
+    parser.add_argument('--from', dest='date_from', required=True, help='First posting date (YYYY-MM-DD)')
+    parser.add_argument('--to', dest='date_to', default=yesterday, help='Last posting date (default: yesterday)')
+    parser.add_argument('--output-dir', default='output/archive', help='Root output folder (default: output/archive)')
+    parser.add_argument('--bundles', action='store_true', help='Download bundles instead of individual documents')
+    parser.add_argument('--workers', type=int, default=None, help='Documents downloaded concurrently')
+    parser.add_argument('--limit', type=int, default=None, help='Maximum documents to download this run')
+    parser.add_argument('--list', action='store_true', help='List the documents without downloading them')
+    parser.add_argument('--debug', action='store_true', help='Enable debug output')
+
+    args = parser.parse_args()
+
+    success = backfill(args.report, args.date_from, args.date_to, args.output_dir, bundles=args.bundles,
+                       workers=args.workers, limit=args.limit, list_only=args.list, debug=args.debug)
+
+    # Exit with appropriate code
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
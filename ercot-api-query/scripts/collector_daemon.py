@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Collector Daemon
+
+Runs every collection job in one long-running process instead of one cron
+process per job. Jobs share a single authenticated ERCOTAPIClient (one
+login, one connection pool, one token kept fresh in the background), are
+started by a built-in scheduler that understands cron expressions and
+fixed intervals, and never run more than --max-concurrent at a time.
+
+Usage:
+    python3 scripts/collector_daemon.py [--jobs jobs.json] [--max-concurrent 2] [--debug]
+
+Example (start at boot and keep running):
+    @reboot cd /path/to/ercot-api-query && python3 scripts/collector_daemon.py >> logs/daemon.log 2>&1
+
+Jobs file format (a JSON list; defaults to DEFAULT_JOBS below):
+    [
+      {"name": "dam_north", "schedule": "0 1 * * *",
+       "job": "dam_settlement_prices", "args": {"settlement_point": "HB_NORTH"}},
+      {"name": "incremental_rtm_lmp", "schedule": "every 15m", "job": "incremental_rtm_lmp"},
+      {"name": "feeds", "schedule": "every 5m", "job": "incremental_feeds",
+       "args": {"feeds_file": "my_feeds.json"}},
+      {"name": "dam_watch", "schedule": "55 11 * * *", "job": "dam_next_day_watch",
+       "args": {"settlement_point": "ALL"}, "timeout_minutes": 240}
+    ]
+
+Schedules are either five-field cron expressions (minute hour day month
+weekday; supports *, */n, a-b, a,b) or "every N" with a unit of s, m, h or d.
+Interval jobs run once at startup, then every N.
+
+Long jobs: a running job holds one of the --max-concurrent slots, so a
+job that waits for hours (dam_next_day_watch) should get a slot of its own
+(raise --max-concurrent by one). Jobs that take a stop argument are handed
+an Event that is set on shutdown and once the job's optional
+"timeout_minutes" has passed, so they give up promptly. Other jobs cannot
+be interrupted; they end on their own (requests give up after
+ERCOT_RETRY_DEADLINE) and shutdown waits for them.
+"""
+
+import sys
+import json
+import inspect
+import signal
+import argparse
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path to import ercot_query module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ercot_query import ERCOTAPIClient
+from daily_dam_settlement_prices import collect_dam_settlement_prices, watch_next_day_prices
+from daily_rtm_lmp import collect_rtm_lmp
+from daily_spp_15min import collect_spp_15min
+from incremental_rtm_spp import poll_incremental
+from incremental_poller import poll_feeds
+
+
+# Job types that can be scheduled, by the name used in the jobs file
+JOB_TYPES = {
+    "dam_settlement_prices": collect_dam_settlement_prices,
+    "dam_next_day_watch": watch_next_day_prices,
+    "rtm_lmp": collect_rtm_lmp,
+    "spp_15min": collect_spp_15min,
+    "incremental_rtm_lmp": poll_incremental,
+    "incremental_feeds": poll_feeds,
+}
+
+# The jobs from setup_cron_example.sh, plus the 15-minute incremental poller
+DEFAULT_JOBS = [
+    {"name": "dam_hubs", "schedule": "0 1 * * *", "job": "dam_settlement_prices",
+     "args": {"settlement_point": ["HB_HOUSTON", "HB_NORTH", "HB_SOUTH", "HB_WEST"]}},
+    {"name": "rtm_lmp", "schedule": "15 1 * * *", "job": "rtm_lmp"},
+    {"name": "spp_15min", "schedule": "30 1 * * *", "job": "spp_15min"},
+    {"name": "incremental_rtm_lmp", "schedule": "*/15 * * * *", "job": "incremental_rtm_lmp"},
+]
+
+# Jobs allowed to run at the same time (the rest wait their turn)
+DEFAULT_MAX_CONCURRENT_JOBS = 2
+
+# Longest the scheduler sleeps between checks, so clock changes are noticed
+MAX_SLEEP_SECONDS = 60
+
+
+class CronSchedule:
+    """
+    A five-field cron expression: minute hour day-of-month month day-of-week.
+
+    As in cron, when both day fields are restricted a time matches if
+    either of them does. Day-of-week 0 and 7 are both Sunday.
+    """
+
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): e.g. '0 1 * * *' or '*/15 * * * *'
+
+        Raises:
+            ValueError: If the expression is not valid
+        """
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expression}'")
+
+        self.expression = expression
+        values = [self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = values
+        if 7 in self.weekdays:
+            self.weekdays.add(0)
+
+        self.any_day = fields[2] == '*'
+        self.any_weekday = fields[4] == '*'
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        """Expand one cron field into the set of values it matches."""
+        values = set()
+        for part in field.split(','):
+            step = 1
+            if '/' in part:
+                part, step = part.split('/', 1)
+                step = int(step)
+
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                start, end = (int(value) for value in part.split('-', 1))
+            else:
+                start = int(part)
+                end = high if step > 1 else start
+
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Cron field '{field}' is outside {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        # Python counts Monday as 0, cron counts Sunday as 0
+        weekday_ok = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment):
+        """
+        Find the first matching minute after a moment.
+
+        Args:
+            moment (datetime): Search starts one minute after this
+
+        Returns:
+            datetime: The next time the schedule fires
+
+        Raises:
+            ValueError: If the expression can never fire (e.g. '0 0 31 2 *')
+        """
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Four years covers schedules that only fire on 29 February
+        limit = candidate + timedelta(days=4 * 366)
+
+        while candidate < limit:
+            if candidate.month not in self.months:
+                # Jump to the first minute of the next month
+                candidate = (candidate.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+
+        raise ValueError(f"Cron expression never fires: '{self.expression}'")
+
+    def __str__(self):
+        return self.expression
+
+
+class IntervalSchedule:
+    """A fixed interval, written 'every 15m' (units: s, m, h, d)."""
+
+    UNITS = {'s': 'seconds', 'm': 'minutes', 'h': 'hours', 'd': 'days'}
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): e.g. 'every 15m' or 'every 1h'
+
+        Raises:
+            ValueError: If the expression is not valid
+        """
+        amount = expression.split(None, 1)[1].strip().lower() if ' ' in expression.strip() else ''
+        unit = self.UNITS.get(amount[-1:])
+        if unit is None or not amount[:-1].isdigit() or int(amount[:-1]) <= 0:
+            raise ValueError(f"Interval must look like 'every 15m': '{expression}'")
+
+        self.expression = expression
+        self.interval = timedelta(**{unit: int(amount[:-1])})
+
+    def next_after(self, moment):
+        """Return the time one interval after a moment."""
+        return moment + self.interval
+
+    def __str__(self):
+        return self.expression
+
+
+def parse_schedule(expression):
+    """
+    Parse a schedule string.
+
+    Args:
+        expression (str): A cron expression or 'every N<unit>'
+
+    Returns:
+        CronSchedule or IntervalSchedule
+
+    Raises:
+        ValueError: If the schedule is not valid
+    """
+    if expression.strip().lower().startswith('every'):
+        return IntervalSchedule(expression)
+    return CronSchedule(expression)
+
+
+class Job:
+    """One scheduled collection job and its run state."""
+
+    def __init__(self, name, schedule, function, args=None, timeout_minutes=None):
+        self.name = name
+        self.schedule = schedule
+        self.function = function
+        self.args = args or {}
+        self.timeout = timedelta(minutes=timeout_minutes) if timeout_minutes else None
+        self.future = None
+        self.last_result = None
+
+        # Set when the current run should give up (shutdown or timeout)
+        self.stop = threading.Event()
+        self.deadline = None
+
+        # Interval jobs start straight away; cron jobs wait for their time
+        now = datetime.now()
+        self.next_run = now if isinstance(schedule, IntervalSchedule) else schedule.next_after(now)
+
+    def is_running(self):
+        return self.future is not None and not self.future.done()
+
+    def accepts_stop(self):
+        """True if the job function takes a stop Event (and so can be interrupted)."""
+        return 'stop' in inspect.signature(self.function).parameters
+
+
+def load_jobs(jobs_file=None):
+    """
+    Build the job list from a jobs file or DEFAULT_JOBS.
+
+    Args:
+        jobs_file (str): Path of a JSON jobs file, or None for the defaults
+
+    Returns:
+        list: Job objects, or None if the file is missing or invalid
+    """
+    definitions = DEFAULT_JOBS
+    if jobs_file:
+        try:
+            with open(jobs_file, 'r') as f:
+                definitions = json.load(f)
+        except FileNotFoundError:
+            print(f"✗ Jobs file not found: {jobs_file}")
+            return None
+        except json.JSONDecodeError as e:
+            print(f"✗ Invalid JSON in jobs file: {e}")
+            return None
+
+    jobs = []
+    for definition in definitions:
+        name = definition.get('name') or definition.get('job')
+        function = JOB_TYPES.get(definition.get('job'))
+        if function is None:
+            print(f"✗ Job '{name}': unknown job type '{definition.get('job')}' "
+                  f"(available: {', '.join(JOB_TYPES)})")
+            return None
+        try:
+            schedule = parse_schedule(definition.get('schedule', ''))
+        except ValueError as e:
+            print(f"✗ Job '{name}': {e}")
+            return None
+        timeout = definition.get('timeout_minutes')
+        if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+            print(f"✗ Job '{name}': timeout_minutes must be a positive number")
+            return None
+        jobs.append(Job(name, schedule, function, definition.get('args'), timeout))
+
+    return jobs
+
+
+def make_client(debug=False):
+    """
+    Build the client the jobs share, for the daemon and --run-now alike.
+
+    The background refresher keeps its token valid, so no job ever waits
+    on a login and a long run never finds the token expired.
+
+    Args:
+        debug (bool): Enable debug output
+
+    Returns:
+        ERCOTAPIClient: The client (call authenticate() before use)
+    """
+    return ERCOTAPIClient(debug=debug, background_refresh=True)
+
+
+def run_job(job, client, debug=False):
+    """
+    Run one job on the shared client.
+
+    Exceptions are caught and reported so that one failing job never
+    stops the daemon. Jobs that take a stop argument get job.stop.
+
+    Returns:
+        bool: True if the job succeeded, False otherwise
+    """
+    started = time.monotonic()
+    print(f"\n▶ [{datetime.now():%Y-%m-%d %H:%M:%S}] Starting job: {job.name}")
+
+    args = dict(job.args)
+    if job.accepts_stop():
+        args['stop'] = job.stop
+    try:
+        success = bool(job.function(debug=debug, client=client, **args))
+    except Exception as e:
+        print(f"✗ Job {job.name} raised {type(e).__name__}: {e}")
+        if debug:
+            traceback.print_exc()
+        success = False
+
+    mark = "✓" if success else "✗"
+    print(f"{mark} [{datetime.now():%Y-%m-%d %H:%M:%S}] Job {job.name} "
+          f"{'finished' if success else 'failed'} in {time.monotonic() - started:.1f} seconds")
+    job.last_result = success
+    return success
+
+
+def run_daemon(jobs, max_concurrent=DEFAULT_MAX_CONCURRENT_JOBS, debug=False):
+    """
+    Run the scheduler until SIGINT or SIGTERM.
+
+    A job whose previous run is still going when it comes due again is
+    skipped for that slot rather than started twice. A job past its
+    timeout_minutes, and every running job at shutdown, has its stop
+    Event set (see the module docstring for which jobs honour it).
+
+    Args:
+        jobs (list): Job objects from load_jobs()
+        max_concurrent (int): Jobs allowed to run at the same time
+        debug (bool): Enable debug output
+
+    Returns:
+        bool: False if the daemon could not start, True after a clean shutdown
+    """
+    # One client for every job
+    client = make_client(debug)
+    if not client.authenticate():
+        print("✗ Authentication failed")
+        client.close()
+        return False
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        print(f"\nReceived {signal.Signals(signum).name}; finishing running jobs and exiting...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    print(f"\nScheduler started with {len(jobs)} jobs (at most {max_concurrent} at a time)")
+    for job in jobs:
+        timeout = f" (timeout {job.timeout})" if job.timeout else ""
+        print(f"  {job.name:<24} {str(job.schedule):<16} next: {job.next_run:%Y-%m-%d %H:%M:%S}{timeout}")
+
+    with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+        while not stop.is_set():
+            now = datetime.now()
+            for job in jobs:
+                if job.next_run > now:
+                    continue
+                if job.is_running():
+                    print(f"⚠ Job {job.name} is still running; skipping the {job.next_run:%H:%M} run")
+                else:
+                    job.stop = threading.Event()
+                    job.deadline = now + job.timeout if job.timeout else None
+                    job.future = executor.submit(run_job, job, client, debug)
+                job.next_run = job.schedule.next_after(now)
+                if debug:
+                    print(f"[DEBUG] Next run of {job.name}: {job.next_run:%Y-%m-%d %H:%M:%S}")
+
+            for job in jobs:
+                if job.is_running() and job.deadline and now >= job.deadline and not job.stop.is_set():
+                    note = "stopping it" if job.accepts_stop() else "it cannot be interrupted; waiting for it"
+                    print(f"⚠ Job {job.name} passed its {job.timeout} timeout; {note}")
+                    job.stop.set()
+
+            wake_at = min(job.next_run for job in jobs)
+            stop.wait(min(max((wake_at - datetime.now()).total_seconds(), 0), MAX_SLEEP_SECONDS))
+
+        # Ask running jobs to give up, so the executor's shutdown does not
+        # wait hours for a watch job
+        for job in jobs:
+            job.stop.set()
+
+    client.close()
+    print("✓ Daemon stopped")
+    return True
+
+
+def main():
+    """Main function to parse arguments and run the daemon."""
+    parser = argparse.ArgumentParser(
+        description='Run all collection jobs on a schedule in one long-running process',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Run the default jobs (the setup_cron_example.sh jobs + incremental poller)
+  python3 scripts/collector_daemon.py
+
+  # Use your own job list and allow 3 jobs at once
+  python3 scripts/collector_daemon.py --jobs my_jobs.json --max-concurrent 3
+
+  # Show the jobs and when each runs next
+  python3 scripts/collector_daemon.py --list
+
+  # Run one job now (on the shared client) and exit
+  python3 scripts/collector_daemon.py --run-now rtm_lmp
+
+Job types:
+  dam_settlement_prices, dam_next_day_watch (e.g. at "55 11 * * *"), rtm_lmp, spp_15min, incremental_rtm_lmp,
+  incremental_feeds (every due feed of incremental_poller.py)
+        """
+    )
+
+    parser.add_argument('--jobs', default=None, help='JSON jobs file (default: built-in job list)')
+    parser.add_argument('--max-concurrent', type=int, default=DEFAULT_MAX_CONCURRENT_JOBS,
+                        help=f'Jobs allowed to run at once (default: {DEFAULT_MAX_CONCURRENT_JOBS})')
+    parser.add_argument('--list', action='store_true', help='List jobs and their next run times, then exit')
+    parser.add_argument('--run-now', metavar='JOB', default=None, help='Run one job immediately and exit')
+    parser.add_argument('--debug', action='store_true', help='Enable debug output')
+
+    args = parser.parse_args()
+
+    jobs = load_jobs(args.jobs)
+    if not jobs:
+        sys.exit(1)
+
+    if args.list:
+        for job in jobs:
+            print(f"{job.name:<24} {str(job.schedule):<16} next: {job.next_run:%Y-%m-%d %H:%M:%S}")
+        sys.exit(0)
+
+    if args.run_now:
+        job = next((job for job in jobs if job.name == args.run_now), None)
+        if job is None:
+            print(f"✗ No job named '{args.run_now}'")
+            sys.exit(1)
+        with make_client(args.debug) as client:
+            success = client.authenticate() and run_job(job, client, args.debug)
+        sys.exit(0 if success else 1)
+
+    success = run_daemon(jobs, max_concurrent=args.max_concurrent, debug=args.debug)
+
+    # Exit with appropriate code
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
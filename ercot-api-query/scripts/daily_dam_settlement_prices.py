@@ -6,15 +6,29 @@ Automatically collects Day-Ahead Market settlement point prices for the previous
 Designed to run daily via cron at 1 AM to collect yesterday's data.
 
 Usage:
-    python3 scripts/daily_dam_settlement_prices.py [--settlement-point HB_HOUSTON] [--debug]
+    python3 scripts/daily_dam_settlement_prices.py [--settlement-point HB_HOUSTON [HB_NORTH ...] | ALL] [--debug]
 
 Example cron entry (runs daily at 1 AM):
     0 1 * * * cd /path/to/ercot-api-query && python3 scripts/daily_dam_settlement_prices.py
+
+Watch mode (tomorrow's prices as soon as ERCOT posts them):
+    python3 scripts/daily_dam_settlement_prices.py --watch [--window 12:00-15:30] [--watch-interval 30]
+
+    Checks the report's lastPostDatetime every --watch-interval seconds
+    during the posting window and collects the next delivery day the moment
+    it appears. The delay from posting to saved data is appended to
+    state/dam_posting_lag.jsonl.
+
+    0 12 * * * cd /path/to/ercot-api-query && python3 scripts/daily_dam_settlement_prices.py --watch --settlement-point ALL
 """
 
 import os
 import sys
+import json
+import signal
+import threading
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -22,6 +36,25 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ercot_query import ERCOTAPIClient
+from ercot_sinks import get_sink, OUTPUT_FORMATS
+
+
+# DAM settlement point prices report and endpoint
+REPORT_ID = "np4-190-cd"
+ENDPOINT = "np4-190-cd/dam_stlmnt_pnt_prices"
+
+# When ERCOT normally posts the next day's DAM results (local time, HH:MM-HH:MM)
+DAM_POSTING_WINDOW = "12:00-15:30"
+
+# Seconds between metadata checks in watch mode
+DAM_WATCH_INTERVAL_SECONDS = 30
+
+# One JSON line per watched posting: when it was posted, detected and saved
+LAG_LOG_FILE = Path("state/dam_posting_lag.jsonl")
+
+# Up to this many settlement points are queried one by one (concurrently);
+# beyond it the whole day is fetched once and split locally
+PER_POINT_QUERY_LIMIT = 8
 
 
 def get_yesterday_dates():
@@ -36,41 +69,110 @@ def get_yesterday_dates():
     return date_str, date_str
 
 
-def collect_dam_settlement_prices(settlement_point='HB_HOUSTON', debug=False):
+def parse_settlement_points(values):
     """
-    Collect DAM settlement point prices for yesterday.
+    Turn command-line or job settlement point values into a list.
+
+    Accepts a single name, a comma-separated string, a list of either,
+    or 'ALL'.
 
     Args:
-        settlement_point (str): Settlement point to query (default: HB_HOUSTON)
+        values (str or list): Settlement point name(s)
+
+    Returns:
+        list: Upper-cased settlement point names, or ['ALL']
+    """
+    if isinstance(values, str):
+        values = [values]
+
+    points = []
+    for value in values:
+        for point in value.split(','):
+            point = point.strip().upper()
+            if point and point not in points:
+                points.append(point)
+
+    return ['ALL'] if 'ALL' in points else points
+
+
+def partition_by_settlement_point(response_data):
+    """
+    Split an unfiltered response into one response per settlement point.
+
+    Args:
+        response_data (dict): Merged API response for all settlement points
+
+    Returns:
+        dict: Settlement point -> response with only that point's rows
+    """
+    rows = response_data.get('data', [])
+    field_names = [field.get('name') for field in response_data.get('fields', [])]
+    index = field_names.index('settlementPoint') if 'settlementPoint' in field_names else None
+    if index is None and rows and not isinstance(rows[0], dict):
+        print("✗ Response has no settlementPoint field to split on")
+        return {}
+
+    partitions = {}
+    for row in rows:
+        point = row.get('settlementPoint') if isinstance(row, dict) else row[index]
+        partitions.setdefault(point, []).append(row)
+
+    responses = {}
+    for point, point_rows in partitions.items():
+        meta = dict(response_data.get('_meta') or {}, totalRecords=len(point_rows))
+        responses[point] = dict(response_data, data=point_rows, _meta=meta)
+    return responses
+
+
+def collect_dam_settlement_prices(settlement_point='HB_HOUSTON', debug=False, client=None,
+                                  output_format='json', delivery_date=None):
+    """
+    Collect DAM settlement point prices for yesterday (or another delivery date).
+
+    Several settlement points are collected in one pass on one client. Up
+    to PER_POINT_QUERY_LIMIT points are requested individually and
+    concurrently; for more (or 'ALL') the whole day is fetched once,
+    unfiltered, and split by settlement point locally, which takes fewer
+    requests. Each point is written to its own file either way.
+
+    Args:
+        settlement_point (str or list): Settlement point(s) to query, as a
+                                        list, a comma-separated string or
+                                        'ALL' (default: HB_HOUSTON)
         debug (bool): Enable debug output
+        client (ERCOTAPIClient): Authenticated client to use (default: create one)
+        output_format (str): 'json' (default), 'ndjson' or 'parquet' (see ercot_sinks)
+        delivery_date (str): Delivery date to collect, YYYY-MM-DD (default: yesterday)
 
     Returns:
-        bool: True if successful, False otherwise
+        bool: True if every settlement point was collected, False otherwise
     """
     # Calculate yesterday's date
-    date_from, date_to = get_yesterday_dates()
+    date_from, date_to = (delivery_date, delivery_date) if delivery_date else get_yesterday_dates()
+    points = parse_settlement_points(settlement_point)
 
     print("=" * 60)
     print("Daily DAM Settlement Point Prices Collection")
     print("=" * 60)
-    print(f"Settlement Point: {settlement_point}")
+    print(f"Settlement Points: {', '.join(points)}")
     print(f"Date Range: {date_from} to {date_to}")
     print()
 
-    # Initialize ERCOT API client
-    client = ERCOTAPIClient(debug=debug)
+    # Initialize ERCOT API client, unless a shared one was passed in
+    # (collector_daemon.py runs every job on one client)
+    if client is None:
+        client = ERCOTAPIClient(debug=debug)
 
-    # Authenticate
-    if not client.authenticate():
-        print("✗ Authentication failed")
-        return False
+        # Authenticate
+        if not client.authenticate():
+            print("✗ Authentication failed")
+            return False
 
     # Define API endpoint and parameters
-    endpoint = "np4-190-cd/dam_stlmnt_pnt_prices"
+    endpoint = ENDPOINT
     parameters = {
         "deliveryDateFrom": date_from,
-        "deliveryDateTo": date_to,
-        "settlementPoint": settlement_point
+        "deliveryDateTo": date_to
     }
 
     # Query the API
@@ -78,30 +180,231 @@ def collect_dam_settlement_prices(settlement_point='HB_HOUSTON', debug=False):
     print(f"Parameters: {parameters}")
     print()
 
-    response_data = client.query_api(endpoint, parameters)
+    if points == ['ALL'] or len(points) > PER_POINT_QUERY_LIMIT:
+        # One unfiltered query for the whole day, partitioned locally
+        # paginate=True fetches every page so the day is never truncated
+        response_data = client.query_api(endpoint, parameters, paginate=True)
 
-    if response_data is None:
-        print("✗ Query failed")
-        return False
+        if response_data is None:
+            print("✗ Query failed")
+            return False
+
+        responses = partition_by_settlement_point(response_data)
+        if points != ['ALL']:
+            responses = {point: responses[point] for point in points if point in responses}
+    else:
+        # A few points: one filtered query each, sent concurrently
+        def query_point(point):
+            return client.query_api(endpoint, dict(parameters, settlementPoint=point), paginate=True)
+
+        with ThreadPoolExecutor(max_workers=client.max_workers) as executor:
+            results = list(executor.map(query_point, points))
+
+        responses = {point: result for point, result in zip(points, results) if result is not None}
 
     # Create output directory structure: output/daily/dam/YYYY/MM/
     output_dir = Path("output/daily/dam") / date_from[:4] / date_from[5:7]
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Generate output filename: settlement_prices_HB_HOUSTON_2025-01-27.json
-    output_file = output_dir / f"settlement_prices_{settlement_point}_{date_from}.json"
+    sink = get_sink(output_format, client)
+    saved = True
+    if output_format == 'json':
+        for point, point_data in sorted(responses.items()):
+            # Generate output filename: settlement_prices_HB_HOUSTON_2025-01-27.json
+            output_file = output_dir / f"settlement_prices_{point}_{date_from}.json"
+
+            # Save the response
+            saved = sink.write(point_data, str(output_file), report=endpoint) and saved
+    elif responses:
+        # Parquet and NDJSON hold every point in one dataset (filtered by the
+        # settlementPoint column), so write the day once, not once per point
+        combined = dict(next(iter(responses.values())))
+        combined['data'] = [row for _, point_data in sorted(responses.items()) for row in point_data.get('data', [])]
+        saved = sink.write(combined, str(output_dir / f"settlement_prices_{date_from}.json"), report=endpoint)
+
+    if not saved:
+        return False
 
-    # Save the response
-    client.save_response(response_data, str(output_file))
+    missing = [point for point in points if point != 'ALL' and point not in responses]
+    if missing:
+        print(f"\n✗ No data collected for: {', '.join(missing)}")
+        return False
 
     print()
     print("=" * 60)
-    print("✓ Collection completed successfully!")
+    print(f"✓ Collection completed successfully! ({len(responses)} settlement points)")
     print("=" * 60)
 
     return True
 
 
+def parse_window(window, day):
+    """
+    Turn 'HH:MM-HH:MM' into start and end datetimes on a given day.
+
+    Raises:
+        ValueError: If the window is not in HH:MM-HH:MM form or ends before it starts
+    """
+    try:
+        start_text, end_text = window.split('-')
+        start = datetime.combine(day, datetime.strptime(start_text.strip(), '%H:%M').time())
+        end = datetime.combine(day, datetime.strptime(end_text.strip(), '%H:%M').time())
+    except ValueError:
+        raise ValueError(f"Posting window must look like 12:00-15:30: '{window}'")
+    if end <= start:
+        raise ValueError(f"Posting window ends before it starts: '{window}'")
+    return start, end
+
+
+def has_delivery_date(client, delivery_date):
+    """
+    Check whether prices for a delivery date have been published.
+
+    Asks for a single record, so the check costs one tiny request.
+
+    Returns:
+        bool: True if at least one record exists for the date
+    """
+    response = client.query_api(ENDPOINT, {"deliveryDateFrom": delivery_date,
+                                           "deliveryDateTo": delivery_date, "size": 1})
+    if not isinstance(response, dict):
+        return False
+    total = (response.get('_meta') or {}).get('totalRecords')
+    return bool(total) if total is not None else bool(response.get('data'))
+
+
+def record_posting_lag(entry):
+    """Append one watched posting to LAG_LOG_FILE."""
+    try:
+        LAG_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(LAG_LOG_FILE, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+    except OSError as e:
+        print(f"⚠ Warning: Could not record posting lag: {e}")
+
+
+def watch_next_day_prices(settlement_point='HB_HOUSTON', debug=False, client=None, output_format='json',
+                          window=DAM_POSTING_WINDOW, interval=DAM_WATCH_INTERVAL_SECONDS, stop=None):
+    """
+    Wait for tomorrow's DAM prices to be posted, then collect them at once.
+
+    During the posting window the report's metadata is fetched every
+    interval seconds (one small request). A one-record query checks
+    whether tomorrow's prices are in on the first probe, on every probe
+    once lastPostDatetime has changed (the data can lag the posting), and
+    on any probe where the metadata could not be fetched. As soon as the
+    prices are in, they are collected as in collect_dam_settlement_prices.
+    The lag from posting to detection and to saved data is printed and
+    appended to LAG_LOG_FILE.
+
+    lastPostDatetime is ERCOT (Central) time, so the lags assume this
+    machine's clock is on Central time too, as the collectors' dates do.
+
+    Args:
+        settlement_point (str or list): Settlement point(s), as for
+                                        collect_dam_settlement_prices
+        debug (bool): Enable debug output
+        client (ERCOTAPIClient): Authenticated client to use (default: create one)
+        output_format (str): 'json' (default), 'ndjson' or 'parquet'
+        window (str): Posting window, 'HH:MM-HH:MM' local time
+        interval (int): Seconds between metadata checks
+        stop (threading.Event): Set to give up waiting (e.g. the daemon's
+                                shutdown); checked during every wait
+
+    Returns:
+        bool: True if tomorrow's prices were collected, False if they did
+              not appear before the window closed (or stop was set) or
+              could not be saved
+    """
+    stop = stop or threading.Event()
+    today = datetime.now().date()
+    delivery_date = (today + timedelta(days=1)).strftime('%Y-%m-%d')
+    window_start, window_end = parse_window(window, today)
+
+    print("=" * 60)
+    print("DAM Next-Day Watch")
+    print("=" * 60)
+    print(f"Delivery Date: {delivery_date}")
+    print(f"Posting Window: {window_start:%H:%M} to {window_end:%H:%M} (checking every {interval}s)")
+    print()
+
+    if datetime.now() >= window_end:
+        print("✗ Today's posting window has already closed")
+        return False
+
+    if client is None:
+        client = ERCOTAPIClient(debug=debug)
+
+        # Authenticate
+        if not client.authenticate():
+            print("✗ Authentication failed")
+            return False
+
+    wait = (window_start - datetime.now()).total_seconds()
+    if wait > 0:
+        print(f"Waiting {wait / 60:.0f} minutes for the posting window to open...")
+        if stop.wait(wait):
+            print("✗ Watch stopped before the posting window opened")
+            return False
+
+    first_posting = None
+    new_posting = False
+    probes = 0
+    while datetime.now() < window_end:
+        metadata = client.get_report_metadata(REPORT_ID)
+        probes += 1
+        posted = metadata.get('lastPostDatetime') if isinstance(metadata, dict) else None
+        if debug:
+            print(f"[DEBUG] Probe {probes}: lastPostDatetime {posted}")
+
+        if posted and first_posting is None:
+            first_posting = posted
+        elif posted and posted != first_posting and not new_posting:
+            new_posting = True
+            print(f"  New posting at {posted}; checking for prices on every probe")
+
+        # Check the data on the first probe, on every probe after a new
+        # posting, and whenever the metadata probe failed
+        if probes == 1 or new_posting or posted is None:
+            if posted is None:
+                print("  ⚠ Metadata probe failed; checking for the prices directly")
+            if has_delivery_date(client, delivery_date):
+                detected = datetime.now()
+                print(f"✓ Prices for {delivery_date} posted at {posted} (detected {detected:%H:%M:%S})")
+
+                if not collect_dam_settlement_prices(settlement_point, debug=debug, client=client,
+                                                     output_format=output_format, delivery_date=delivery_date):
+                    return False
+                available = datetime.now()
+
+                entry = {
+                    "delivery_date": delivery_date,
+                    "posted": posted,
+                    "detected": detected.isoformat(timespec='seconds'),
+                    "available": available.isoformat(timespec='seconds'),
+                    "probes": probes
+                }
+                if posted:
+                    # Without a posting time (failed probe) there is no lag to measure
+                    posted_at = datetime.fromisoformat(posted[:19])
+                    entry["detection_lag_seconds"] = round((detected - posted_at).total_seconds(), 1)
+                    entry["availability_lag_seconds"] = round((available - posted_at).total_seconds(), 1)
+                    print(f"✓ Posting to availability: {entry['availability_lag_seconds']:.0f}s "
+                          f"(detection {entry['detection_lag_seconds']:.0f}s, {probes} probes)")
+                record_posting_lag(entry)
+                return True
+
+            if new_posting:
+                print(f"  Posted at {posted}, but no prices for {delivery_date} yet")
+
+        if stop.wait(max(0, min(interval, (window_end - datetime.now()).total_seconds()))):
+            print("✗ Watch stopped before the prices were posted")
+            return False
+
+    print(f"✗ Prices for {delivery_date} were not posted by {window_end:%H:%M}")
+    return False
+
+
 def main():
     """Main function to parse arguments and run collection."""
     parser = argparse.ArgumentParser(
@@ -115,9 +418,18 @@ Examples:
   # Collect for specific settlement point
   python3 scripts/daily_dam_settlement_prices.py --settlement-point HB_NORTH
 
+  # Collect several settlement points in one run (one file each)
+  python3 scripts/daily_dam_settlement_prices.py --settlement-point HB_HOUSTON HB_NORTH HB_SOUTH HB_WEST
+
+  # Collect every settlement point (one unfiltered query, split locally)
+  python3 scripts/daily_dam_settlement_prices.py --settlement-point ALL
+
   # Enable debug output
   python3 scripts/daily_dam_settlement_prices.py --debug
 
+  # Collect tomorrow's prices as soon as they are posted (run before noon)
+  python3 scripts/daily_dam_settlement_prices.py --watch --settlement-point ALL
+
 Available Settlement Points:
   HB_NORTH, HB_SOUTH, HB_WEST, HB_HOUSTON, HB_BUSAVG, HB_PAN
         """
@@ -125,8 +437,9 @@ Available Settlement Points:
 
     parser.add_argument(
         '--settlement-point',
-        default='HB_HOUSTON',
-        help='Settlement point to query (default: HB_HOUSTON)'
+        nargs='+',
+        default=['HB_HOUSTON'],
+        help='Settlement point(s) to query, space- or comma-separated, or ALL (default: HB_HOUSTON)'
     )
 
     parser.add_argument(
@@ -135,12 +448,61 @@ Available Settlement Points:
         help='Enable debug output'
     )
 
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='json',
+        help='Output format: json (default), ndjson (compressed, one record per line) '
+             'or parquet (partitioned by report/date/hour)'
+    )
+
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help="Wait for tomorrow's prices during the posting window and collect them as soon as they post"
+    )
+
+    parser.add_argument(
+        '--window',
+        default=DAM_POSTING_WINDOW,
+        help=f'Posting window for --watch, HH:MM-HH:MM local time (default: {DAM_POSTING_WINDOW})'
+    )
+
+    parser.add_argument(
+        '--watch-interval',
+        type=int,
+        default=DAM_WATCH_INTERVAL_SECONDS,
+        help=f'Seconds between checks in --watch mode (default: {DAM_WATCH_INTERVAL_SECONDS})'
+    )
+
     args = parser.parse_args()
 
+    if args.watch:
+        try:
+            parse_window(args.window, datetime.now().date())
+        except ValueError as e:
+            parser.error(str(e))
+
+        # Ctrl+C or SIGTERM ends the wait cleanly instead of mid-sleep
+        stop = threading.Event()
+        signal.signal(signal.SIGINT, lambda signum, frame: stop.set())
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+
+        success = watch_next_day_prices(
+            settlement_point=args.settlement_point,
+            debug=args.debug,
+            output_format=args.format,
+            window=args.window,
+            interval=args.watch_interval,
+            stop=stop
+        )
+        sys.exit(0 if success else 1)
+
     # Run collection
     success = collect_dam_settlement_prices(
         settlement_point=args.settlement_point,
-        debug=args.debug
+        debug=args.debug,
+        output_format=args.format
     )
 
     # Exit with appropriate code
@@ -22,6 +22,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ercot_query import ERCOTAPIClient
+from ercot_sinks import get_sink, OUTPUT_FORMATS
 
 
 def get_yesterday_timestamps():
@@ -37,12 +38,15 @@ def get_yesterday_timestamps():
     return timestamp_from, timestamp_to
 
 
-def collect_spp_15min(debug=False):
+def collect_spp_15min(debug=False, raw=False, client=None, output_format='json'):
     """
     Collect 15-minute Settlement Point Prices for yesterday.
 
     Args:
         debug (bool): Enable debug output
+        raw (bool): Stream the response to disk as-is instead of parsing it
+        client (ERCOTAPIClient): Authenticated client to use (default: create one)
+        output_format (str): 'json' (default), 'ndjson' or 'parquet' (see ercot_sinks)
 
     Returns:
         bool: True if successful, False otherwise
@@ -58,13 +62,15 @@ def collect_spp_15min(debug=False):
     print(f"Timestamp Range: {timestamp_from} to {timestamp_to}")
     print()
 
-    # Initialize ERCOT API client
-    client = ERCOTAPIClient(debug=debug)
+    # Initialize ERCOT API client, unless a shared one was passed in
+    # (collector_daemon.py runs every job on one client)
+    if client is None:
+        client = ERCOTAPIClient(debug=debug)
 
-    # Authenticate
-    if not client.authenticate():
-        print("✗ Authentication failed")
-        return False
+        # Authenticate
+        if not client.authenticate():
+            print("✗ Authentication failed")
+            return False
 
     # Define API endpoint and parameters
     endpoint = "np6-905-cd/spp_node_zone_hub"
@@ -78,12 +84,6 @@ def collect_spp_15min(debug=False):
     print(f"Parameters: {parameters}")
     print()
 
-    response_data = client.query_api(endpoint, parameters)
-
-    if response_data is None:
-        print("✗ Query failed")
-        return False
-
     # Create output directory structure: output/daily/spp/YYYY/MM/
     output_dir = Path("output/daily/spp") / date_str[:4] / date_str[5:7]
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -91,8 +91,26 @@ def collect_spp_15min(debug=False):
     # Generate output filename: spp_15min_2025-01-27.json
     output_file = output_dir / f"spp_15min_{date_str}.json"
 
-    # Save the response
-    client.save_response(response_data, str(output_file))
+    if raw:
+        # Archive mode: write ERCOT's bytes straight to disk (no parse, no
+        # re-serialise) with a sha256 sidecar and the record count from _meta
+        if client.download_raw(endpoint, parameters, str(output_file)) is None:
+            print("✗ Query failed")
+            return False
+    else:
+        # Fetch the day as 24 hourly sub-windows in parallel (every page of
+        # each), so one slow or failed hour does not cost the whole day;
+        # each hour's status is kept in state/ercot_state.db as it goes
+        response_data = client.query_time_range(endpoint, parameters, chunk=timedelta(hours=1),
+                                                 job="daily_spp_15min")
+
+        if response_data is None:
+            print("✗ Query failed")
+            return False
+
+        # Save the response in the selected format
+        if not get_sink(output_format, client).write(response_data, str(output_file), report=endpoint):
+            return False
 
     print()
     print("=" * 60)
@@ -112,6 +130,9 @@ Examples:
   # Collect 15-minute SPP data for yesterday
   python3 scripts/daily_spp_15min.py
 
+  # Archive the raw response without parsing it (plus a .sha256 checksum)
+  python3 scripts/daily_spp_15min.py --raw
+
   # Enable debug output
   python3 scripts/daily_spp_15min.py --debug
 
@@ -128,10 +149,27 @@ Note:
         help='Enable debug output'
     )
 
+    parser.add_argument(
+        '--raw',
+        action='store_true',
+        help='Write the API response to disk as-is (faster, smaller; no re-formatting)'
+    )
+
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='json',
+        help='Output format: json (default), ndjson (compressed, one record per line) '
+             'or parquet (partitioned by report/date/hour)'
+    )
+
     args = parser.parse_args()
 
+    if args.raw and args.format != 'json':
+        parser.error('--raw writes the response as-is and cannot be combined with --format')
+
     # Run collection
-    success = collect_spp_15min(debug=args.debug)
+    success = collect_spp_15min(debug=args.debug, raw=args.raw, output_format=args.format)
 
     # Exit with appropriate code
     sys.exit(0 if success else 1)
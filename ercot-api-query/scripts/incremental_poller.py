@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Multi-Feed Incremental Poller
+
+Polls every configured feed for new data since its last successful poll,
+in one process on one shared client, instead of one copy of
+incremental_rtm_spp.py (and one cron entry, login and connection pool) per
+endpoint. Feeds poll concurrently; each keeps its own watermark and run
+history in the shared state database (state/ercot_state.db, see
+ercot_state) and writes to output/incremental/<name>/.
+
+Usage:
+    python3 scripts/incremental_poller.py [--feeds feeds.json] [--once] [--debug]
+
+Feeds file format (a JSON list; defaults to DEFAULT_FEEDS below):
+    [
+      {"name": "rtm_lmp", "endpoint": "np6-788-cd/lmp_node_zone_hub",
+       "parameter_type": "SCED", "interval_minutes": 15, "file_prefix": "lmp"},
+      {"name": "dam_spp_north", "endpoint": "np4-190-cd/dam_stlmnt_pnt_prices",
+       "parameter_type": "DAM", "interval_minutes": 60, "lookahead_days": 1,
+       "parameters": {"settlementPoint": "HB_NORTH"}}
+    ]
+
+Optional keys: parameter_type (SCED, DAM or ARCHIVE; detected from the
+report ID if missing), interval_minutes (default: the report's
+generationFrequency, at most 60), parameters, output_format, output_dir,
+state_file, file_prefix, lookahead_days, overlap_minutes, timestamp_field,
+key_fields, probe (default true: skip the data query when the report's
+lastPostDatetime has not changed).
+
+Cron Example (poll whichever feeds are due, every 5 minutes):
+    */5 * * * * cd /path/to/ercot-api-query && python3 scripts/incremental_poller.py --once
+"""
+
+import sys
+import json
+import signal
+import argparse
+import threading
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path to import ercot_query module
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from ercot_query import ERCOTAPIClient
+from ercot_incremental import IncrementalEngine, load_feeds, DEFAULT_MAX_CONCURRENT_FEEDS
+from ercot_sinks import OUTPUT_FORMATS
+
+
+# The feeds of incremental_rtm_spp.py and the daily collectors. Without
+# interval_minutes, each polls as often as its report is generated.
+DEFAULT_FEEDS = [
+    {"name": "rtm_lmp", "endpoint": "np6-788-cd/lmp_node_zone_hub",
+     "parameter_type": "SCED", "file_prefix": "lmp"},
+    {"name": "spp_15min", "endpoint": "np6-905-cd/spp_node_zone_hub",
+     "parameter_type": "SCED", "file_prefix": "spp"},
+    {"name": "dam_spp", "endpoint": "np4-190-cd/dam_stlmnt_pnt_prices",
+     "parameter_type": "DAM", "lookahead_days": 1, "file_prefix": "dam_spp"},
+]
+
+
+def read_feed_definitions(feeds_file=None):
+    """
+    Read the feed list from a JSON file, or use DEFAULT_FEEDS.
+
+    Returns:
+        list: Feed definitions, or None if the file is missing or invalid
+    """
+    if not feeds_file:
+        return DEFAULT_FEEDS
+    try:
+        with open(feeds_file, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"✗ Feeds file not found: {feeds_file}")
+    except json.JSONDecodeError as e:
+        print(f"✗ Invalid JSON in feeds file: {e}")
+    return None
+
+
+def select_feeds(feeds_file=None, names=None, output_format=None):
+    """
+    Build the feeds to poll, optionally only those named.
+
+    Returns:
+        list: Feed objects, or None on a configuration error
+    """
+    definitions = read_feed_definitions(feeds_file)
+    if definitions is None:
+        return None
+    feeds = load_feeds(definitions, output_format=output_format)
+    if feeds is None:
+        return None
+
+    if names:
+        unknown = [name for name in names if name not in {feed.name for feed in feeds}]
+        if unknown:
+            print(f"✗ Unknown feed(s): {', '.join(unknown)} "
+                  f"(available: {', '.join(feed.name for feed in feeds)})")
+            return None
+        feeds = [feed for feed in feeds if feed.name in names]
+    return feeds
+
+
+def poll_feeds(debug=False, client=None, feeds_file=None, names=None, output_format=None,
+               max_concurrent=DEFAULT_MAX_CONCURRENT_FEEDS, force=False):
+    """
+    Poll every due feed once, concurrently.
+
+    Args:
+        debug (bool): Enable debug output
+        client (ERCOTAPIClient): Authenticated client to use (default: create one)
+        feeds_file (str): JSON feeds file (default: DEFAULT_FEEDS)
+        names (list): Only poll these feeds
+        output_format (str): Output format for feeds that do not set one
+        max_concurrent (int): Feeds polled at the same time
+        force (bool): Poll every feed even if its interval is not up
+
+    Returns:
+        bool: True if every polled feed succeeded, False otherwise
+    """
+    feeds = select_feeds(feeds_file, names, output_format)
+    if not feeds:
+        return False
+
+    # Initialize ERCOT API client, unless a shared one was passed in
+    # (collector_daemon.py runs every job on one client)
+    if client is None:
+        client = ERCOTAPIClient(debug=debug)
+
+        # Authenticate
+        if not client.authenticate():
+            print("✗ Authentication failed")
+            return False
+
+    results = IncrementalEngine(feeds, client, max_concurrent, debug).poll_due(force=force)
+    if not results:
+        print("⚠ No feeds due (use --force to poll anyway)")
+    return all(results.values())
+
+
+def show_status(feeds):
+    """Display each feed's watermark and when it is next due."""
+    print("=" * 60)
+    print("Incremental Feeds Status")
+    print("=" * 60)
+
+    for feed in feeds:
+        state = feed.read_state()
+        next_poll = feed.next_poll_time(state) if state else None
+        print(f"\n{feed.name}: {feed.endpoint} ({feed.parameter_type}, every {feed.interval})")
+        if state is None:
+            print("  Never run (no saved state)")
+            continue
+        print(f"  Last Poll: {state['last_poll_time']}")
+        print(f"  Last Timestamp Retrieved: {state['last_timestamp']}")
+        if state.get('watermark'):
+            print(f"  Watermark (latest row): {state['watermark']} (polls start {feed.overlap} earlier)")
+        if state.get('last_post_datetime'):
+            print(f"  Report Last Posted (at last poll): {state['last_post_datetime']}")
+        print(f"  Records in Last Poll: {state.get('last_records_retrieved', 'unknown')}")
+        print(f"  Next Poll Due: {max(next_poll, datetime.now()):%Y-%m-%d %H:%M:%S}")
+        for run in feed.state_store.recent_runs(feed.name, limit=1):
+            print(f"  Last Run: {run['status']} (started {run['started_at']}"
+                  f"{', ' + run['message'] if run['message'] else ''})")
+
+    print("=" * 60)
+
+
+def main():
+    """Main function to parse arguments and run the feeds."""
+    parser = argparse.ArgumentParser(
+        description='Poll many endpoints incrementally on one shared client',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Keep polling every feed on its own interval (stop with Ctrl+C)
+  python3 scripts/incremental_poller.py
+
+  # Poll the feeds that are due once and exit (for cron)
+  python3 scripts/incremental_poller.py --once
+
+  # Use your own feed list, 8 feeds at a time
+  python3 scripts/incremental_poller.py --feeds my_feeds.json --max-concurrent 8
+
+  # Check the watermarks
+  python3 scripts/incremental_poller.py --status
+
+  # Start one feed over
+  python3 scripts/incremental_poller.py --reset rtm_lmp
+
+State Location:
+  state/ercot_state.db (watermarks and run history; inspect with python3 ercot_state.py)
+
+Output Location:
+  output/incremental/<feed>/YYYY-MM-DD/HH/<prefix>_YYYYMMDD_HHMMSS_to_YYYYMMDD_HHMMSS.json
+        """
+    )
+
+    parser.add_argument('--feeds', default=None, help='JSON feeds file (default: built-in feed list)')
+    parser.add_argument('--feed', nargs='+', default=None, metavar='NAME', help='Only poll these feeds')
+    parser.add_argument('--once', action='store_true', help='Poll the due feeds once and exit')
+    parser.add_argument('--force', action='store_true', help='With --once, poll every feed even if not due')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default=None,
+                        help='Output format for feeds that do not set one (default: json)')
+    parser.add_argument('--max-concurrent', type=int, default=DEFAULT_MAX_CONCURRENT_FEEDS,
+                        help=f'Feeds polled at once (default: {DEFAULT_MAX_CONCURRENT_FEEDS})')
+    parser.add_argument('--status', action='store_true', help='Show each feed\'s state and exit')
+    parser.add_argument('--reset', nargs='+', default=None, metavar='NAME',
+                        help='Delete these feeds\' state (next run is like a first run)')
+    parser.add_argument('--debug', action='store_true', help='Enable debug output')
+
+    args = parser.parse_args()
+
+    # Handle special commands
+    if args.status or args.reset:
+        feeds = select_feeds(args.feeds, args.reset or args.feed)
+        if not feeds:
+            sys.exit(1)
+        if args.status:
+            show_status(feeds)
+        else:
+            for feed in feeds:
+                print(f"✓ {feed.name}: state deleted" if feed.reset_state()
+                      else f"{feed.name}: no state to delete")
+        sys.exit(0)
+
+    if args.once:
+        success = poll_feeds(debug=args.debug, feeds_file=args.feeds, names=args.feed,
+                             output_format=args.format, max_concurrent=args.max_concurrent, force=args.force)
+        sys.exit(0 if success else 1)
+
+    feeds = select_feeds(args.feeds, args.feed, args.format)
+    if not feeds:
+        sys.exit(1)
+
+    # One client for every feed; the background refresher keeps its token valid
+    client = ERCOTAPIClient(debug=args.debug, background_refresh=True)
+    if not client.authenticate():
+        print("✗ Authentication failed")
+        sys.exit(1)
+
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        print(f"\nReceived {signal.Signals(signum).name}; finishing running polls and exiting...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    print(f"Polling {len(feeds)} feeds (at most {args.max_concurrent} at a time)")
+    for feed in feeds:
+        print(f"  {feed.name:<20} {feed.endpoint:<40} every {feed.interval}")
+
+    IncrementalEngine(feeds, client, args.max_concurrent, args.debug).run(stop)
+    client.close()
+    print("✓ Poller stopped")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,27 +11,36 @@ Usage:
 Cron Example (runs every 15 minutes):
     */15 * * * * cd /path/to/ercot-api-query && python3 scripts/incremental_rtm_spp.py
 
+To poll several endpoints, add them as feeds to incremental_poller.py
+instead of copying this script.
+
 How It Works:
-    1. Reads last successful timestamp from state file
-    2. Queries API for data from (last_timestamp + 1 second) to now
-    3. Saves new data to timestamped file
-    4. Updates state file with latest timestamp retrieved
+    0. Checks the report's lastPostDatetime (one small metadata request);
+       if nothing was posted since the last poll, stops there
+    1. Reads the watermark (latest SCEDTimestamp received) from the state
+       database (state/ercot_state.db, see ercot_state)
+    2. Queries API for data from (watermark - 30 minutes) to now, so
+       intervals published late are still picked up
+    3. Drops rows already received (see ercot_incremental.SeenIndex) and
+       saves the new ones to a timestamped file
+       (with --format ndjson: streams them onto the end of one compressed file per day)
+    4. Saves the new watermark and records the run, in one transaction
 """
 
-import os
 import sys
-import json
 import argparse
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
 # Add parent directory to path to import ercot_query module
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from ercot_query import ERCOTAPIClient
+from ercot_incremental import Feed
+from ercot_sinks import OUTPUT_FORMATS
 
 
-# State file location
+# State file of earlier versions, imported into the state database on the first poll
 STATE_DIR = Path("state")
 STATE_FILE = STATE_DIR / "incremental_rtm_lmp_state.json"
 
@@ -41,97 +50,26 @@ ENDPOINT = "np6-788-cd/lmp_node_zone_hub"
 OUTPUT_DIR_BASE = Path("output/incremental/rtm_lmp")
 
 
-def ensure_directories():
-    """Create necessary directories if they don't exist."""
-    STATE_DIR.mkdir(parents=True, exist_ok=True)
-    OUTPUT_DIR_BASE.mkdir(parents=True, exist_ok=True)
-
-
-def read_state():
+def make_feed(output_format='json'):
     """
-    Read the last successful poll state.
+    Describe this poller as a feed of the incremental engine (see ercot_incremental).
 
-    Returns:
-        dict: State containing last_timestamp and other metadata
-              Returns None if state file doesn't exist (first run)
+    It is the same feed as 'rtm_lmp' in incremental_poller.py, so the two
+    share one watermark and either can take over from the other.
     """
-    if not STATE_FILE.exists():
-        return None
+    return Feed("rtm_lmp", ENDPOINT, parameter_type="SCED", interval_minutes=15,
+                output_format=output_format, output_dir=OUTPUT_DIR_BASE,
+                state_file=STATE_FILE, file_prefix="lmp")
 
-    try:
-        with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
-        return state
-    except Exception as e:
-        print(f"⚠ Warning: Could not read state file: {e}")
-        return None
 
-
-def write_state(timestamp_to, records_retrieved):
-    """
-    Write the current state after successful poll.
-
-    Args:
-        timestamp_to (str): The latest timestamp successfully retrieved
-        records_retrieved (int): Number of records retrieved in this poll
-    """
-    state = {
-        "last_timestamp": timestamp_to,
-        "last_poll_time": datetime.now().isoformat(),
-        "last_records_retrieved": records_retrieved,
-        "endpoint": ENDPOINT
-    }
-
-    try:
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f, indent=2)
-        return True
-    except Exception as e:
-        print(f"✗ Error writing state file: {e}")
-        return False
-
-
-def calculate_time_range(last_state, debug=False):
-    """
-    Calculate the time range to query based on last state.
-
-    Args:
-        last_state (dict): Previous state, or None for first run
-        debug (bool): Enable debug output
-
-    Returns:
-        tuple: (timestamp_from, timestamp_to) as ISO format strings
-    """
-    now = datetime.now()
-
-    if last_state is None:
-        # First run - get last 15 minutes
-        timestamp_from = (now - timedelta(minutes=15)).replace(microsecond=0)
-        if debug:
-            print("[DEBUG] First run - querying last 15 minutes")
-    else:
-        # Incremental - start from 1 second after last timestamp
-        last_timestamp = datetime.fromisoformat(last_state['last_timestamp'])
-        timestamp_from = last_timestamp + timedelta(seconds=1)
-        if debug:
-            print(f"[DEBUG] Incremental run - last poll was at {last_state['last_timestamp']}")
-            print(f"[DEBUG] Last poll retrieved {last_state.get('last_records_retrieved', 'unknown')} records")
-
-    timestamp_to = now.replace(microsecond=0)
-
-    # Format as ISO strings
-    timestamp_from_str = timestamp_from.strftime('%Y-%m-%dT%H:%M:%S')
-    timestamp_to_str = timestamp_to.strftime('%Y-%m-%dT%H:%M:%S')
-
-    return timestamp_from_str, timestamp_to_str
-
-
-def poll_incremental(debug=False):
+def poll_incremental(debug=False, client=None, output_format='json'):
     """
     Poll the API for new data since last successful poll.
 
     Args:
         debug (bool): Enable debug output
+        client (ERCOTAPIClient): Authenticated client to use (default: create one)
+        output_format (str): 'json' (default), 'ndjson' or 'parquet' (see ercot_sinks)
 
     Returns:
         bool: True if successful, False otherwise
@@ -140,92 +78,31 @@ def poll_incremental(debug=False):
     print("Incremental Real-Time SPP Poller")
     print("=" * 60)
 
-    ensure_directories()
+    feed = make_feed(output_format)
 
     # Read last state
-    last_state = read_state()
+    last_state = feed.read_state()
 
     if last_state is None:
         print("First run detected - will retrieve last 15 minutes")
     else:
         last_poll = datetime.fromisoformat(last_state['last_poll_time'])
         print(f"Last successful poll: {last_poll.strftime('%Y-%m-%d %H:%M:%S')}")
-
-    # Calculate time range for this query
-    timestamp_from, timestamp_to = calculate_time_range(last_state, debug)
-
-    print(f"Querying new data from: {timestamp_from}")
-    print(f"                    to: {timestamp_to}")
     print()
 
-    # Check if there's actually a time gap to query
-    from_dt = datetime.fromisoformat(timestamp_from)
-    to_dt = datetime.fromisoformat(timestamp_to)
-
-    if from_dt >= to_dt:
-        print("⚠ No new time range to query (already up to date)")
-        return True
-
-    # Initialize ERCOT API client
-    client = ERCOTAPIClient(debug=debug)
+    # Initialize ERCOT API client, unless a shared one was passed in
+    # (collector_daemon.py runs every job on one client)
+    if client is None:
+        client = ERCOTAPIClient(debug=debug)
 
-    # Authenticate
-    if not client.authenticate():
-        print("✗ Authentication failed")
-        return False
-
-    # Define API parameters
-    parameters = {
-        "SCEDTimestampFrom": timestamp_from,
-        "SCEDTimestampTo": timestamp_to
-    }
-
-    # Query the API
-    print(f"Querying endpoint: {ENDPOINT}")
-    if debug:
-        print(f"Parameters: {parameters}")
-    print()
-
-    response_data = client.query_api(ENDPOINT, parameters)
+        # Authenticate
+        if not client.authenticate():
+            print("✗ Authentication failed")
+            return False
 
-    if response_data is None:
-        print("✗ Query failed - state not updated")
+    if not feed.poll(client, debug):
         return False
 
-    # Count records retrieved
-    records_count = 0
-    if isinstance(response_data, dict):
-        if 'data' in response_data:
-            records_count = len(response_data['data'])
-        elif '_meta' in response_data and 'totalRecords' in response_data['_meta']:
-            records_count = response_data['_meta']['totalRecords']
-        elif 'report' in response_data:
-            records_count = len(response_data.get('report', {}).get('data', []))
-
-    print(f"✓ Retrieved {records_count} new records")
-
-    # Generate output filename with timestamp range
-    from_str = from_dt.strftime('%Y%m%d_%H%M%S')
-    to_str = to_dt.strftime('%Y%m%d_%H%M%S')
-
-    # Organize by date and hour
-    date_str = to_dt.strftime('%Y-%m-%d')
-    hour_str = to_dt.strftime('%H')
-
-    output_dir = OUTPUT_DIR_BASE / date_str / hour_str
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    output_file = output_dir / f"lmp_{from_str}_to_{to_str}.json"
-
-    # Save the response
-    client.save_response(response_data, str(output_file))
-
-    # Update state file with latest timestamp
-    if write_state(timestamp_to, records_count):
-        print("✓ State updated successfully")
-    else:
-        print("⚠ Warning: Data saved but state update failed")
-
     print()
     print("=" * 60)
     print("✓ Incremental poll completed successfully!")
@@ -240,15 +117,18 @@ def show_status():
     print("Incremental Poller Status")
     print("=" * 60)
 
-    state = read_state()
+    feed = make_feed()
+    state = feed.read_state()
 
     if state is None:
-        print("Status: Never run (no state file)")
+        print("Status: Never run (no saved state)")
         print("Next run will retrieve last 15 minutes of data")
     else:
         print(f"Endpoint: {state['endpoint']}")
         print(f"Last Poll: {state['last_poll_time']}")
         print(f"Last Timestamp Retrieved: {state['last_timestamp']}")
+        if state.get('watermark'):
+            print(f"Watermark (latest SCEDTimestamp): {state['watermark']}")
         print(f"Records in Last Poll: {state.get('last_records_retrieved', 'unknown')}")
 
         last_poll = datetime.fromisoformat(state['last_poll_time'])
@@ -256,21 +136,27 @@ def show_status():
         print(f"Time Since Last Poll: {time_since}")
 
         # Calculate what will be queried next
-        timestamp_from, timestamp_to = calculate_time_range(state)
+        timestamp_from, timestamp_to = feed.calculate_time_range(state)
         print(f"\nNext poll will query:")
         print(f"  From: {timestamp_from}")
         print(f"  To:   {timestamp_to}")
 
+    runs = feed.state_store.recent_runs(feed.name, limit=5)
+    if runs:
+        print("\nRecent Runs:")
+        for run in runs:
+            records = '' if run['records'] is None else f"{run['records']} records"
+            print(f"  {run['started_at']}  {run['status']:<11} {records} {run['message'] or ''}".rstrip())
+
     print("=" * 60)
 
 
 def reset_state():
-    """Reset the state file (useful for testing or recovery)."""
-    if STATE_FILE.exists():
-        STATE_FILE.unlink()
-        print("✓ State file deleted")
+    """Reset the saved state (useful for testing or recovery)."""
+    if make_feed().reset_state():
+        print("✓ State deleted")
     else:
-        print("No state file to delete")
+        print("No state to delete")
 
 
 def main():
@@ -295,11 +181,13 @@ Examples:
 Cron Setup (every 15 minutes):
   */15 * * * * cd /path/to/ercot-api-query && python3 scripts/incremental_rtm_spp.py
 
-State File Location:
-  state/incremental_rtm_lmp_state.json
+State Location:
+  state/ercot_state.db (feed "rtm_lmp"; inspect with python3 ercot_state.py --job rtm_lmp)
 
 Output Location:
   output/incremental/rtm_lmp/YYYY-MM-DD/HH/lmp_YYYYMMDD_HHMMSS_to_YYYYMMDD_HHMMSS.json
+  output/incremental/rtm_lmp/lmp_YYYY-MM-DD.ndjson.gz   (--format ndjson: one file per day;
+                                                         .ndjson.zst if zstandard is installed)
         """
     )
 
@@ -309,6 +197,14 @@ Output Location:
         help='Enable debug output'
     )
 
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='json',
+        help='Output format: json (default), ndjson (compressed, one record per line) '
+             'or parquet (partitioned by report/date/hour)'
+    )
+
     parser.add_argument(
         '--status',
         action='store_true',
@@ -318,7 +214,7 @@ Output Location:
     parser.add_argument(
         '--reset',
         action='store_true',
-        help='Reset state file (next run will be like first run)'
+        help='Reset state (next run will be like first run)'
     )
 
     args = parser.parse_args()
@@ -333,7 +229,7 @@ Output Location:
         sys.exit(0)
 
     # Run incremental poll
-    success = poll_incremental(debug=args.debug)
+    success = poll_incremental(debug=args.debug, output_format=args.format)
 
     # Exit with appropriate code
     sys.exit(0 if success else 1)
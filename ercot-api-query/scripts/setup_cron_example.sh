@@ -27,17 +27,16 @@ cat << 'EOF'
 # Day-Ahead Market (DAM) Data - Runs at 1:00 AM
 #------------------------------------------------------------
 
-# Collect DAM Settlement Prices for Houston Hub
-0 1 * * * cd /path/to/ercot-api-query && /usr/bin/python3 scripts/daily_dam_settlement_prices.py --settlement-point HB_HOUSTON >> logs/cron_dam_houston.log 2>&1
+# Collect DAM Settlement Prices for the Houston, North, South and West Hubs
+# (one process, one login; each hub is written to its own file)
+0 1 * * * cd /path/to/ercot-api-query && /usr/bin/python3 scripts/daily_dam_settlement_prices.py --settlement-point HB_HOUSTON HB_NORTH HB_SOUTH HB_WEST >> logs/cron_dam_hubs.log 2>&1
 
-# Collect DAM Settlement Prices for North Hub
-0 1 * * * cd /path/to/ercot-api-query && /usr/bin/python3 scripts/daily_dam_settlement_prices.py --settlement-point HB_NORTH >> logs/cron_dam_north.log 2>&1
+# Or collect every settlement point (one unfiltered query, split locally)
+# 0 1 * * * cd /path/to/ercot-api-query && /usr/bin/python3 scripts/daily_dam_settlement_prices.py --settlement-point ALL >> logs/cron_dam_all.log 2>&1
 
-# Collect DAM Settlement Prices for South Hub
-0 1 * * * cd /path/to/ercot-api-query && /usr/bin/python3 scripts/daily_dam_settlement_prices.py --settlement-point HB_SOUTH >> logs/cron_dam_south.log 2>&1
-
-# Collect DAM Settlement Prices for West Hub
-0 1 * * * cd /path/to/ercot-api-query && /usr/bin/python3 scripts/daily_dam_settlement_prices.py --settlement-point HB_WEST >> logs/cron_dam_west.log 2>&1
+# Tomorrow's DAM prices as soon as ERCOT posts them: starts just before the
+# posting window (12:00-15:30) and collects the moment the new posting appears
+# 55 11 * * * cd /path/to/ercot-api-query && /usr/bin/python3 scripts/daily_dam_settlement_prices.py --watch --settlement-point ALL >> logs/cron_dam_watch.log 2>&1
 
 #------------------------------------------------------------
 # Real-Time Market (RTM) Data - Runs at 1:15 AM
@@ -53,6 +52,15 @@ cat << 'EOF'
 # Collect 15-minute SPP data (WARNING: Large dataset!)
 30 1 * * * cd /path/to/ercot-api-query && /usr/bin/python3 scripts/daily_spp_15min.py >> logs/cron_spp_15min.log 2>&1
 
+#------------------------------------------------------------
+# Alternative: One Long-Running Process Instead of the Jobs Above
+#------------------------------------------------------------
+
+# collector_daemon.py runs all of the jobs above (plus the 15-minute
+# incremental poller) on its own schedule, sharing one login and connection
+# pool. Use it INSTEAD of the separate entries, not alongside them.
+# @reboot cd /path/to/ercot-api-query && /usr/bin/python3 scripts/collector_daemon.py >> logs/daemon.log 2>&1
+
 #------------------------------------------------------------
 # Minimal Example (Just Houston DAM prices, no logging)
 #------------------------------------------------------------